@@ -1,14 +1,43 @@
 from flask_openapi3 import OpenAPI, Info, Tag
 from flask import redirect
 from flask_cors import CORS
+import click
 
+from logger import setup_logging
+from models import WriteQueue, engine, init_db, writer
+from models.search import rebuild_search_index
 from routes import author_bp, article_bp
+from routes.instrumentation import instrument_queries
+from routes.compression import register_compression
+from routes.metrics import register_metrics
+from routes.openapi import register_openapi_document
+from services.author_deletion import resume_author_deletions
+from shared.utils.asgi import WSGIAdapter
+from shared.utils.json_provider import get_json_provider
 
-info = Info(title="Code Chronicles API", version="1.0.0")
-app = OpenAPI(__name__, info=info)
 
-# inicializando CORS
-CORS(app)
+class API(OpenAPI):
+    """Aplicação OpenAPI com a serialização JSON feita por um provider.
+
+    As rotas retornam dicionários, que são serializados por
+    `app.json_provider` em vez do `jsonify` do Flask. O provider pode ser
+    substituído por qualquer objeto com o método `response(obj)`.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.json_provider = get_json_provider(self)
+
+    def make_response(self, rv):
+        if isinstance(rv, tuple) and rv and isinstance(rv[0], dict):
+            rv = (self.json_provider.response(rv[0]), *rv[1:])
+        elif isinstance(rv, dict):
+            rv = self.json_provider.response(rv)
+
+        return super().make_response(rv)
+
+
+info = Info(title="Code Chronicles API", version="1.0.0")
 
 # definindo tags
 home_tag = Tag(
@@ -17,7 +46,6 @@ home_tag = Tag(
 )
 
 
-@app.get("/", tags=[home_tag])
 def home():
     """
     Redireciona para /openapi.
@@ -28,9 +56,110 @@ def home():
     return redirect("/openapi")
 
 
-# Registra rotas
-app.register_api(author_bp)
-app.register_api(article_bp)
+def rebuild_search_index_command():
+    """Reconstrói o índice de busca textual dos artigos."""
+    indexed = rebuild_search_index(engine)
+    click.echo(f"{indexed} artigos indexados")
+
+
+def resume_deletions():
+    """Retoma as remoções de autores interrompidas por uma queda.
+
+    Executado no primeiro atendimento de cada worker, e não na criação da
+    aplicação, para que o processo principal do gunicorn (com preload_app)
+    não inicie threads que os workers não herdariam.
+    """
+    resume_author_deletions()
+
+
+def create_app(config: dict = None) -> API:
+    """Cria e configura a aplicação.
+
+    Importar os módulos da API não tem efeitos colaterais: o logging e o
+    banco (diretório, tabelas e migrações) são preparados aqui, uma única
+    vez por processo, mesmo que várias aplicações sejam criadas.
+
+    Args:
+        config (dict, optional): Valores aplicados ao `app.config`.
+            `LOG_PATH` define o diretório dos logs e `OPENAPI_DIR`, o do
+            documento OpenAPI pré-calculado.
+
+    Returns:
+        API: A aplicação pronta para ser servida.
+    """
+    app = API(__name__, info=info)
+    app.config.update(config or {})
+
+    setup_logging(app.config.get("LOG_PATH"))
+    init_db()
+
+    # inicializando CORS
+    CORS(app)
+
+    # contagem e tempo das consultas SQL de cada requisição
+    instrument_queries(app)
+
+    # métricas do Prometheus, expostas em /metrics
+    register_metrics(app)
+
+    # compressão br/gzip/zstd negociada pelo Accept-Encoding
+    register_compression(app)
+
+    app.get("/", tags=[home_tag])(home)
+    app.cli.command("rebuild-search-index")(rebuild_search_index_command)
+    app.before_first_request(resume_deletions)
+
+    # Registra rotas
+    app.register_api(author_bp)
+    app.register_api(article_bp)
+
+    # documento OpenAPI gerado uma vez e servido com cache e compressão
+    register_openapi_document(app)
+
+    return app
+
+
+def create_asgi_app(config: dict = None) -> WSGIAdapter:
+    """Cria a aplicação para um servidor ASGI (uvicorn).
+
+    As rotas e os services são os mesmos de `create_app`, mas cada
+    requisição roda em um greenlet no event loop, e as consultas dos
+    services usam a engine asyncio (ver models/aio.py). Enquanto uma
+    requisição espera pelo banco, o processo atende as demais, sem depender
+    da quantidade de threads.
+
+    Args:
+        config (dict, optional): Valores aplicados ao `app.config`.
+
+    Raises:
+        RuntimeError: caso a fila de escrita (DB_WRITE_QUEUE) esteja ativa;
+            ela bloquearia o event loop enquanto aguarda cada escrita.
+
+    Returns:
+        WSGIAdapter: A aplicação ASGI.
+    """
+    from models.aio import bind_async_engine, create_aio_engine
+
+    if isinstance(writer, WriteQueue):
+        raise RuntimeError("DB_WRITE_QUEUE não é suportada no modo ASGI")
+
+    app = create_app(config)
+    async_engine = create_aio_engine()
+
+    def wsgi_app(environ, start_response):
+        bind_async_engine(async_engine)
+        return app(environ, start_response)
+
+    async def startup():
+        # as requisições compartilham a mesma thread, então as funções de
+        # before_first_request (que o Flask executa sob um lock) rodam antes
+        # da primeira delas
+        app.try_trigger_before_first_request_functions()
+
+    return WSGIAdapter(
+        wsgi_app, on_startup=startup, on_shutdown=async_engine.dispose
+    )
+
 
 if __name__ == "__main__":
-    app.run(debug=True)
+    create_app().run(debug=True)
@@ -0,0 +1,11 @@
+"""Ponto de entrada ASGI da API, com as consultas na engine asyncio.
+
+    uvicorn asgi:app --workers 4
+    gunicorn -c gunicorn.conf.py -k uvicorn.workers.UvicornWorker asgi:app
+
+O modo WSGI (wsgi.py) continua sendo o padrão; ver `create_asgi_app`.
+"""
+
+from app import create_asgi_app
+
+app = create_asgi_app()
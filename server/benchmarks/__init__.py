@@ -0,0 +1,6 @@
+"""Benchmarks da API.
+
+Cada módulo pode ser executado com `python -m benchmarks.<modulo>` a partir
+do diretório `server/`. Os benchmarks usam um banco sqlite temporário, que é
+removido ao final da execução.
+"""
@@ -0,0 +1,143 @@
+"""Compara a listagem de artigos com objetos ORM e com colunas projetadas.
+
+Uso:
+    python -m benchmarks.article_list --articles 2000 --content-kb 32
+
+O primeiro cenário reproduz a listagem antiga, que carregava objetos Article
+completos (incluindo o conteúdo, hoje em 'article_bodies') para descartar o
+conteúdo na serialização. O segundo é a listagem atual, que busca apenas as
+colunas do preview.
+"""
+
+from datetime import datetime, timedelta
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument("--articles", type=int, default=2000)
+parser.add_argument("--content-kb", type=int, default=32)
+parser.add_argument("--repeat", type=int, default=5)
+args = parser.parse_args()
+
+workdir = tempfile.TemporaryDirectory()
+os.environ["DB_URL"] = "sqlite:///%s/bench.sqlite3" % workdir.name
+
+from sqlalchemy import insert, select  # noqa: E402
+from sqlalchemy.orm import joinedload  # noqa: E402
+
+from benchmarks.data import html_body, sentence  # noqa: E402
+from models import Article, ArticleBody, Author, Session  # noqa: E402
+from schemas import show_articles  # noqa: E402
+from services.article import preview_columns  # noqa: E402
+
+
+def seed(session):
+    """Popula o banco com um autor e artigos de conteúdo grande."""
+    rng = random.Random(42)
+    session.add(
+        Author(
+            id=1,
+            first_name="Bench",
+            last_name="Mark",
+            email="bench@example.com",
+            twitter_username="bench",
+            avatar_url="",
+        )
+    )
+    session.commit()
+
+    start = datetime(2023, 1, 1)
+    session.execute(
+        insert(Article.__table__),
+        [
+            {
+                "id": f"artigo-{i}",
+                "title": f"{sentence(rng, 5)} {i}",
+                "subtitle": sentence(rng, 15),
+                "author_id": 1,
+                "created_at": start + timedelta(minutes=i),
+            }
+            for i in range(args.articles)
+        ],
+    )
+    session.execute(
+        insert(ArticleBody.__table__),
+        [
+            {
+                "article_id": f"artigo-{i}",
+                "content": html_body(rng, args.content_kb),
+            }
+            for i in range(args.articles)
+        ],
+    )
+    session.commit()
+
+
+def list_orm(session):
+    """Listagem antiga: objetos Article completos."""
+    articles = (
+        session.query(Article)
+        .options(joinedload(Article.body))
+        .order_by(Article.created_at, Article.id)
+        .all()
+    )
+    return show_articles(articles)
+
+
+def list_projected(session):
+    """Listagem atual: apenas as colunas do preview."""
+    statement = select(*preview_columns).order_by(
+        Article.__table__.c.created_at, Article.__table__.c.id
+    )
+    return show_articles(session.execute(statement).all())
+
+
+def measure(listing):
+    """Retorna a mediana do tempo e o pico de memória de uma listagem."""
+    timings = []
+    peaks = []
+
+    for _ in range(args.repeat):
+        with Session() as session:
+            tracemalloc.start()
+            begin = time.perf_counter()
+            result = listing(session)
+            timings.append(time.perf_counter() - begin)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+
+        assert len(result["articles"]) == args.articles
+
+    return statistics.median(timings), max(peaks)
+
+
+if __name__ == "__main__":
+    with Session() as session:
+        seed(session)
+
+    print(
+        f"{args.articles} artigos com ~{args.content_kb} KB de conteúdo, "
+        f"mediana de {args.repeat} execuções"
+    )
+
+    results = {}
+    for name, listing in (("orm", list_orm), ("projetada", list_projected)):
+        results[name] = measure(listing)
+        elapsed, peak = results[name]
+        print(
+            f"{name:>10}: {elapsed * 1000:8.1f} ms"
+            f" {peak / 1024 / 1024:8.1f} MiB"
+        )
+
+    (orm_time, orm_peak), (new_time, new_peak) = results.values()
+    print(
+        f"{'ganho':>10}: {orm_time / new_time:8.1f} x"
+        f" {orm_peak / new_peak:8.1f} x"
+    )
+
+    workdir.cleanup()
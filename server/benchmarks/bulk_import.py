@@ -0,0 +1,89 @@
+"""Compara a importação de artigos um a um e pela rota de lote.
+
+Uso:
+    python -m benchmarks.bulk_import --articles 10000 --content-kb 4
+
+O primeiro cenário envia um `POST /article` por artigo; o segundo envia
+todos os artigos em um único `POST /articles/bulk` em NDJSON. Ambos passam
+pelo test client do Flask, sobre um banco sqlite temporário.
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument("--articles", type=int, default=10000)
+parser.add_argument("--content-kb", type=int, default=4)
+args = parser.parse_args()
+
+workdir = tempfile.TemporaryDirectory()
+os.environ["DB_URL"] = "sqlite:///%s/bench.sqlite3" % workdir.name
+os.environ["LOG_PATH"] = workdir.name
+
+from app import create_app  # noqa: E402
+from benchmarks.data import html_body, sentence  # noqa: E402
+from models import Author, Session  # noqa: E402
+
+app = create_app()
+
+
+def articles(prefix):
+    """Gera os artigos a importar, com títulos únicos por cenário."""
+    rng = random.Random(42)
+    bodies = [html_body(rng, args.content_kb) for _ in range(64)]
+    return [
+        {
+            "title": f"{prefix} {i} {sentence(rng, 4)}",
+            "subtitle": sentence(rng, 15),
+            "author_id": 1,
+            "content": rng.choice(bodies),
+        }
+        for i in range(args.articles)
+    ]
+
+
+def one_by_one(client):
+    """Um POST /article por artigo."""
+    for article in articles("Individual"):
+        assert client.post("/article", data=article).status_code == 200
+
+
+def bulk(client):
+    """Todos os artigos em um POST /articles/bulk."""
+    body = "\n".join(json.dumps(article) for article in articles("Lote"))
+    response = client.post(
+        "/articles/bulk", data=body, content_type="application/x-ndjson"
+    )
+    assert response.json["created"] == args.articles
+
+
+if __name__ == "__main__":
+    with Session() as session:
+        session.add(
+            Author(
+                first_name="Bench",
+                last_name="Mark",
+                email="bench@example.com",
+                twitter_username="bench",
+                avatar_url="",
+            )
+        )
+        session.commit()
+
+    client = app.test_client()
+    print(f"{args.articles} artigos com ~{args.content_kb} KB de conteúdo")
+
+    results = {}
+    for name, scenario in (("um a um", one_by_one), ("lote", bulk)):
+        begin = time.perf_counter()
+        scenario(client)
+        results[name] = time.perf_counter() - begin
+        print(f"{name:>8}: {results[name]:8.2f} s")
+
+    print(f"{'ganho':>8}: {results['um a um'] / results['lote']:8.1f} x")
+
+    workdir.cleanup()
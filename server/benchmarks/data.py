@@ -0,0 +1,37 @@
+"""Geração de dados sintéticos para os benchmarks."""
+
+import random
+
+WORDS = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod "
+    "tempor incididunt ut labore et dolore magna aliqua python flask api "
+    "sqlalchemy banco consulta índice cache latência memória requisição"
+).split()
+
+
+def sentence(rng: random.Random, words: int = 12) -> str:
+    """Gera uma frase aleatória."""
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+
+def html_body(rng: random.Random, size_kb: int) -> str:
+    """Gera um corpo HTML parecido com o produzido pelo TinyMCE."""
+    parts = []
+    size = 0
+
+    while size < size_kb * 1024:
+        if rng.random() < 0.2:
+            block = (
+                '<pre class="language-python"><code>'
+                + "\n".join(sentence(rng, 6) for _ in range(6))
+                + "</code></pre>"
+            )
+        elif rng.random() < 0.3:
+            block = f"<h2>{sentence(rng, 5)}</h2>"
+        else:
+            block = f"<p>{sentence(rng, 60)}</p>"
+
+        parts.append(block)
+        size += len(block)
+
+    return "\n".join(parts)
@@ -0,0 +1,113 @@
+"""Mede o tempo e o pico de memória da exportação NDJSON dos artigos.
+
+Uso:
+    python -m benchmarks.export --articles 2000 20000 --content-kb 8
+
+Para cada quantidade de artigos, a exportação é consumida bloco a bloco
+pelo test client do Flask, sem guardar a resposta. O pico de memória deve
+se manter estável mesmo com tabelas maiores.
+"""
+
+from datetime import datetime, timedelta
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument("--articles", type=int, nargs="+", default=[2000, 20000])
+parser.add_argument("--content-kb", type=int, default=8)
+parser.add_argument("--gzip", action="store_true")
+args = parser.parse_args()
+
+workdir = tempfile.TemporaryDirectory()
+os.environ["DB_URL"] = "sqlite:///%s/bench.sqlite3" % workdir.name
+os.environ["LOG_PATH"] = workdir.name
+
+from sqlalchemy import insert  # noqa: E402
+
+from app import create_app  # noqa: E402
+from benchmarks.data import html_body, sentence  # noqa: E402
+from models import Article, ArticleBody, Author, Session  # noqa: E402
+
+app = create_app()
+
+
+def seed(session, first, last, rng, bodies):
+    """Insere os artigos de índice first até last - 1."""
+    start = datetime(2023, 1, 1)
+    ids = range(first, last)
+    session.execute(
+        insert(Article.__table__),
+        [
+            {
+                "id": f"artigo-{i}",
+                "title": f"{sentence(rng, 5)} {i}",
+                "subtitle": sentence(rng, 15),
+                "author_id": 1,
+                "created_at": start + timedelta(minutes=i),
+            }
+            for i in ids
+        ],
+    )
+    session.execute(
+        insert(ArticleBody.__table__),
+        [
+            {"article_id": f"artigo-{i}", "content": rng.choice(bodies)}
+            for i in ids
+        ],
+    )
+    session.commit()
+
+
+def export(client):
+    """Consome a exportação e retorna a quantidade de bytes recebidos."""
+    headers = {"Accept-Encoding": "gzip"} if args.gzip else {}
+    response = client.get("/articles/export", headers=headers, buffered=False)
+    size = sum(len(chunk) for chunk in response.response)
+    response.close()
+    return size
+
+
+if __name__ == "__main__":
+    rng = random.Random(42)
+    bodies = [html_body(rng, args.content_kb) for _ in range(64)]
+    client = app.test_client()
+
+    with Session() as session:
+        session.add(
+            Author(
+                id=1,
+                first_name="Bench",
+                last_name="Mark",
+                email="bench@example.com",
+                twitter_username="bench",
+                avatar_url="",
+            )
+        )
+        session.commit()
+
+    print(f"artigos com ~{args.content_kb} KB de conteúdo, gzip={args.gzip}")
+
+    seeded = 0
+    for total in sorted(args.articles):
+        with Session() as session:
+            seed(session, seeded, total, rng, bodies)
+        seeded = total
+
+        tracemalloc.start()
+        begin = time.perf_counter()
+        size = export(client)
+        elapsed = time.perf_counter() - begin
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        print(
+            f"{total:>8} artigos: {elapsed:8.2f} s"
+            f" {size / 1024 / 1024:8.1f} MiB enviados"
+            f" pico de {peak / 1024 / 1024:6.1f} MiB"
+        )
+
+    workdir.cleanup()
@@ -0,0 +1,90 @@
+"""Compara a serialização JSON da listagem de artigos com cada provider.
+
+Uso:
+    python -m benchmarks.json_provider --articles 10000
+
+A listagem tem a mesma estrutura retornada por `show_articles`, com datas e
+títulos acentuados. As saídas dos providers são comparadas byte a byte.
+"""
+
+from datetime import datetime, timedelta
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument("--articles", type=int, default=10000)
+parser.add_argument("--repeat", type=int, default=20)
+args = parser.parse_args()
+
+workdir = tempfile.TemporaryDirectory()
+os.environ["DB_URL"] = "sqlite:///%s/bench.sqlite3" % workdir.name
+
+from app import create_app  # noqa: E402
+from benchmarks.data import sentence  # noqa: E402
+from schemas import show_articles  # noqa: E402
+from shared.utils.json_provider import (  # noqa: E402
+    JSONProvider,
+    OrjsonProvider,
+)
+
+app = create_app()
+
+
+class Row:
+    """Linha da listagem, com os atributos usados por `show_articles`."""
+
+    def __init__(self, **columns):
+        self.__dict__.update(columns)
+
+
+def listing():
+    """Monta a representação de uma página com todos os artigos."""
+    rng = random.Random(42)
+    start = datetime(2023, 1, 1)
+    rows = [
+        Row(
+            id=f"artigo-{i}",
+            title=f"{sentence(rng, 5)} ação {i}",
+            subtitle=sentence(rng, 15),
+            author_id=rng.randint(1, 1000),
+            created_at=start + timedelta(minutes=i),
+        )
+        for i in range(args.articles)
+    ]
+    return show_articles(rows, "cursor")
+
+
+def measure(provider, data):
+    """Retorna a mediana do tempo de serialização e o corpo gerado."""
+    timings = []
+
+    for _ in range(args.repeat):
+        begin = time.perf_counter()
+        body = provider.response(data).get_data()
+        timings.append(time.perf_counter() - begin)
+
+    return statistics.median(timings), body
+
+
+if __name__ == "__main__":
+    data = listing()
+
+    with app.app_context():
+        stdlib_time, stdlib_body = measure(JSONProvider(app), data)
+        orjson_time, orjson_body = measure(OrjsonProvider(app), data)
+
+    assert stdlib_body == orjson_body, "as saídas dos providers diferem"
+
+    print(
+        f"{args.articles} artigos ({len(stdlib_body) / 1024:.0f} KB), "
+        f"mediana de {args.repeat} execuções"
+    )
+    print(f"{'json':>8}: {stdlib_time * 1000:8.1f} ms")
+    print(f"{'orjson':>8}: {orjson_time * 1000:8.1f} ms")
+    print(f"{'ganho':>8}: {stdlib_time / orjson_time:8.1f} x")
+
+    workdir.cleanup()
@@ -0,0 +1,530 @@
+"""Benchmark de carga de todas as rotas da API sobre um banco sintético.
+
+Uso:
+    python -m benchmarks.load --authors 1000 --articles 1000000 \\
+        --database /tmp/load.sqlite3 --output baseline.json
+    python -m benchmarks.load --database /tmp/load.sqlite3 \\
+        --compare baseline.json
+
+O banco é populado com autores e artigos com corpo HTML (sempre com a
+mesma semente, o que torna os dados reproduzíveis) e pode ser reaproveitado
+entre execuções com --database. A mesma sequência de requisições é
+enviada pelo test client do Flask, uma por vez, e por clientes
+concorrentes a um gunicorn real, com workers WSGI (threads) e ASGI
+(uvicorn, com as consultas na engine asyncio). Com mais clientes que
+threads (--concurrency > --workers x --threads), o modo WSGI enfileira as
+requisições, enquanto no ASGI o limite é o pool de conexões (ver os
+resultados no README). O resultado, com as latências p50/p95/p99 por rota,
+a vazão e o pico de memória, é salvo em JSON com --output e comparado a uma
+execução anterior com --compare.
+"""
+
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from urllib.parse import urlencode
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument("--authors", type=int, default=1000)
+parser.add_argument("--articles", type=int, default=100000)
+parser.add_argument("--content-kb", type=int, default=4)
+parser.add_argument("--database", help="banco reaproveitado entre execuções")
+parser.add_argument("--requests", type=int, default=2000)
+parser.add_argument("--concurrency", type=int, default=8)
+parser.add_argument("--workers", type=int, default=2)
+parser.add_argument("--threads", type=int, default=4)
+parser.add_argument(
+    "--mode", choices=("all", "client", "wsgi", "asgi"), default="all"
+)
+parser.add_argument("--seed", type=int, default=42)
+parser.add_argument("--output", help="arquivo JSON com os resultados")
+parser.add_argument("--compare", help="resultado anterior usado como base")
+parser.add_argument(
+    "--tolerance",
+    type=float,
+    default=0.2,
+    help="piora relativa tolerada antes de acusar uma regressão",
+)
+args = parser.parse_args()
+
+workdir = tempfile.TemporaryDirectory()
+database = args.database or os.path.join(workdir.name, "load.sqlite3")
+os.environ["DB_URL"] = "sqlite:///%s" % os.path.abspath(database)
+os.environ["LOG_PATH"] = workdir.name
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+SEARCH_TERMS = ("python", "flask", "banco consulta", "cache", "latência")
+
+# proporção de cada cenário na sequência de requisições
+SCENARIOS = {
+    "get_article": 30,
+    "list_articles": 20,
+    "search_articles": 15,
+    "get_author": 10,
+    "list_authors": 10,
+    "write_article": 10,
+    "write_author": 5,
+}
+
+
+def seed_database():
+    """Popula o banco, caso ele ainda não tenha autores."""
+    from sqlalchemy import func, insert, select
+
+    from benchmarks.data import html_body, sentence
+    from models import Article, ArticleBody, Author, Session, engine, init_db
+    from models.search import rebuild_search_index
+
+    init_db()
+
+    with Session() as session:
+        if session.scalar(select(func.count()).select_from(Author)):
+            return
+
+        rng = random.Random(args.seed)
+        start = datetime(2020, 1, 1)
+        session.execute(
+            insert(Author.__table__),
+            [
+                {
+                    "pk_author": i,
+                    "first_name": f"Autor {i}",
+                    "last_name": sentence(rng, 2),
+                    "email": f"autor{i}@example.com",
+                    "twitter_username": f"autor{i}",
+                    "avatar_url": f"https://example.com/{i}.png",
+                    "created_at": start + timedelta(minutes=i),
+                }
+                for i in range(1, args.authors + 1)
+            ],
+        )
+
+        # corpos gerados uma vez e sorteados, para acelerar a carga
+        bodies = [html_body(rng, args.content_kb) for _ in range(256)]
+        batch_size = 10000
+
+        for first in range(0, args.articles, batch_size):
+            ids = range(first, min(first + batch_size, args.articles))
+            session.execute(
+                insert(Article.__table__),
+                [
+                    {
+                        "id": f"artigo-{i}",
+                        "title": f"{sentence(rng, 5)} {i}",
+                        "subtitle": sentence(rng, 15),
+                        "author_id": rng.randint(1, args.authors),
+                        "created_at": start + timedelta(seconds=i),
+                    }
+                    for i in ids
+                ],
+            )
+            session.execute(
+                insert(ArticleBody.__table__),
+                [
+                    {
+                        "article_id": f"artigo-{i}",
+                        "content": rng.choice(bodies),
+                    }
+                    for i in ids
+                ],
+            )
+            session.commit()
+            print(f"  {ids.stop}/{args.articles} artigos", file=sys.stderr)
+
+    print("  indexando artigos para a busca", file=sys.stderr)
+    rebuild_search_index(engine)
+
+
+def build_plan() -> list:
+    """Monta a sequência de cenários, igual em todas as execuções."""
+    rng = random.Random(args.seed)
+    names = list(SCENARIOS)
+    weights = list(SCENARIOS.values())
+
+    return [
+        (name, rng.randrange(2**32))
+        for name in rng.choices(names, weights, k=args.requests)
+    ]
+
+
+class TestClientDriver:
+    """Envia as requisições pelo test client do Flask."""
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, path, form=None):
+        response = self.client.open(path, method=method, data=form)
+        return response.status_code, response.get_data()
+
+
+class HTTPDriver:
+    """Envia as requisições por HTTP, com uma conexão por thread."""
+
+    def __init__(self, port):
+        self.port = port
+        self.local = threading.local()
+
+    def request(self, method, path, form=None):
+        if not hasattr(self.local, "connection"):
+            self.local.connection = http.client.HTTPConnection(
+                "127.0.0.1", self.port, timeout=60
+            )
+
+        body = urlencode(form) if form else None
+        headers = {"Content-Type": "application/x-www-form-urlencoded"}
+        connection = self.local.connection
+
+        try:
+            connection.request(method, path, body, headers)
+            response = connection.getresponse()
+        except (http.client.HTTPException, OSError):
+            # o servidor fechou a conexão reaproveitada
+            connection.close()
+            connection.request(method, path, body, headers)
+            response = connection.getresponse()
+
+        return response.status, response.read()
+
+
+class Recorder:
+    """Acumula as latências de cada rota."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    def call(self, driver, route, method, path, form=None):
+        """Envia uma requisição e registra a latência dela."""
+        begin = time.perf_counter()
+        status, body = driver.request(method, path, form)
+        elapsed = time.perf_counter() - begin
+
+        with self.lock:
+            self.latencies[route].append(elapsed)
+            if status >= 400:
+                self.errors[route] += 1
+
+        return json.loads(body) if status == 200 else None
+
+
+def run_scenario(recorder, driver, name, seed):
+    """Executa um cenário do plano de requisições."""
+    rng = random.Random(seed)
+    call = recorder.call
+
+    if name == "get_article":
+        article_id = "artigo-%d" % rng.randrange(args.articles)
+        call(driver, "GET /article/<id>", "GET", f"/article/{article_id}")
+    elif name == "list_articles":
+        page = call(driver, "GET /articles", "GET", "/articles?limit=50")
+        if page and page["next_cursor"]:
+            query = urlencode({"limit": 50, "cursor": page["next_cursor"]})
+            call(driver, "GET /articles?cursor", "GET", f"/articles?{query}")
+    elif name == "search_articles":
+        query = urlencode({"q": rng.choice(SEARCH_TERMS)})
+        path = f"/articles/search?{query}"
+        call(driver, "GET /articles/search", "GET", path)
+    elif name == "get_author":
+        author_id = rng.randint(1, args.authors)
+        call(driver, "GET /author/<id>", "GET", f"/author/{author_id}")
+    elif name == "list_authors":
+        call(driver, "GET /authors", "GET", "/authors?limit=50")
+    elif name == "write_article":
+        form = {
+            "title": f"Carga {seed}",
+            "subtitle": "Artigo criado pelo benchmark de carga",
+            "author_id": rng.randint(1, args.authors),
+            "content": "<p>Conteúdo do benchmark de carga</p>",
+        }
+        article = call(driver, "POST /article", "POST", "/article", form)
+        if article:
+            form.update(id=article["id"], subtitle="Artigo editado")
+            call(driver, "PUT /article", "PUT", "/article", form)
+            path = f"/article/{article['id']}"
+            call(driver, "DELETE /article/<id>", "DELETE", path)
+    elif name == "write_author":
+        form = {
+            "first_name": "Carga",
+            "last_name": str(seed),
+            "email": f"carga{seed}@example.com",
+            "twitter_username": f"carga{seed}",
+            "avatar_url": "https://example.com/carga.png",
+        }
+        author = call(driver, "POST /author", "POST", "/author", form)
+        if author:
+            form.update(id=author["id"], last_name="Editado")
+            call(driver, "PUT /author", "PUT", "/author", form)
+            path = f"/author/{author['id']}"
+            call(driver, "DELETE /author/<id>", "DELETE", path)
+
+
+def percentile(values, fraction):
+    """Percentil pelo método do posto mais próximo."""
+    ordered = sorted(values)
+    index = max(0, int(round(fraction * len(ordered))) - 1)
+    return ordered[index]
+
+
+def summarize(recorder, elapsed, peak_rss):
+    """Monta o resultado de uma execução do plano."""
+    routes = {}
+
+    for route, latencies in sorted(recorder.latencies.items()):
+        routes[route] = {
+            "requests": len(latencies),
+            "errors": recorder.errors[route],
+            "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+            "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+            "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        }
+
+    total = sum(route["requests"] for route in routes.values())
+    return {
+        "requests": total,
+        "errors": sum(route["errors"] for route in routes.values()),
+        "throughput_rps": round(total / elapsed, 1),
+        "peak_rss_mb": round(peak_rss / 1024 / 1024, 1),
+        "routes": routes,
+    }
+
+
+def run_client(plan):
+    """Executa o plano pelo test client, no próprio processo."""
+    from app import create_app
+
+    app = create_app()
+    recorder = Recorder()
+    driver = TestClientDriver(app)
+
+    begin = time.perf_counter()
+    for name, seed in plan:
+        run_scenario(recorder, driver, name, seed)
+    elapsed = time.perf_counter() - begin
+
+    # no Linux o ru_maxrss é informado em KB
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    return summarize(recorder, elapsed, peak)
+
+
+def process_tree_rss(pid) -> int:
+    """Soma a memória residente do processo e dos seus filhos (Linux)."""
+    total = 0
+    pending = [pid]
+
+    while pending:
+        current = pending.pop()
+        try:
+            with open(f"/proc/{current}/status") as status:
+                for line in status:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1]) * 1024
+            with open(f"/proc/{current}/task/{current}/children") as children:
+                pending.extend(int(child) for child in children.read().split())
+        except (FileNotFoundError, ProcessLookupError):
+            continue
+
+    return total
+
+
+def free_port() -> int:
+    """Retorna uma porta TCP livre."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_server(port, server, timeout=60):
+    """Aguarda o servidor aceitar conexões."""
+    deadline = time.monotonic() + timeout
+
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError("o gunicorn encerrou durante a inicialização")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.1)
+
+    raise RuntimeError("o gunicorn não respondeu a tempo")
+
+
+# worker do gunicorn e aplicação de cada modo de servidor
+SERVERS = {
+    "wsgi": ["--threads", str(args.threads), "wsgi:app"],
+    "asgi": ["--worker-class", "uvicorn.workers.UvicornWorker", "asgi:app"],
+}
+
+
+def run_server(plan, mode):
+    """Executa o plano contra um gunicorn, com clientes concorrentes."""
+    port = free_port()
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "gunicorn",
+            "--workers", str(args.workers),
+            "--bind", f"127.0.0.1:{port}",
+            "--log-level", "warning",
+            *SERVERS[mode],
+        ],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+
+    try:
+        wait_for_server(port, server)
+
+        recorder = Recorder()
+        driver = HTTPDriver(port)
+        peak = 0
+        done = threading.Event()
+
+        def sample_memory():
+            nonlocal peak
+            while not done.wait(0.1):
+                peak = max(peak, process_tree_rss(server.pid))
+
+        sampler = threading.Thread(target=sample_memory, daemon=True)
+        sampler.start()
+
+        begin = time.perf_counter()
+        with ThreadPoolExecutor(args.concurrency) as executor:
+            for future in [
+                executor.submit(run_scenario, recorder, driver, name, seed)
+                for name, seed in plan
+            ]:
+                future.result()
+        elapsed = time.perf_counter() - begin
+
+        done.set()
+        sampler.join()
+        peak = max(peak, process_tree_rss(server.pid))
+    finally:
+        server.terminate()
+        server.wait()
+
+    return summarize(recorder, elapsed, peak)
+
+
+def compare(baseline, current) -> list:
+    """Lista as métricas que pioraram além da tolerância."""
+    regressions = []
+
+    if baseline["config"] != current["config"]:
+        print("aviso: a base foi gerada com outra configuração")
+
+    for mode, result in current["results"].items():
+        base = baseline["results"].get(mode)
+        if base is None:
+            continue
+
+        limit = base["throughput_rps"] * (1 - args.tolerance)
+        if result["throughput_rps"] < limit:
+            regressions.append(
+                f"{mode}: vazão {base['throughput_rps']} -> "
+                f"{result['throughput_rps']} req/s"
+            )
+
+        for route, stats in result["routes"].items():
+            base_stats = base["routes"].get(route)
+            if base_stats is None:
+                continue
+            for key in ("p50_ms", "p95_ms", "p99_ms"):
+                if stats[key] > base_stats[key] * (1 + args.tolerance):
+                    regressions.append(
+                        f"{mode} {route}: {key} {base_stats[key]} -> "
+                        f"{stats[key]}"
+                    )
+
+    return regressions
+
+
+def print_result(mode, result):
+    """Exibe o resultado de uma execução."""
+    print(
+        f"\n{mode}: {result['requests']} requisições, "
+        f"{result['throughput_rps']} req/s, "
+        f"pico de {result['peak_rss_mb']} MiB, {result['errors']} erros"
+    )
+    print(f"{'rota':<24} {'n':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+
+    for route, stats in result["routes"].items():
+        print(
+            f"{route:<24} {stats['requests']:>6} {stats['p50_ms']:>9.2f} "
+            f"{stats['p95_ms']:>9.2f} {stats['p99_ms']:>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    print(f"populando {database}", file=sys.stderr)
+    # a carga roda em outro processo para não inflar o pico de memória
+    seeder = multiprocessing.get_context("fork").Process(target=seed_database)
+    seeder.start()
+    seeder.join()
+    if seeder.exitcode:
+        sys.exit("falha ao popular o banco")
+
+    plan = build_plan()
+    current = {
+        "config": {
+            "authors": args.authors,
+            "articles": args.articles,
+            "content_kb": args.content_kb,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "workers": args.workers,
+            "threads": args.threads,
+            "seed": args.seed,
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "results": {},
+    }
+
+    for mode in SERVERS:
+        if args.mode in ("all", mode):
+            current["results"][mode] = run_server(plan, mode)
+    if args.mode in ("all", "client"):
+        current["results"]["test_client"] = run_client(plan)
+
+    for mode, result in current["results"].items():
+        print_result(mode, result)
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(current, output, indent=2)
+
+    regressions = []
+    if args.compare:
+        with open(args.compare) as baseline:
+            regressions = compare(json.load(baseline), current)
+
+        print(f"\ncomparação com {args.compare}:")
+        for regression in regressions or ["nenhuma regressão"]:
+            print(f"  {regression}")
+
+    workdir.cleanup()
+    sys.exit(1 if regressions else 0)
@@ -0,0 +1,143 @@
+"""Compara o custo do logging nas threads das requisições.
+
+Uso:
+    python -m benchmarks.logging_pipeline --records 20000
+
+O primeiro cenário reproduz a configuração antiga, com um
+RotatingFileHandler síncrono que girava o arquivo a cada 10 KB. O segundo é
+a configuração atual, em que a requisição apenas enfileira o registro e a
+escrita é feita pela thread do QueueListener. Por fim, compara um log de
+debug desativado formatado com f-string e com argumentos (formatação lazy).
+"""
+
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+import argparse
+import logging
+import os
+import queue
+import statistics
+import tempfile
+import time
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument("--records", type=int, default=20000)
+parser.add_argument("--repeat", type=int, default=5)
+args = parser.parse_args()
+
+workdir = tempfile.TemporaryDirectory()
+os.environ["LOG_PATH"] = workdir.name
+
+from logger import get_logging_config  # noqa: E402
+
+detailed = logging.Formatter(
+    get_logging_config(workdir.name)["formatters"]["detailed"]["format"]
+)
+
+
+def file_handler(name, max_bytes):
+    """Cria um handler de arquivo com rotação no diretório temporário."""
+    handler = RotatingFileHandler(
+        os.path.join(workdir.name, name),
+        maxBytes=max_bytes,
+        backupCount=10,
+        encoding="utf-8",
+    )
+    handler.setFormatter(detailed)
+    return handler
+
+
+def emit(target):
+    """Registra as mensagens e retorna o tempo médio por registro."""
+    begin = time.perf_counter()
+
+    for i in range(args.records):
+        target.info("Artigo com ID: #artigo-%d encontrado com sucesso", i)
+
+    return (time.perf_counter() - begin) / args.records
+
+
+def synchronous():
+    """Configuração antiga: escrita e rotação na thread da requisição."""
+    target = logging.getLogger("benchmark.sync")
+    handler = file_handler("sync.log", 10000)
+    target.addHandler(handler)
+
+    elapsed = emit(target)
+
+    target.removeHandler(handler)
+    handler.close()
+    return elapsed, 0.0
+
+
+def queued():
+    """Configuração atual: a requisição apenas enfileira o registro."""
+    target = logging.getLogger("benchmark.queue")
+    records = queue.SimpleQueue()
+    handler = QueueHandler(records)
+    listener = QueueListener(records, file_handler("queue.log", 10 << 20))
+    target.addHandler(handler)
+    listener.start()
+
+    elapsed = emit(target)
+
+    # tempo para a thread do listener esvaziar a fila
+    begin = time.perf_counter()
+    listener.stop()
+    drain = time.perf_counter() - begin
+
+    target.removeHandler(handler)
+    for file in listener.handlers:
+        file.close()
+    return elapsed, drain
+
+
+def disabled_debug(lazy):
+    """Mede um log de debug desativado com uma listagem de 50 linhas."""
+    target = logging.getLogger("benchmark.debug")
+    rows = [("artigo-%d" % i, "Título", 1) for i in range(50)]
+    begin = time.perf_counter()
+
+    for _ in range(args.records):
+        if lazy:
+            target.debug("Artigos: %s", rows)
+        else:
+            target.debug(f"Artigos: {rows}")
+
+    return (time.perf_counter() - begin) / args.records, 0.0
+
+
+def measure(scenario, *scenario_args):
+    """Retorna as medianas do custo por registro e do esvaziamento."""
+    results = [scenario(*scenario_args) for _ in range(args.repeat)]
+    return (
+        statistics.median(r[0] for r in results),
+        statistics.median(r[1] for r in results),
+    )
+
+
+if __name__ == "__main__":
+    for name in ("benchmark.sync", "benchmark.queue", "benchmark.debug"):
+        logging.getLogger(name).propagate = False
+    logging.getLogger("benchmark.debug").setLevel(logging.INFO)
+
+    print(
+        f"{args.records} registros por execução, "
+        f"mediana de {args.repeat} execuções (custo na thread da requisição)"
+    )
+
+    sync_time, _ = measure(synchronous)
+    queue_time, drain = measure(queued)
+    print(f"{'síncrono':>16}: {sync_time * 1e6:8.2f} µs/registro")
+    print(
+        f"{'fila':>16}: {queue_time * 1e6:8.2f} µs/registro"
+        f" (fila esvaziada em {drain * 1000:.1f} ms)"
+    )
+    print(f"{'ganho':>16}: {sync_time / queue_time:8.1f} x")
+
+    eager_time, _ = measure(disabled_debug, False)
+    lazy_time, _ = measure(disabled_debug, True)
+    print(f"{'debug f-string':>16}: {eager_time * 1e6:8.2f} µs/registro")
+    print(f"{'debug lazy':>16}: {lazy_time * 1e6:8.2f} µs/registro")
+    print(f"{'ganho':>16}: {eager_time / lazy_time:8.1f} x")
+
+    workdir.cleanup()
@@ -0,0 +1,180 @@
+"""Mede o tempo de inicialização da API (importação e `create_app`).
+
+Uso:
+    python -m benchmarks.startup --repeat 10 --output startup.json
+    python -m benchmarks.startup --repeat 10 --compare startup.json
+
+Cada medição roda em um interpretador novo, como um worker recém iniciado
+ou um comando da CLI. São medidos o processo inteiro, a importação do
+módulo `app` e a chamada de `create_app`, com um banco novo (que cria as
+tabelas) e com um banco já preparado (em que o marcador de versão do schema
+evita o `create_all` e as migrações). A importação não deve criar arquivos:
+o diretório de logs e o banco só podem surgir em `create_app`.
+
+Com --compare, as medianas que pioraram mais que --tolerance em relação a
+uma execução anterior (ou qualquer efeito colateral da importação) fazem o
+comando terminar com erro, o que permite usá-lo como verificação no build.
+"""
+
+from datetime import datetime
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument("--repeat", type=int, default=10)
+parser.add_argument("--output", help="arquivo JSON com os resultados")
+parser.add_argument("--compare", help="resultado anterior usado como base")
+parser.add_argument(
+    "--tolerance",
+    type=float,
+    default=0.25,
+    help="piora relativa tolerada antes de acusar uma regressão",
+)
+args = parser.parse_args()
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# executado em cada interpretador novo; imprime as medições em JSON
+PROBE = """
+import json, os, sys, time
+
+paths = (os.environ["LOG_PATH"], os.environ["DB_FILE"])
+existing = [path for path in paths if os.path.exists(path)]
+
+started = time.perf_counter()
+import app
+imported = time.perf_counter()
+
+created = [
+    path for path in paths if path not in existing and os.path.exists(path)
+]
+
+app.create_app()
+finished = time.perf_counter()
+
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "create_app_ms": (finished - imported) * 1000,
+    "import_side_effects": created,
+}))
+"""
+
+
+def probe(workdir, database):
+    """Inicia um interpretador novo e retorna as suas medições."""
+    env = dict(
+        os.environ,
+        DB_URL="sqlite:///%s" % database,
+        DB_FILE=database,
+        LOG_PATH=os.path.join(workdir, "log"),
+        LOG_LEVEL="WARNING",
+    )
+
+    begin = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=SERVER_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    result = json.loads(completed.stdout.splitlines()[-1])
+    result["process_ms"] = (time.perf_counter() - begin) * 1000
+    return result
+
+
+def scenario(warm):
+    """Mede --repeat inicializações, com banco novo ou já preparado."""
+    runs = []
+
+    for _ in range(args.repeat):
+        with tempfile.TemporaryDirectory() as workdir:
+            database = os.path.join(workdir, "startup.sqlite3")
+
+            if warm:
+                # o primeiro processo cria as tabelas e grava o marcador
+                probe(workdir, database)
+
+            runs.append(probe(workdir, database))
+
+    side_effects = sorted(
+        {path for run in runs for path in run["import_side_effects"]}
+    )
+
+    return {
+        key: round(statistics.median(run[key] for run in runs), 2)
+        for key in ("process_ms", "import_ms", "create_app_ms")
+    } | {"import_side_effects": side_effects}
+
+
+def compare(baseline, current) -> list:
+    """Lista as medianas que pioraram além da tolerância."""
+    regressions = []
+
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+
+        for key in ("process_ms", "import_ms", "create_app_ms"):
+            if result[key] > base[key] * (1 + args.tolerance):
+                regressions.append(
+                    f"{name}: {key} {base[key]} -> {result[key]}"
+                )
+
+    return regressions
+
+
+if __name__ == "__main__":
+    current = {
+        "config": {"repeat": args.repeat},
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "results": {
+            "cold": scenario(warm=False),
+            "warm": scenario(warm=True),
+        },
+    }
+
+    print(
+        f"mediana de {args.repeat} inicializações "
+        f"{'processo':>10} {'importação':>11} {'create_app':>11}"
+    )
+    for name, result in current["results"].items():
+        print(
+            f"{name:>36} {result['process_ms']:>8.1f} ms "
+            f"{result['import_ms']:>8.1f} ms "
+            f"{result['create_app_ms']:>8.1f} ms"
+        )
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(current, output, indent=2)
+
+    # a importação nunca deve criar arquivos, com ou sem base de comparação
+    regressions = [
+        f"{name}: a importação criou {path}"
+        for name, result in current["results"].items()
+        for path in result["import_side_effects"]
+    ]
+    if args.compare:
+        with open(args.compare) as baseline:
+            regressions += compare(json.load(baseline), current)
+
+        print(f"\ncomparação com {args.compare}:")
+    for regression in regressions or ["nenhuma regressão"]:
+        print(f"  {regression}")
+
+    sys.exit(1 if regressions else 0)
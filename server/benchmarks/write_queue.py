@@ -0,0 +1,138 @@
+"""Compara as escritas concorrentes com e sem a fila de escrita única.
+
+Uso:
+    python -m benchmarks.write_queue --processes 4 --threads 8 --writes 200
+
+Cada cenário inicia `--processes` processos (como os workers do gunicorn),
+cada um com `--threads` threads que enviam `POST /author` pelo test client
+do Flask sobre o mesmo banco sqlite temporário. O primeiro cenário executa
+cada escrita na própria thread (DB_WRITE_QUEUE=false); o segundo as envia à
+fila do processo, que agrupa as escritas pendentes em uma transação e
+arbitra os processos com um lock de arquivo. Um `--busy-timeout` curto
+torna visíveis as falhas por "database is locked".
+"""
+
+from threading import Thread
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument("--processes", type=int, default=4)
+parser.add_argument("--threads", type=int, default=8)
+parser.add_argument("--writes", type=int, default=200)
+parser.add_argument("--busy-timeout", type=int, default=1000)
+args = parser.parse_args()
+
+workdir = tempfile.TemporaryDirectory()
+
+
+def configure(queue_enabled, database):
+    """Configura o processo antes da importação da aplicação."""
+    os.environ["DB_URL"] = "sqlite:///%s/%s" % (workdir.name, database)
+    os.environ["LOG_PATH"] = workdir.name
+    os.environ["LOG_LEVEL"] = "CRITICAL"
+    os.environ["DB_SQLITE_BUSY_TIMEOUT"] = str(args.busy_timeout)
+    os.environ["DB_WRITE_QUEUE"] = "true" if queue_enabled else "false"
+
+
+def worker(queue_enabled, database, index, start, results):
+    """Envia as escritas das threads de um processo."""
+    configure(queue_enabled, database)
+
+    from app import create_app
+
+    app = create_app()
+    counts = {"ok": 0, "errors": 0}
+
+    def send(thread):
+        client = app.test_client()
+        for i in range(args.writes):
+            response = client.post(
+                "/author",
+                data={
+                    "first_name": "Autor",
+                    "last_name": f"{index}-{thread}-{i}",
+                    "email": f"autor-{index}-{thread}-{i}@example.com",
+                },
+            )
+            key = "ok" if response.status_code == 200 else "errors"
+            counts[key] += 1
+
+    threads = [Thread(target=send, args=(t,)) for t in range(args.threads)]
+    start.wait()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    results.put(counts)
+
+
+def scenario(queue_enabled):
+    """Executa um cenário e retorna o tempo total e as contagens."""
+    database = "queue.sqlite3" if queue_enabled else "direct.sqlite3"
+    context = multiprocessing.get_context("fork")
+
+    # cria o banco antes da medição
+    setup = context.Process(target=configure_database, args=(database,))
+    setup.start()
+    setup.join()
+
+    start = context.Event()
+    results = context.Queue()
+    processes = [
+        context.Process(
+            target=worker, args=(queue_enabled, database, i, start, results)
+        )
+        for i in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+
+    # aguarda a importação da aplicação em todos os processos
+    time.sleep(2)
+    begin = time.perf_counter()
+    start.set()
+
+    totals = {"ok": 0, "errors": 0}
+    for _ in processes:
+        counts = results.get()
+        totals["ok"] += counts["ok"]
+        totals["errors"] += counts["errors"]
+    elapsed = time.perf_counter() - begin
+
+    for process in processes:
+        process.join()
+
+    return elapsed, totals
+
+
+def configure_database(database):
+    """Cria as tabelas do banco do cenário."""
+    configure(False, database)
+
+    from models import init_db
+
+    init_db()
+
+
+if __name__ == "__main__":
+    total = args.processes * args.threads * args.writes
+    print(
+        f"{args.processes} processos x {args.threads} threads x "
+        f"{args.writes} escritas ({total} autores), "
+        f"busy_timeout={args.busy_timeout} ms"
+    )
+
+    for name, queue_enabled in (("direto", False), ("fila", True)):
+        elapsed, totals = scenario(queue_enabled)
+        print(
+            f"{name:>8}: {elapsed:7.2f} s  "
+            f"{totals['ok'] / elapsed:8.0f} escritas/s  "
+            f"{totals['errors']} falhas"
+        )
+
+    workdir.cleanup()
@@ -0,0 +1,74 @@
+"""Configuração do gunicorn para a API em produção.
+
+Cada valor pode ser sobrescrito por uma variável GUNICORN_<NOME> (ou pela
+linha de comando do gunicorn). Com preload_app, a aplicação (e a engine do
+banco, criada na importação de `models`) é carregada uma única vez no
+processo principal e herdada pelos workers no fork; o hook `post_fork`
+descarta as conexões herdadas para que nenhuma conexão sqlite seja
+compartilhada entre processos.
+"""
+
+import multiprocessing
+import os
+import shutil
+
+from shared.utils import env_bool, env_int, env_str
+
+bind = env_str("GUNICORN_BIND", "0.0.0.0:5000")
+
+# o sqlite aceita um único escritor, então mais processos que CPUs apenas
+# aumentam a disputa pelo lock de escrita; as threads atendem as
+# requisições que esperam pelo banco
+workers = env_int("GUNICORN_WORKERS", multiprocessing.cpu_count())
+threads = env_int("GUNICORN_THREADS", 4)
+
+preload_app = env_bool("GUNICORN_PRELOAD_APP", True)
+
+# recicla os workers periodicamente, limitando o crescimento da memória; o
+# jitter evita que todos reiniciem ao mesmo tempo
+max_requests = env_int("GUNICORN_MAX_REQUESTS", 1000)
+max_requests_jitter = env_int("GUNICORN_MAX_REQUESTS_JITTER", 100)
+
+keepalive = env_int("GUNICORN_KEEPALIVE", 5)
+timeout = env_int("GUNICORN_TIMEOUT", 30)
+graceful_timeout = env_int("GUNICORN_GRACEFUL_TIMEOUT", 30)
+
+# as métricas dos workers são agregadas pelos arquivos deste diretório (ver
+# metrics.py), que deve existir antes da importação da aplicação
+metrics_dir = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+
+if metrics_dir:
+    os.makedirs(metrics_dir, exist_ok=True)
+
+
+def on_starting(server):
+    """Esvazia o diretório das métricas antes de criar os workers.
+
+    Remove os valores de execuções anteriores e os do processo principal,
+    que não atende requisições.
+    """
+    if metrics_dir:
+        shutil.rmtree(metrics_dir, ignore_errors=True)
+        os.makedirs(metrics_dir)
+
+
+def post_fork(server, worker):
+    """Prepara o worker recém criado.
+
+    As conexões do pool herdadas do processo principal são abandonadas sem
+    serem fechadas (elas continuam pertencendo a ele), e o worker abre as
+    suas. As threads que escrevem os logs também não são herdadas no fork.
+    """
+    from logger import restart_listeners
+    from models import engine
+
+    engine.dispose(close=False)
+    restart_listeners()
+
+
+def child_exit(server, worker):
+    """Remove as métricas de gauge do worker encerrado."""
+    if metrics_dir:
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
@@ -1,71 +1,194 @@
 from logging.config import dictConfig
+from logging.handlers import QueueHandler, QueueListener
+import atexit
 import logging
 import os
+import queue
 
+from shared.utils import env_int, env_str
 
-log_path = "log/"
-# Verifica se o diretorio para armexanar os logs não existe
-if not os.path.exists(log_path):
-    # então cria o diretorio
-    os.makedirs(log_path)
 
+def get_file_handler(filename: str) -> dict:
+    """Monta a configuração de um handler de arquivo com rotação.
 
-dictConfig({
-    "version": 1,
-    "disable_existing_loggers": True,
-    "formatters": {
-        "default": {
-            "format": "[%(asctime)s] %(levelname)-4s %(funcName)s() L%(lineno)-4d %(message)s",
+    A rotação é definida pela variável LOG_ROTATION: "size" (padrão) gira o
+    arquivo ao atingir LOG_MAX_BYTES e "time" gira no intervalo definido por
+    LOG_ROTATE_WHEN (ex.: "midnight"). LOG_BACKUP_COUNT define quantos
+    arquivos antigos são mantidos.
+    """
+    handler = {
+        "formatter": "detailed",
+        "filename": filename,
+        "backupCount": env_int("LOG_BACKUP_COUNT", 10),
+        "delay": True,
+        "encoding": "utf-8",
+    }
+
+    if env_str("LOG_ROTATION", "size") == "time":
+        handler.update(
+            {
+                "class": "logging.handlers.TimedRotatingFileHandler",
+                "when": env_str("LOG_ROTATE_WHEN", "midnight"),
+            }
+        )
+    else:
+        handler.update(
+            {
+                "class": "logging.handlers.RotatingFileHandler",
+                "maxBytes": env_int("LOG_MAX_BYTES", 10 * 1024 * 1024),
+            }
+        )
+
+    return handler
+
+
+def get_logging_config(log_path: str) -> dict:
+    """Monta a configuração de logging da aplicação."""
+    return {
+        "version": 1,
+        # os loggers dos módulos são criados na importação, antes da
+        # configuração feita por create_app
+        "disable_existing_loggers": False,
+        "formatters": {
+            "default": {
+                "format": "[%(asctime)s] %(levelname)-4s %(funcName)s() L%(lineno)-4d %(message)s",
+            },
+            "detailed": {
+                "format": "[%(asctime)s] %(levelname)-4s %(funcName)s() L%(lineno)-4d %(message)s - call_trace=%(pathname)s L%(lineno)-4d",
+            },
+        },
+        "handlers": {
+            "console": {
+                "class": "logging.StreamHandler",
+                "formatter": "default",
+                "stream": "ext://sys.stdout",
+            },
+            # "email": {
+            #     "class": "logging.handlers.SMTPHandler",
+            #     "formatter": "default",
+            #     "level": "ERROR",
+            #     "mailhost": ("smtp.example.com", 587),
+            #     "fromaddr": "devops@example.com",
+            #     "toaddrs": ["receiver@example.com", "receiver2@example.com"],
+            #     "subject": "Error Logs",
+            #     "credentials": ("username", "password"),
+            # },
+            "error_file": get_file_handler(
+                os.path.join(log_path, "gunicorn.error.log")
+            ),
+            "detailed_file": get_file_handler(
+                os.path.join(log_path, "gunicorn.detailed.log")
+            ),
         },
-        "detailed": {
-            "format": "[%(asctime)s] %(levelname)-4s %(funcName)s() L%(lineno)-4d %(message)s - call_trace=%(pathname)s L%(lineno)-4d",
-        }
-    },
-    "handlers": {
-        "console": {
-            "class": "logging.StreamHandler",
-            "formatter": "default",
-            "stream": "ext://sys.stdout",
+        "loggers": {
+            "gunicorn.error": {
+                "handlers": ["console", "error_file"],  # , email],
+                "level": "INFO",
+                "propagate": False,
+            }
         },
-        # "email": {
-        #     "class": "logging.handlers.SMTPHandler",
-        #     "formatter": "default",
-        #     "level": "ERROR",
-        #     "mailhost": ("smtp.example.com", 587),
-        #     "fromaddr": "devops@example.com",
-        #     "toaddrs": ["receiver@example.com", "receiver2@example.com"],
-        #     "subject": "Error Logs",
-        #     "credentials": ("username", "password"),
-        # },
-        "error_file": {
-            "class": "logging.handlers.RotatingFileHandler",
-            "formatter": "detailed",
-            "filename": "log/gunicorn.error.log",
-            "maxBytes": 10000,
-            "backupCount": 10,
-            "delay": "True",
+        "root": {
+            "handlers": ["console", "detailed_file"],
+            "level": env_str("LOG_LEVEL", "INFO"),
         },
-        "detailed_file": {
-            "class": "logging.handlers.RotatingFileHandler",
-            "formatter": "detailed",
-            "filename": "log/gunicorn.detailed.log",
-            "maxBytes": 10000,
-            "backupCount": 10,
-            "delay": "True",
-        }
-    },
-    "loggers": {
-        "gunicorn.error": {
-            "handlers": ["console", "error_file"],  # , email],
-            "level": "INFO",
-            "propagate": False,
-        }
-    },
-    "root": {
-        "handlers": ["console", "detailed_file"],
-        "level": "INFO",
     }
-})
 
 
+def enqueue_handlers(target: logging.Logger, handlers=None) -> QueueListener:
+    """Troca os handlers do logger por uma fila.
+
+    As threads das requisições apenas enfileiram os registros; a escrita no
+    console e nos arquivos (incluindo a rotação) é feita pela thread do
+    QueueListener.
+
+    Args:
+        target (Logger): Logger cujos registros passam pela fila.
+        handlers (list, optional): Handlers que escrevem os registros; por
+            padrão, os do próprio logger.
+
+    Returns:
+        QueueListener: Listener já iniciado, que consome a fila.
+    """
+    records = queue.SimpleQueue()
+    current = list(target.handlers)
+
+    if handlers is None:
+        handlers = current
+
+    for handler in current:
+        target.removeHandler(handler)
+
+    target.addHandler(QueueHandler(records))
+
+    listener = QueueListener(records, *handlers, respect_handler_level=True)
+    listener.start()
+    return listener
+
+
+def setup_logging(log_path: str = None) -> list:
+    """Configura o logging com a escrita feita fora das requisições.
+
+    A configuração é feita uma única vez por processo, pela fábrica da
+    aplicação (`create_app`); importar este módulo não cria diretórios nem
+    handlers.
+
+    Args:
+        log_path (str, optional): Diretório dos arquivos de log (LOG_PATH,
+            por padrão).
+
+    Returns:
+        list: Os QueueListeners iniciados, que são parados (descarregando a
+        fila) ao encerrar o processo.
+    """
+    if listeners:
+        return listeners
+
+    log_path = log_path or env_str("LOG_PATH", "log/")
+
+    # Verifica se o diretorio para armazenar os logs não existe
+    if not os.path.exists(log_path):
+        # então cria o diretorio
+        os.makedirs(log_path)
+
+    dictConfig(get_logging_config(log_path))
+
+    listeners.extend(
+        enqueue_handlers(logging.getLogger(name)) for name in QUEUED_LOGGERS
+    )
+    atexit.register(stop_listeners)
+
+    return listeners
+
+
+def stop_listeners():
+    """Para os QueueListeners do processo, descarregando as filas."""
+    for listener in listeners:
+        listener.stop()
+
+
+def restart_listeners():
+    """Recria os QueueListeners em um processo filho.
+
+    O fork (dos workers do gunicorn com preload_app, por exemplo) copia as
+    filas, mas não as threads que as consomem. Os listeners herdados são
+    parados (sem a thread, que não existe no filho, não há o que aguardar)
+    e cada logger passa a usar uma fila nova, consumida por um listener com
+    os mesmos handlers. Os registros que ficaram na fila herdada são do
+    processo principal, que os escreve.
+    """
+    for index, (name, inherited) in enumerate(
+        zip(QUEUED_LOGGERS, listeners)
+    ):
+        inherited.stop()
+        listeners[index] = enqueue_handlers(
+            logging.getLogger(name), inherited.handlers
+        )
+
+
+# loggers cujos registros passam por uma fila, na ordem de `listeners`
+QUEUED_LOGGERS = (None, "gunicorn.error")
+
+# listeners do processo, preenchidos por setup_logging
+listeners = []
+
 logger = logging.getLogger(__name__)
@@ -0,0 +1,176 @@
+"""Métricas da aplicação no formato do Prometheus.
+
+Os contadores ficam em memória e são atualizados sem chamadas externas.
+Com vários workers do gunicorn, a variável PROMETHEUS_MULTIPROC_DIR deve
+apontar para um diretório vazio (criado antes de iniciar o servidor): cada
+worker grava os seus valores em arquivos desse diretório e o endpoint
+/metrics agrega os valores de todos os workers.
+"""
+
+import os
+import re
+import time
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+
+REQUESTS = Counter(
+    "http_requests_total",
+    "Requisições atendidas",
+    ["method", "blueprint", "route", "status"],
+)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Tempo de resposta das requisições",
+    ["method", "blueprint", "route"],
+)
+
+POOL_EVENTS = Counter(
+    "db_pool_events_total",
+    "Eventos do pool de conexões (connect, checkout, checkin, invalidate)",
+    ["event"],
+)
+
+POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Conexões do pool em uso",
+    multiprocess_mode="livesum",
+)
+
+SQLITE_LOCK_WAIT = Histogram(
+    "sqlite_lock_wait_seconds",
+    "Tempo da primeira escrita de cada transação, que inclui a espera pelo "
+    "lock de escrita do sqlite",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+
+SQLITE_LOCK_TIMEOUTS = Counter(
+    "sqlite_lock_timeouts_total",
+    "Consultas que falharam com 'database is locked'",
+)
+
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Leituras dos caches da aplicação",
+    ["cache", "result"],
+)
+
+AUTHOR_DELETION_ARTICLES = Counter(
+    "author_deletion_articles_total",
+    "Artigos removidos pelas remoções de autores em segundo plano",
+)
+
+# instruções que adquirem o lock de escrita do sqlite
+_WRITE_STATEMENT = re.compile(
+    r"\s*(INSERT|UPDATE|DELETE|REPLACE|BEGIN\s+IMMEDIATE)\b", re.IGNORECASE
+)
+
+
+def is_multiprocess() -> bool:
+    """Verifica se as métricas são agregadas entre processos."""
+    return "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+
+def generate_metrics() -> bytes:
+    """Gera o texto exposto pelo endpoint /metrics."""
+    if is_multiprocess():
+        # as métricas são lidas dos arquivos de todos os workers
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+
+    return generate_latest(REGISTRY)
+
+
+def observe_request(method, blueprint, route, status, duration):
+    """Registra uma requisição atendida."""
+    REQUESTS.labels(method, blueprint, route, status).inc()
+    REQUEST_LATENCY.labels(method, blueprint, route).observe(duration)
+
+
+class CacheMetrics:
+    """Repassa ao Prometheus os acertos e as faltas de um LRUCache.
+
+    O LRUCache mantém os próprios contadores; a cada sincronização apenas a
+    diferença desde a última leitura é somada às métricas, o que mantém a
+    leitura do cache livre de chamadas extras.
+    """
+
+    def __init__(self, name, cache):
+        self.cache = cache
+        self.hits = CACHE_REQUESTS.labels(name, "hit")
+        self.misses = CACHE_REQUESTS.labels(name, "miss")
+        self._last = {"hits": 0, "misses": 0}
+
+    def sync(self):
+        """Soma às métricas os acessos feitos desde a última chamada."""
+        stats = self.cache.stats()
+
+        for counter, metric in (("hits", self.hits), ("misses", self.misses)):
+            delta = stats[counter] - self._last[counter]
+            if delta > 0:
+                metric.inc(delta)
+            self._last[counter] = stats[counter]
+
+
+def watch_engine(engine):
+    """Registra os listeners que alimentam as métricas do banco."""
+
+    def count(name):
+        def listener(*args):
+            POOL_EVENTS.labels(name).inc()
+
+        return listener
+
+    for name in ("connect", "checkout", "checkin", "invalidate"):
+        event.listen(engine, name, count(name))
+
+    event.listen(engine, "checkout", lambda *args: POOL_CHECKED_OUT.inc())
+
+    @event.listens_for(engine, "checkin")
+    def release_connection(dbapi_connection, connection_record):
+        POOL_CHECKED_OUT.dec()
+        # a transação não finalizada é desfeita ao devolver a conexão
+        connection_record.info.pop("write_lock_acquired", None)
+
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_write(conn, cursor, statement, parameters, context, many):
+        if "write_lock_acquired" not in conn.info and _WRITE_STATEMENT.match(
+            statement
+        ):
+            conn.info["write_lock_requested"] = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_write(conn, cursor, statement, parameters, context, many):
+        requested = conn.info.pop("write_lock_requested", None)
+
+        if requested is not None:
+            # o lock é mantido até o fim da transação
+            conn.info["write_lock_acquired"] = True
+            SQLITE_LOCK_WAIT.observe(time.perf_counter() - requested)
+
+    @event.listens_for(engine, "commit")
+    @event.listens_for(engine, "rollback")
+    def release_write(conn):
+        conn.info.pop("write_lock_acquired", None)
+
+    @event.listens_for(engine, "handle_error")
+    def count_lock_timeout(context):
+        if "database is locked" in str(context.original_exception):
+            SQLITE_LOCK_TIMEOUTS.inc()
+
+        if context.connection is not None:
+            context.connection.info.pop("write_lock_requested", None)
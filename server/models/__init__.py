@@ -1,31 +1,89 @@
 from sqlalchemy_utils import database_exists, create_database
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session as BaseSession, sessionmaker
 from sqlalchemy import create_engine, event
 from sqlalchemy.engine import Engine
+from sqlalchemy.engine.url import make_url
+from sqlalchemy.pool import QueuePool
+from contextvars import ContextVar
+from threading import Lock
+import sqlite3
 import os
 
 # importando os elementos definidos no modelo
 from .base import Base
 from models.article import Article
+from models.article_body import ArticleBody
 from models.author import Author
+from models.author_deletion import AuthorDeletion
+from models.instrumentation import watch_queries
+from models.migrations import (
+    is_schema_current,
+    mark_schema_version,
+    schema_version,
+    upgrade,
+)
+from models.pool import PoolStats, pool_stats, watch_pool
+from models.sqlite import apply_pragmas, get_sqlite_pragmas
+from models.writer import DirectWriter, WriteQueue, get_write_lock_path
+from shared.utils import env_bool, env_int
+from metrics import watch_engine
+
+
+# PRAGMAs do perfil sqlite definido por DB_SQLITE_PROFILE
+sqlite_pragmas = get_sqlite_pragmas()
 
 
 @event.listens_for(Engine, "connect")
 def set_sqlite_pragma(dbapi_connection, connection_record):
-    """Ativa o suporte a foreign keys no sqlite3."""
-    cursor = dbapi_connection.cursor()
-    cursor.execute("PRAGMA foreign_keys=ON")
-    cursor.close()
+    """Aplica o perfil de PRAGMAs (foreign keys, WAL, cache...) no sqlite3."""
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        apply_pragmas(dbapi_connection, sqlite_pragmas)
+
+
+def is_memory_database(url) -> bool:
+    """Verifica se a url aponta para um banco sqlite em memória."""
+    url = make_url(url)
+    return url.get_backend_name() == "sqlite" and url.database in (
+        None,
+        "",
+        ":memory:",
+    )
+
+
+def get_engine_options(url) -> dict:
+    """Monta os parâmetros de criação da engine.
+
+    O pool de conexões é configurado pelas variáveis de ambiente
+    DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE e
+    DB_POOL_PRE_PING. Bancos sqlite em memória mantêm o pool padrão do
+    SQLAlchemy, já que cada nova conexão abriria um banco vazio.
+    """
+    options = {"echo": False}
+
+    if is_memory_database(url):
+        return options
+
+    options.update(
+        {
+            "poolclass": QueuePool,
+            "pool_size": env_int("DB_POOL_SIZE", 5),
+            "max_overflow": env_int("DB_MAX_OVERFLOW", 10),
+            "pool_timeout": env_int("DB_POOL_TIMEOUT", 30),
+            "pool_recycle": env_int("DB_POOL_RECYCLE", 3600),
+            "pool_pre_ping": env_bool("DB_POOL_PRE_PING", True),
+        }
+    )
+
+    if make_url(url).get_backend_name() == "sqlite":
+        # as conexões do pool são compartilhadas entre as threads do worker
+        options["connect_args"] = {"check_same_thread": False}
+
+    return options
 
 
 # define o caminho do banco
 db_path = "database/"
 
-# Verifica se o diretório não existe
-if not os.path.exists(db_path):
-    # então cria o diretório
-    os.makedirs(db_path)
-
 # url de acesso ao banco (essa é uma url de acesso ao sqlite local)
 db_url = "sqlite:///%s/db.sqlite3" % db_path
 
@@ -33,15 +91,98 @@ db_url = "sqlite:///%s/db.sqlite3" % db_path
 db_url = os.getenv("DB_URL", db_url)
 
 
-# cria a engine de conexão com o banco
-engine = create_engine(db_url, echo=False)
+# cria a engine de conexão com o banco; nenhuma conexão é aberta até o
+# primeiro uso, e o banco é preparado por `init_db`
+engine = create_engine(db_url, **get_engine_options(db_url))
+
+# registra os contadores de checkout/checkin do pool
+watch_pool(engine)
+
+# mede as consultas executadas em cada requisição
+watch_queries(engine)
+
+# métricas do pool e do lock de escrita, expostas em /metrics
+watch_engine(engine)
+
+# engine das sessões abertas no contexto atual; no modo ASGI, cada
+# requisição usa a engine asyncio (ver models/aio.py) e as demais threads
+# continuam usando `engine`
+current_bind = ContextVar("current_bind", default=None)
+
+
+class ContextSession(BaseSession):
+    """Sessão que usa a engine do contexto atual, quando houver uma."""
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        bind = current_bind.get()
+
+        if bind is not None:
+            return bind
+
+        return super().get_bind(mapper, clause, **kwargs)
+
+
+# Instância um criador de sessão com o banco. As sessões devem ser usadas
+# como gerenciadores de contexto (`with Session() as session:`), para que
+# sejam fechadas e devolvam a conexão ao pool ao fim de cada requisição.
+Session = sessionmaker(bind=engine, class_=ContextSession)
+
+# executor das escritas dos services (`writer.run(write)`); com
+# DB_WRITE_QUEUE=true, as escritas de cada processo são agrupadas por uma
+# única thread (ver models/writer.py)
+if env_bool("DB_WRITE_QUEUE", False):
+    writer = WriteQueue(
+        Session,
+        get_write_lock_path(db_url),
+        batch_size=env_int("DB_WRITE_BATCH_SIZE", 64),
+    )
+else:
+    writer = DirectWriter(Session)
+
+_initialized = False
+_init_lock = Lock()
+
+
+def init_db():
+    """Prepara o banco: cria o diretório, o banco, as tabelas e migrações.
+
+    Executado uma única vez por processo (pela fábrica da aplicação, pelos
+    comandos e pelos testes); as chamadas seguintes retornam imediatamente.
+    As tabelas e as migrações só são verificadas quando o marcador de versão
+    gravado no banco difere do schema atual (ver models/migrations.py).
+    """
+    global _initialized
+
+    if _initialized:
+        return
+
+    with _init_lock:
+        if _initialized:
+            return
+
+        url = engine.url
+
+        if url.get_backend_name() == "sqlite":
+            directory = os.path.dirname(url.database or "")
+
+            # Verifica se o diretório não existe
+            if directory and not os.path.exists(directory):
+                # então cria o diretório
+                os.makedirs(directory)
+
+        # o sqlite cria o arquivo do banco na primeira conexão
+        elif not database_exists(url):
+            create_database(url)
+
+        version = schema_version()
+
+        if not is_schema_current(engine, version):
+            # cria as tabelas do banco, caso não existam
+            Base.metadata.create_all(engine)
 
-# Instância um criador de sessão com o banco
-Session = sessionmaker(bind=engine)
+            # atualiza bancos criados por versões anteriores
+            upgrade(engine)
 
-# cria o banco se ele não existir
-if not database_exists(engine.url):
-    create_database(engine.url)
+            mark_schema_version(engine, version)
 
-# cria as tabelas do banco, caso não existam
-Base.metadata.create_all(engine)
+        _initialized = True
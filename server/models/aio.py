@@ -0,0 +1,104 @@
+"""Engine asyncio usada pela API no modo ASGI.
+
+No modo ASGI (ver asgi.py), as requisições são atendidas no event loop, e
+cada uma roda em um greenlet (ver shared/utils/asgi.py). As sessões abertas
+pelos services nessa requisição usam a face síncrona da engine asyncio
+(`AsyncEngine.sync_engine`), como as do `AsyncSession` do SQLAlchemy: cada
+consulta suspende o greenlet e devolve o event loop às demais requisições
+até o driver (aiosqlite) responder. Os services são os mesmos do modo WSGI.
+
+A concorrência de cada processo passa a ser limitada pelo pool da engine
+(DB_ASYNC_POOL_SIZE + DB_ASYNC_MAX_OVERFLOW conexões no sqlite, DB_POOL_SIZE
++ DB_MAX_OVERFLOW nos demais bancos) e não pela quantidade de threads.
+"""
+
+from sqlalchemy import event
+from sqlalchemy.engine.url import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from metrics import watch_engine
+from models import current_bind, db_url, get_engine_options, sqlite_pragmas
+from models.instrumentation import watch_queries
+from models.pool import watch_pool
+from models.sqlite import apply_pragmas
+from shared.utils import env_int
+
+# drivers asyncio de cada banco
+ASYNC_DRIVERS = {
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg",
+}
+
+
+def get_async_url(url):
+    """Troca o driver da url pelo driver asyncio do mesmo banco.
+
+    Raises:
+        ValueError: caso não haja um driver asyncio para o banco.
+    """
+    url = make_url(url)
+    backend = url.get_backend_name()
+
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"Banco sem driver asyncio: '{backend}'")
+
+    return url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+
+
+def get_async_engine_options(url) -> dict:
+    """Monta os parâmetros da engine asyncio a partir dos da engine síncrona.
+
+    O pool configurado por DB_POOL_* é trocado pela sua versão asyncio. No
+    sqlite, o tamanho do pool vem de DB_ASYNC_POOL_SIZE (4, como as threads
+    de um worker WSGI) e DB_ASYNC_MAX_OVERFLOW (0): como o pool limita as
+    requisições atendidas ao mesmo tempo, as 15 conexões do pool síncrono
+    fariam mais transações disputarem o único escritor do sqlite, e as
+    escritas passariam a esperar segundos pelo lock (ver o README).
+    """
+    options = get_engine_options(url)
+
+    if options.get("poolclass") is QueuePool:
+        options["poolclass"] = AsyncAdaptedQueuePool
+
+        if make_url(url).get_backend_name() == "sqlite":
+            options["pool_size"] = env_int("DB_ASYNC_POOL_SIZE", 4)
+            options["max_overflow"] = env_int("DB_ASYNC_MAX_OVERFLOW", 0)
+
+    return options
+
+
+def create_aio_engine(url=db_url):
+    """Cria a engine asyncio, com os mesmos PRAGMAs e métricas da síncrona.
+
+    Returns:
+        AsyncEngine: A engine; nenhuma conexão é aberta até o primeiro uso.
+    """
+    engine = create_async_engine(
+        get_async_url(url), **get_async_engine_options(url)
+    )
+    sync_engine = engine.sync_engine
+
+    if sync_engine.dialect.name == "sqlite":
+
+        @event.listens_for(sync_engine, "connect")
+        def set_sqlite_pragma(dbapi_connection, connection_record):
+            # a conexão do aiosqlite não é uma sqlite3.Connection, então o
+            # listener de models/__init__.py não se aplica a ela
+            apply_pragmas(dbapi_connection, sqlite_pragmas)
+
+    watch_pool(sync_engine)
+    watch_queries(sync_engine)
+    watch_engine(sync_engine)
+
+    return engine
+
+
+def bind_async_engine(engine):
+    """Faz as sessões do contexto atual usarem a engine asyncio.
+
+    Deve ser chamada dentro do greenlet da requisição; as sessões abertas
+    fora dele (como as das threads de remoção de autores) continuam usando
+    a engine síncrona.
+    """
+    current_bind.set(engine.sync_engine)
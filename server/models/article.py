@@ -1,10 +1,19 @@
 """Arquivo com a estrutura da classe Article."""
 
-from sqlalchemy import Column, ForeignKey, Integer, String, DateTime, Text
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+)
+from sqlalchemy.ext.associationproxy import association_proxy
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from typing import Union
 from models import Base
+from models.article_body import ArticleBody
 from shared.utils import *
 
 
@@ -17,19 +26,39 @@ class Article(Base):
     """
 
     __tablename__ = "articles"
+    __table_args__ = (
+        # chave da paginação por cursor da listagem de artigos
+        Index("ix_articles_created_at_id", "created_at", "id"),
+    )
 
     id = Column(String(50), primary_key=True)
     title = Column(String(90), unique=True)
     subtitle = Column(String(200), nullable=False)
-    created_at = Column(DateTime, default=datetime.now())
-    content = Column(Text, nullable=False)
+    # as funções são chamadas a cada inserção/edição, e não na importação
+    created_at = Column(DateTime, default=datetime.now)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+
+    # O conteúdo é guardado na tabela 'article_bodies' e só é carregado
+    # quando acessado; 'content' continua disponível como atributo do artigo.
+    body = relationship(
+        "ArticleBody",
+        uselist=False,
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+    content = association_proxy(
+        "body", "content", creator=lambda content: ArticleBody(content)
+    )
 
     # Definição do relacionamento entre o comentário e um produto.
     # Aqui está sendo definido a coluna 'produto' que vai guardar
     # a referencia ao produto, a chave estrangeira que relaciona
     # um produto ao comentário.
     author_id = Column(
-        Integer, ForeignKey("authors.pk_author", ondelete="CASCADE")
+        Integer,
+        ForeignKey("authors.pk_author", ondelete="CASCADE"),
+        # usado na contagem de artigos por autor e na remoção em cascata
+        index=True,
     )
     author = relationship(
         "Author", foreign_keys="Article.author_id", back_populates="articles"
@@ -76,7 +105,8 @@ class Article(Base):
         if created_at:
             self.created_at = created_at
 
-    def generate_id(self, title):
+    @staticmethod
+    def generate_id(title):
         """Gera um id para o artigo baseado no título."""
         id_string = remove_special_chars(title)
         id_string = replace_spaces(id_string)
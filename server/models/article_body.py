@@ -0,0 +1,43 @@
+"""Arquivo com a estrutura da classe ArticleBody."""
+
+from sqlalchemy import Column, ForeignKey, String, Text
+from models import Base
+
+
+class ArticleBody(Base):
+    """Define a estrutura da tabela com o conteúdo dos artigos.
+
+    O conteúdo fica separado da tabela de artigos para que listagens,
+    contagens e joins percorram apenas linhas pequenas. Ele só é lido na
+    visualização e na edição de um artigo.
+
+    Args:
+        Base (Type[_DeclarativeBase]): Classe base para a criação de novas
+            tabelas.
+    """
+
+    __tablename__ = "article_bodies"
+
+    article_id = Column(
+        String(50),
+        ForeignKey("articles.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    content = Column(Text, nullable=False)
+
+    def __init__(self, content: str, article_id: str = None):
+        """
+        Cria o conteúdo de um artigo.
+
+        Args:
+            content (str): Conteúdo do artigo.
+            article_id (str, optional): ID do artigo. Se não for especificado,
+                será preenchido ao salvar o artigo relacionado.
+
+        Returns:
+            None
+        """
+        if article_id:
+            self.article_id = article_id
+
+        self.content = content
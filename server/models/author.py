@@ -1,6 +1,6 @@
 """Arquivo com a estrutura da classe Article."""
 
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Index, Integer, String, DateTime
 from sqlalchemy_utils import EmailType
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -17,6 +17,12 @@ class Author(Base):
     """
 
     __tablename__ = "authors"
+    __table_args__ = (
+        # chave da paginação por cursor da listagem de autores
+        Index("ix_authors_created_at_id", "created_at", "pk_author"),
+        # autores em remoção, ignorados nas leituras
+        Index("ix_authors_deleted_at", "deleted_at"),
+    )
 
     id = Column("pk_author", Integer, primary_key=True)
     first_name = Column(String(40), nullable=False)
@@ -24,7 +30,12 @@ class Author(Base):
     email = Column(EmailType, nullable=False, unique=True)
     avatar_url = Column(String(90))
     twitter_username = Column(String(60))
-    created_at = Column(DateTime, default=datetime.now())
+    # as funções são chamadas a cada inserção/edição, e não na importação
+    created_at = Column(DateTime, default=datetime.now)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+    # preenchida quando a remoção do autor é iniciada: o autor e os seus
+    # artigos deixam de ser exibidos enquanto são removidos em segundo plano
+    deleted_at = Column(DateTime)
 
     # Definição do relacionamento entre o produto e o comentário.
     # Essa relação é implicita, não está salva na tabela 'produto',
@@ -0,0 +1,60 @@
+"""Arquivo com a estrutura da classe AuthorDeletion."""
+
+from sqlalchemy import Column, DateTime, Index, Integer, String
+from datetime import datetime
+from models import Base
+
+
+class AuthorDeletion(Base):
+    """Define a estrutura da tabela de remoções de autores.
+
+    Cada linha acompanha a remoção de um autor em segundo plano: os artigos
+    são removidos em lotes e, por fim, o próprio autor. A tabela não tem
+    chave estrangeira para 'authors', já que o registro permanece após a
+    remoção do autor.
+
+    Args:
+        Base (Type[_DeclarativeBase]): Classe base para a criação de novas
+            tabelas.
+    """
+
+    __tablename__ = "author_deletions"
+    __table_args__ = (
+        # remoções interrompidas, retomadas na inicialização
+        Index("ix_author_deletions_status", "status"),
+    )
+
+    # situações possíveis de uma remoção
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+    id = Column(Integer, primary_key=True)
+    author_id = Column(Integer, nullable=False, index=True)
+    status = Column(String(10), nullable=False, default=PENDING)
+    articles_total = Column(Integer, nullable=False, default=0)
+    articles_deleted = Column(Integer, nullable=False, default=0)
+    error = Column(String(200))
+    created_at = Column(DateTime, default=datetime.now)
+    # atualizada a cada lote; uma remoção "running" sem atualizações recentes
+    # foi interrompida (queda do worker) e pode ser retomada
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+    finished_at = Column(DateTime)
+
+    def __init__(self, author_id: int, articles_total: int = 0):
+        """
+        Registra a remoção de um autor.
+
+        Args:
+            author_id (int): ID do autor removido.
+            articles_total (int, optional): Quantidade de artigos do autor
+                no início da remoção.
+
+        Returns:
+            None
+        """
+        self.author_id = author_id
+        self.articles_total = articles_total
+        self.status = self.PENDING
+        self.articles_deleted = 0
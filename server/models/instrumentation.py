@@ -0,0 +1,86 @@
+"""Contagem e tempo das consultas SQL executadas em cada requisição."""
+
+from collections import Counter
+from contextvars import ContextVar
+import re
+import time
+
+from sqlalchemy import event
+
+# listas de parâmetros de um IN (?, ?, ?) viram um único marcador
+_PARAMETER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """Normaliza a consulta, para que execuções repetidas sejam agrupadas."""
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    return _PARAMETER_LIST.sub("(?)", statement)
+
+
+class QueryStats:
+    """Acumula as consultas executadas durante uma requisição."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes = Counter()
+
+    def record(self, statement: str, duration: float):
+        """Registra uma consulta e o tempo gasto nela, em segundos."""
+        self.count += 1
+        self.duration += duration
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self, threshold: int) -> list:
+        """Retorna as consultas executadas mais de `threshold` vezes.
+
+        Returns:
+            list: Pares (consulta, execuções), das mais repetidas para as
+            menos repetidas.
+        """
+        return [
+            (shape, count)
+            for shape, count in self.shapes.most_common()
+            if count > threshold
+        ]
+
+
+# estatísticas da requisição em andamento; cada thread (ou contexto) do
+# worker tem o seu valor, e fora de uma requisição nada é registrado
+current_query_stats = ContextVar("current_query_stats", default=None)
+
+
+def start_query_stats() -> QueryStats:
+    """Passa a registrar as consultas do contexto atual."""
+    stats = QueryStats()
+    current_query_stats.set(stats)
+    return stats
+
+
+def stop_query_stats():
+    """Para de registrar e retorna as consultas do contexto atual."""
+    stats = current_query_stats.get()
+    current_query_stats.set(None)
+    return stats
+
+
+def watch_queries(engine):
+    """Registra os listeners que medem as consultas da engine."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(
+        conn, cursor, statement, parameters, context, executemany
+    ):
+        if current_query_stats.get() is not None:
+            conn.info["query_start_time"] = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(
+        conn, cursor, statement, parameters, context, executemany
+    ):
+        stats = current_query_stats.get()
+        started = conn.info.pop("query_start_time", None)
+
+        if stats is not None and started is not None:
+            stats.record(statement, time.perf_counter() - started)
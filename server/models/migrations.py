@@ -0,0 +1,168 @@
+"""Migrações aplicadas aos bancos criados por versões anteriores da API.
+
+O `create_all` só cria as tabelas que ainda não existem, então colunas e
+índices adicionados depois são criados aqui. Cada passo deve ser idempotente,
+já que todos são executados a cada inicialização.
+"""
+
+from sqlalchemy import inspect, text
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.schema import CreateIndex, CreateTable
+import sqlite3
+import zlib
+
+from models.base import Base
+from models.search import (
+    CREATE_DELETE_TRIGGER,
+    CREATE_SEARCH_IDS_TABLE,
+    CREATE_SEARCH_TABLE,
+    create_search_index,
+)
+
+
+def create_missing_indexes(engine):
+    """Cria os índices declarados nos modelos que ainda não existem."""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+
+
+def split_article_bodies(engine):
+    """Move o conteúdo dos artigos para a tabela 'article_bodies'.
+
+    Bancos antigos guardam o conteúdo na coluna 'articles.content'. O
+    conteúdo é copiado para 'article_bodies' (criada pelo `create_all`) e a
+    coluna é removida, o que exige sqlite 3.35 ou superior.
+    """
+    columns = [c["name"] for c in inspect(engine).get_columns("articles")]
+
+    if "content" not in columns:
+        return
+
+    is_sqlite = engine.dialect.name == "sqlite"
+
+    if is_sqlite and sqlite3.sqlite_version_info < (3, 35, 0):
+        raise RuntimeError(
+            "A migração de 'articles.content' para 'article_bodies' requer "
+            f"sqlite 3.35 ou superior (atual: {sqlite3.sqlite_version})"
+        )
+
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "INSERT INTO article_bodies (article_id, content) "
+                "SELECT id, content FROM articles "
+                "WHERE id NOT IN (SELECT article_id FROM article_bodies)"
+            )
+        )
+        connection.execute(text("ALTER TABLE articles DROP COLUMN content"))
+
+    if not is_sqlite:
+        return
+
+    # devolve ao sistema as páginas que guardavam o conteúdo
+    with engine.connect() as connection:
+        connection.execution_options(isolation_level="AUTOCOMMIT").execute(
+            text("VACUUM")
+        )
+
+
+def add_updated_at_columns(engine):
+    """Adiciona a coluna 'updated_at' aos artigos e autores.
+
+    Nos registros existentes, a data de edição passa a ser a de criação.
+    """
+    for table in ("articles", "authors"):
+        columns = [c["name"] for c in inspect(engine).get_columns(table)]
+
+        if "updated_at" in columns:
+            continue
+
+        with engine.begin() as connection:
+            connection.execute(
+                text(f"ALTER TABLE {table} ADD COLUMN updated_at DATETIME")
+            )
+            connection.execute(
+                text(f"UPDATE {table} SET updated_at = created_at")
+            )
+
+
+def add_author_deleted_at_column(engine):
+    """Adiciona a coluna 'deleted_at', que marca os autores em remoção."""
+    columns = [c["name"] for c in inspect(engine).get_columns("authors")]
+
+    if "deleted_at" in columns:
+        return
+
+    with engine.begin() as connection:
+        connection.execute(
+            text("ALTER TABLE authors ADD COLUMN deleted_at DATETIME")
+        )
+
+
+# passos executados, em ordem, por `upgrade`
+MIGRATIONS = [
+    split_article_bodies,
+    add_updated_at_columns,
+    add_author_deleted_at_column,
+    create_missing_indexes,
+    create_search_index,
+]
+
+
+def upgrade(engine):
+    """Aplica todas as migrações ao banco da engine informada."""
+    for migration in MIGRATIONS:
+        migration(engine)
+
+
+def schema_version() -> int:
+    """Calcula o marcador da versão do schema declarado no código.
+
+    O marcador é um hash do DDL das tabelas e índices dos modelos, do índice
+    de busca e dos nomes das migrações, então muda sozinho quando o schema
+    muda, sem precisar ser incrementado à mão.
+
+    Returns:
+        int: Valor positivo de 31 bits, que cabe no `user_version` do sqlite.
+    """
+    dialect = sqlite.dialect()
+    statements = []
+
+    for table in Base.metadata.sorted_tables:
+        statements.append(CreateTable(table).compile(dialect=dialect))
+        for index in sorted(table.indexes, key=lambda index: index.name):
+            statements.append(CreateIndex(index).compile(dialect=dialect))
+
+    statements.extend(
+        (CREATE_SEARCH_TABLE, CREATE_SEARCH_IDS_TABLE, CREATE_DELETE_TRIGGER)
+    )
+    statements.extend(migration.__name__ for migration in MIGRATIONS)
+
+    schema = "\n".join(str(statement) for statement in statements)
+    return zlib.crc32(schema.encode()) & 0x7FFFFFFF
+
+
+def is_schema_current(engine, version: int) -> bool:
+    """Verifica se o banco já está na versão de schema informada.
+
+    Apenas o sqlite guarda o marcador (no `PRAGMA user_version`); nos demais
+    bancos as tabelas e migrações são sempre verificadas.
+    """
+    if engine.dialect.name != "sqlite":
+        return False
+
+    with engine.connect() as connection:
+        current = connection.exec_driver_sql("PRAGMA user_version").scalar()
+
+    return current == version
+
+
+def mark_schema_version(engine, version: int):
+    """Grava o marcador da versão do schema no banco."""
+    if engine.dialect.name != "sqlite":
+        return
+
+    with engine.begin() as connection:
+        # o PRAGMA não aceita parâmetros; o valor é sempre um inteiro
+        connection.exec_driver_sql(f"PRAGMA user_version = {int(version)}")
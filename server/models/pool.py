@@ -0,0 +1,70 @@
+"""Contadores de uso do pool de conexões com o banco."""
+
+from threading import Lock
+
+from sqlalchemy import event
+
+
+class PoolStats:
+    """Acumula os eventos do pool de conexões de uma engine.
+
+    Os contadores são por processo: cada worker do gunicorn mantém os seus.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self.reset()
+
+    def reset(self):
+        """Zera todos os contadores."""
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+
+    def increment(self, counter):
+        """Incrementa um dos contadores de forma segura entre threads."""
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    @property
+    def checked_out(self):
+        """Quantidade de conexões em uso no momento."""
+        return self.checkouts - self.checkins
+
+    def snapshot(self) -> dict:
+        """Retorna uma cópia dos contadores atuais."""
+        with self._lock:
+            return {
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "checked_out": self.checked_out,
+                "invalidations": self.invalidations,
+            }
+
+
+# contadores do pool da engine principal da aplicação
+pool_stats = PoolStats()
+
+
+def watch_pool(engine, stats: PoolStats = pool_stats):
+    """Registra os listeners que alimentam os contadores do pool."""
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        stats.increment("connects")
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        stats.increment("checkouts")
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        stats.increment("checkins")
+
+    @event.listens_for(engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        stats.increment("invalidations")
+
+    return stats
@@ -0,0 +1,210 @@
+"""Índice de busca textual (FTS5) dos artigos.
+
+O índice 'articles_fts' guarda o título, o subtítulo e o conteúdo sem HTML
+de cada artigo. A chave de cada entrada vem de 'article_search_ids', que
+associa um inteiro estável (um INTEGER PRIMARY KEY) ao id do artigo. O
+rowid de 'articles' não serve como chave, já que a tabela tem uma chave
+primária de texto e um VACUUM pode renumerá-lo. As buscas e remoções usam
+apenas chaves primárias e índices únicos das três tabelas.
+
+As remoções (inclusive as feitas em cascata pela remoção de um autor) são
+propagadas por um trigger. Inserções e edições são indexadas pelos
+services, já que o HTML é removido em Python.
+"""
+
+from sqlalchemy import DateTime, inspect, text
+
+from shared.utils import strip_html
+
+SEARCH_TABLE = "articles_fts"
+SEARCH_IDS_TABLE = "article_search_ids"
+
+CREATE_SEARCH_TABLE = text(
+    "CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5("
+    "title, subtitle, content, tokenize='unicode61 remove_diacritics 2')"
+)
+
+CREATE_SEARCH_IDS_TABLE = text(
+    "CREATE TABLE IF NOT EXISTS article_search_ids ("
+    "id INTEGER PRIMARY KEY, article_id VARCHAR(50) NOT NULL UNIQUE)"
+)
+
+CREATE_DELETE_TRIGGER = text(
+    "CREATE TRIGGER IF NOT EXISTS articles_fts_delete "
+    "AFTER DELETE ON articles BEGIN "
+    "DELETE FROM articles_fts WHERE rowid = "
+    "(SELECT id FROM article_search_ids WHERE article_id = OLD.id); "
+    "DELETE FROM article_search_ids WHERE article_id = OLD.id; "
+    "END"
+)
+
+# chave da entrada do artigo no índice
+ENTRY_ID = "(SELECT id FROM article_search_ids WHERE article_id = :id)"
+
+INSERT_ID = text(
+    "INSERT OR IGNORE INTO article_search_ids (article_id) VALUES (:id)"
+)
+
+INSERT_ENTRY = text(
+    "INSERT INTO articles_fts (rowid, title, subtitle, content) "
+    f"VALUES ({ENTRY_ID}, :title, :subtitle, :content)"
+)
+
+UPDATE_ENTRY = text(
+    "UPDATE articles_fts "
+    "SET title = :title, subtitle = :subtitle, content = :content "
+    f"WHERE rowid = {ENTRY_ID}"
+)
+
+# marcadores usados no snippet antes do escape do HTML
+MATCH_START = "\x02"
+MATCH_END = "\x03"
+
+# pesos do bm25 para título, subtítulo e conteúdo
+SEARCH_QUERY = text(
+    "SELECT a.id, a.title, a.subtitle, a.author_id, a.created_at, "
+    "snippet(articles_fts, 2, :start, :end, '…', 24) AS snippet "
+    "FROM articles_fts "
+    "JOIN article_search_ids AS ids ON ids.id = articles_fts.rowid "
+    "JOIN articles AS a ON a.id = ids.article_id "
+    "WHERE articles_fts MATCH :query "
+    "AND a.author_id NOT IN "
+    "(SELECT pk_author FROM authors WHERE deleted_at IS NOT NULL) "
+    "ORDER BY bm25(articles_fts, 10.0, 5.0, 1.0) "
+    "LIMIT :limit"
+).columns(created_at=DateTime)
+
+
+def index_entries(session, entries):
+    """Adiciona as entradas dos artigos ao índice de busca.
+
+    Args:
+        session (Session): Sessão (ou conexão) da transação em que os
+            artigos foram inseridos.
+        entries (list): Dicionários com o id, o título, o subtítulo e o
+            conteúdo (sem HTML) de cada artigo.
+    """
+    session.execute(INSERT_ID, [{"id": entry["id"]} for entry in entries])
+    session.execute(INSERT_ENTRY, entries)
+
+
+def reindex_article(session, article_id, title, subtitle, content):
+    """Adiciona (ou atualiza) a entrada do artigo no índice de busca."""
+    entry = {
+        "id": article_id,
+        "title": title,
+        "subtitle": subtitle,
+        "content": strip_html(content),
+    }
+
+    if not session.execute(UPDATE_ENTRY, entry).rowcount:
+        index_entries(session, [entry])
+
+
+def index_article(session, article):
+    """Adiciona (ou atualiza) a entrada do artigo no índice de busca.
+
+    Deve ser chamada após o flush do artigo, na mesma transação.
+    """
+    reindex_article(
+        session, article.id, article.title, article.subtitle, article.content
+    )
+
+
+def build_match_query(terms: str) -> str:
+    """Converte o texto digitado em uma expressão MATCH do FTS5.
+
+    Cada termo vira uma frase entre aspas, o que evita erros de sintaxe com
+    operadores e aspas digitados pelo usuário. Todos os termos devem estar
+    presentes no artigo; o último também casa como prefixo.
+    """
+    tokens = ['"%s"' % token.replace('"', '""') for token in terms.split()]
+
+    if tokens:
+        tokens[-1] += "*"
+
+    return " ".join(tokens)
+
+
+def search(session, terms: str, limit: int):
+    """Busca os artigos que contêm os termos, ordenados por relevância."""
+    query = build_match_query(terms)
+
+    if not query:
+        return []
+
+    return session.execute(
+        SEARCH_QUERY,
+        {
+            "query": query,
+            "limit": limit,
+            "start": MATCH_START,
+            "end": MATCH_END,
+        },
+    ).all()
+
+
+def rebuild_search_index(engine, batch_size: int = 500) -> int:
+    """Reconstrói o índice de busca a partir das tabelas de artigos.
+
+    Returns:
+        int: Quantidade de artigos indexados.
+    """
+    indexed = 0
+
+    with engine.begin() as connection:
+        connection.execute(text("DELETE FROM articles_fts"))
+        connection.execute(
+            text(
+                "DELETE FROM article_search_ids "
+                "WHERE article_id NOT IN (SELECT id FROM articles)"
+            )
+        )
+
+        rows = connection.execution_options(stream_results=True).execute(
+            text(
+                "SELECT a.id, a.title, a.subtitle, b.content "
+                "FROM articles AS a "
+                "LEFT JOIN article_bodies AS b ON b.article_id = a.id"
+            )
+        )
+
+        for batch in rows.partitions(batch_size):
+            index_entries(
+                connection,
+                [
+                    {
+                        "id": row.id,
+                        "title": row.title,
+                        "subtitle": row.subtitle,
+                        "content": strip_html(row.content),
+                    }
+                    for row in batch
+                ],
+            )
+            indexed += len(batch)
+
+    return indexed
+
+
+def create_search_index(engine):
+    """Cria o índice de busca e o trigger de remoção, caso não existam.
+
+    Ao ser criado, o índice é populado com os artigos já existentes. O
+    índice das versões anteriores, cuja chave era o rowid de 'articles', é
+    substituído.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+
+    if inspect(engine).has_table(SEARCH_IDS_TABLE):
+        return
+
+    with engine.begin() as connection:
+        connection.execute(text("DROP TRIGGER IF EXISTS articles_fts_delete"))
+        connection.execute(text(f"DROP TABLE IF EXISTS {SEARCH_TABLE}"))
+        connection.execute(CREATE_SEARCH_TABLE)
+        connection.execute(CREATE_SEARCH_IDS_TABLE)
+        connection.execute(CREATE_DELETE_TRIGGER)
+
+    rebuild_search_index(engine)
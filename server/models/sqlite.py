@@ -0,0 +1,110 @@
+"""Perfis de PRAGMAs aplicados às conexões sqlite."""
+
+import sqlite3
+
+from shared.utils import env_str
+
+
+# perfis disponíveis através da variável de ambiente DB_SQLITE_PROFILE
+SQLITE_PROFILES = {
+    # apenas o necessário para manter a integridade referencial
+    "default": {
+        "foreign_keys": "ON",
+    },
+    # leitores não bloqueiam o escritor (WAL) e as páginas quentes ficam em
+    # memória; com synchronous=NORMAL o WAL continua consistente, podendo
+    # perder apenas as últimas transações em caso de queda de energia
+    "production": {
+        "foreign_keys": "ON",
+        "busy_timeout": "5000",
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": "268435456",
+        "cache_size": "-65536",
+        "temp_store": "MEMORY",
+    },
+}
+
+# valores aceitos para os PRAGMAs que não são numéricos
+ALLOWED_VALUES = {
+    "foreign_keys": {"ON", "OFF"},
+    "journal_mode": {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"},
+    "synchronous": {"OFF", "NORMAL", "FULL", "EXTRA"},
+    "temp_store": {"DEFAULT", "FILE", "MEMORY"},
+}
+
+NUMERIC_PRAGMAS = ("mmap_size", "cache_size", "busy_timeout")
+
+
+def validate_pragma(name: str, value: str) -> str:
+    """Valida o valor de um PRAGMA antes de ele ser interpolado no SQL.
+
+    Raises:
+        ValueError: caso o valor não seja aceito para o PRAGMA.
+    """
+    value = value.strip().upper()
+
+    if name in NUMERIC_PRAGMAS:
+        try:
+            return str(int(value))
+        except ValueError:
+            raise ValueError(f"PRAGMA {name} deve ser numérico: '{value}'")
+
+    if value not in ALLOWED_VALUES[name]:
+        raise ValueError(f"Valor inválido para o PRAGMA {name}: '{value}'")
+
+    return value
+
+
+def get_sqlite_pragmas() -> dict:
+    """Monta os PRAGMAs a partir do perfil escolhido.
+
+    O perfil é definido por DB_SQLITE_PROFILE ("production" por padrão) e
+    cada PRAGMA pode ser sobrescrito individualmente por uma variável
+    DB_SQLITE_<PRAGMA>, como DB_SQLITE_JOURNAL_MODE ou DB_SQLITE_MMAP_SIZE.
+    Uma variável vazia remove o PRAGMA do perfil.
+    """
+    profile_name = env_str("DB_SQLITE_PROFILE", "production")
+
+    if profile_name not in SQLITE_PROFILES:
+        raise ValueError(f"Perfil sqlite desconhecido: '{profile_name}'")
+
+    pragmas = dict(SQLITE_PROFILES[profile_name])
+
+    for name in list(ALLOWED_VALUES) + list(NUMERIC_PRAGMAS):
+        value = env_str(f"DB_SQLITE_{name.upper()}")
+
+        if value is None:
+            continue
+
+        if value.strip() == "":
+            pragmas.pop(name, None)
+        else:
+            pragmas[name] = value
+
+    return {
+        name: validate_pragma(name, value) for name, value in pragmas.items()
+    }
+
+
+def apply_pragmas(dbapi_connection, pragmas: dict):
+    """Executa os PRAGMAs em uma conexão sqlite recém aberta."""
+    cursor = dbapi_connection.cursor()
+
+    for name, value in pragmas.items():
+        cursor.execute(f"PRAGMA {name}={value}")
+
+    cursor.close()
+
+
+def supports_returning(engine) -> bool:
+    """Verifica se o banco aceita `UPDATE ... RETURNING` (sqlite 3.35+).
+
+    O SQLAlchemy 1.4 não gera RETURNING para o sqlite, então as consultas
+    que o utilizam são escritas em SQL e só devem ser usadas quando esta
+    função retorna verdadeiro.
+    """
+    return (
+        engine.dialect.name == "sqlite"
+        and sqlite3.sqlite_version_info >= (3, 35, 0)
+    )
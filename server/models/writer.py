@@ -0,0 +1,193 @@
+"""Execução das escritas no banco.
+
+O sqlite aceita um único escritor por vez. Com vários workers (e threads)
+escrevendo ao mesmo tempo, cada transação disputa o lock de escrita e pode
+esperar até o `busy_timeout` ou falhar com "database is locked".
+
+Com DB_WRITE_QUEUE=true, as escritas dos services são enviadas a uma fila
+atendida por uma única thread por processo. A thread agrupa as escritas já
+enfileiradas (até DB_WRITE_BATCH_SIZE) em uma só transação, iniciada com
+`BEGIN IMMEDIATE`, e devolve o resultado de cada uma a quem a enviou. Cada
+escrita roda em um SAVEPOINT, então o erro de uma (um título repetido, por
+exemplo) não desfaz as demais. Entre processos, as transações são
+serializadas por um lock de arquivo (fcntl), o que evita a espera ativa do
+sqlite pelo lock.
+
+Sem a fila, cada escrita é executada e efetivada na própria thread, em uma
+sessão dedicada.
+"""
+
+from concurrent.futures import Future
+from threading import Lock, Thread
+import queue
+
+from sqlalchemy import text
+from sqlalchemy.engine.url import make_url
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+
+def get_write_lock_path(url):
+    """Retorna o arquivo usado como lock de escrita entre processos.
+
+    Returns:
+        str: Caminho ao lado do arquivo do banco sqlite, ou None para bancos
+        em memória e outros bancos.
+    """
+    url = make_url(url)
+
+    if url.get_backend_name() != "sqlite" or url.database in (
+        None,
+        "",
+        ":memory:",
+    ):
+        return None
+
+    return url.database + ".write-lock"
+
+
+class DirectWriter:
+    """Executa cada escrita em uma sessão e transação próprias."""
+
+    def __init__(self, session_factory):
+        self.session_factory = session_factory
+
+    def run(self, write):
+        """Executa a escrita e efetiva a transação.
+
+        Args:
+            write (Callable): Função que recebe a sessão, faz as alterações
+                (sem efetivá-las) e retorna o resultado da escrita.
+
+        Returns:
+            O valor retornado por `write`.
+        """
+        with self.session_factory() as session:
+            result = write(session)
+            session.commit()
+            return result
+
+
+class WriteQueue:
+    """Fila de escritas atendida por uma única thread do processo.
+
+    As escritas enfileiradas enquanto uma transação é efetivada formam a
+    transação seguinte, então o agrupamento cresce com a concorrência sem
+    atrasar uma escrita isolada.
+    """
+
+    def __init__(self, session_factory, lock_path=None, batch_size=64):
+        self.session_factory = session_factory
+        self.lock_path = lock_path
+        self.batch_size = batch_size
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._start_lock = Lock()
+        self._lock_file = None
+
+    def submit(self, write) -> Future:
+        """Enfileira a escrita.
+
+        Returns:
+            Future: Resultado da escrita, disponível após a efetivação da
+            transação em que ela foi incluída.
+        """
+        future = Future()
+        self._queue.put((write, future))
+        self._ensure_started()
+        return future
+
+    def run(self, write, timeout=None):
+        """Enfileira a escrita e aguarda o seu resultado.
+
+        Raises:
+            Exception: O erro da própria escrita ou da efetivação da
+                transação.
+        """
+        return self.submit(write).result(timeout)
+
+    def _ensure_started(self):
+        # a thread é iniciada no primeiro uso; um processo criado por fork
+        # (workers do gunicorn) não herda a thread e inicia a sua
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._lock_file = None
+                self._thread = Thread(
+                    target=self._serve, name="db-writer", daemon=True
+                )
+                self._thread.start()
+
+    def _next_batch(self) -> list:
+        """Aguarda uma escrita e junta a ela as que já estão na fila."""
+        batch = [self._queue.get()]
+
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+
+        return batch
+
+    def _serve(self):
+        while True:
+            batch = self._next_batch()
+
+            try:
+                self._write(batch)
+            except Exception as e:
+                # a transação não foi efetivada: todas as escritas falharam
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def _acquire_file_lock(self):
+        if self.lock_path is None or fcntl is None:
+            return None
+
+        if self._lock_file is None:
+            self._lock_file = open(self.lock_path, "a")
+
+        fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+        return self._lock_file
+
+    def _write(self, batch):
+        """Executa as escritas do lote em uma única transação."""
+        results = []
+        lock_file = self._acquire_file_lock()
+
+        try:
+            with self.session_factory() as session:
+                if session.get_bind().dialect.name == "sqlite":
+                    # o lock de escrita é obtido já no início da transação
+                    session.execute(text("BEGIN IMMEDIATE"))
+
+                for write, future in batch:
+                    if not future.set_running_or_notify_cancel():
+                        continue
+
+                    savepoint = session.begin_nested()
+                    try:
+                        result = write(session)
+                        savepoint.commit()
+                        results.append((future, result, None))
+                    except Exception as e:
+                        savepoint.rollback()
+                        results.append((future, None, e))
+
+                session.commit()
+        finally:
+            if lock_file is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+        for future, result, error in results:
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
@@ -1,8 +1,11 @@
+from flask import Response, current_app, request
 from flask_openapi3 import Tag, APIBlueprint
 
 from schemas import *
 from services import *
 from schemas import ErrorSchema
+from routes.conditional import conditional_get
+from shared.utils import NDJSON_MIMETYPES, buffered, iter_ndjson
 
 
 article_tag = Tag(
@@ -16,14 +19,59 @@ article_bp = APIBlueprint("article", __name__)
 @article_bp.get(
     "/articles",
     tags=[article_tag],
-    responses={"200": ArticleListSchema, "404": ErrorSchema},
+    responses={
+        "200": ArticleListSchema,
+        "400": ErrorSchema,
+        "404": ErrorSchema,
+    },
+)
+@conditional_get
+def get_articles(query: PaginationSchema):
+    """Faz a busca paginada pelos artigos cadastrados.
+
+    Retorna uma representação da listagem de artigos. Para buscar a página
+    seguinte, envie o `next_cursor` retornado no parâmetro `cursor`.
+    """
+    return get_all_articles(query)
+
+
+@article_bp.get(
+    "/articles/search",
+    tags=[article_tag],
+    responses={"200": ArticleSearchListSchema},
 )
-def get_articles():
-    """Faz a busca por todos os artigos cadastrados.
+def get_articles_search(query: ArticleTextSearchSchema):
+    """Busca artigos pelos termos informados.
 
-    Retorna uma representação da listagem de artigos.
+    A busca considera o título, o subtítulo e o conteúdo dos artigos, e
+    retorna os resultados ordenados por relevância com um trecho do conteúdo
+    destacando os termos encontrados.
     """
-    return get_all_articles()
+    return search_articles(query)
+
+
+@article_bp.get(
+    "/articles/export",
+    tags=[article_tag],
+    responses={"200": None},
+)
+def get_articles_export():
+    """Exporta todos os artigos em NDJSON (um artigo por linha).
+
+    Cada linha tem a estrutura de ArticleDetailsViewSchema, com o conteúdo e
+    o autor. A resposta é gerada sob demanda e é comprimida, bloco a bloco,
+    com a codificação negociada pelo `Accept-Encoding`.
+    """
+    provider = current_app.json_provider
+    lines = (provider.encode(article) + b"\n" for article in export_articles())
+    headers = {
+        "Content-Disposition": 'attachment; filename="articles.ndjson"'
+    }
+
+    # a compressão é feita por routes/compression.py
+    return Response(
+        buffered(lines), mimetype=NDJSON_MIMETYPES[0], headers=headers
+    )
 
 
 @article_bp.get(
@@ -31,6 +79,7 @@ def get_articles():
     tags=[article_tag],
     responses={"200": ArticleDetailsViewSchema, "404": ErrorSchema},
 )
+@conditional_get
 def get_article(path: ArticleSearchSchema):
     """Busca um artigo específico à partir do id.
 
@@ -57,6 +106,45 @@ def post_article(form: ArticleSchema):
     return add_article(form)
 
 
+@article_bp.post(
+    "/articles/lookup",
+    tags=[article_tag],
+    responses={"200": ArticleDetailsListSchema},
+)
+def post_articles_lookup(body: ArticleIDsSchema):
+    """Busca vários artigos à partir dos ids.
+
+    Retorna os artigos na ordem dos ids informados e a lista dos ids que
+    não foram encontrados.
+    """
+    return get_articles_by_ids(body)
+
+
+@article_bp.post(
+    "/articles/bulk",
+    tags=[article_tag],
+    responses={"200": ArticleBulkResultSchema, "400": ErrorSchema},
+)
+def post_articles_bulk():
+    """Adiciona vários artigos à base de dados.
+
+    O corpo deve ser uma lista JSON de artigos (application/json) ou um
+    artigo por linha (application/x-ndjson), com a estrutura de
+    ArticleSchema. Retorna o resultado de cada item, na ordem enviada.
+    """
+    if request.mimetype in NDJSON_MIMETYPES:
+        # as linhas são lidas sob demanda, sem carregar o corpo inteiro
+        return import_articles(iter_ndjson(request.stream))
+
+    items = request.get_json(silent=True)
+
+    if not isinstance(items, list):
+        error_msg = "O corpo deve ser uma lista JSON ou NDJSON de artigos :/"
+        return {"message": error_msg}, 400
+
+    return import_articles(items)
+
+
 @article_bp.put(
     "/article",
     tags=[article_tag],
@@ -85,3 +173,19 @@ def delete_article(path: ArticleSearchSchema):
     Retorna uma mensagem de confirmação da remoção.
     """
     return delete_article_by_id(path)
+
+
+@article_bp.delete(
+    "/articles",
+    tags=[article_tag],
+    responses={
+        "200": ArticleBatchDeletionSchema,
+        "404": ArticleBatchDeletionSchema,
+    },
+)
+def delete_articles(body: ArticleIDsSchema):
+    """Remove vários artigos à partir dos ids informados.
+
+    Retorna os ids removidos e a lista dos ids que não foram encontrados.
+    """
+    return delete_articles_by_ids(body)
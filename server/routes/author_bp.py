@@ -4,6 +4,7 @@ from schemas import *
 from services import *
 
 from schemas import ErrorSchema
+from routes.conditional import conditional_get
 
 author_tag = Tag(
     name="Autor",
@@ -16,14 +17,20 @@ author_bp = APIBlueprint("author", __name__)
 @author_bp.get(
     "/authors",
     tags=[author_tag],
-    responses={"200": AuthorListSchema, "404": ErrorSchema},
+    responses={
+        "200": AuthorListSchema,
+        "400": ErrorSchema,
+        "404": ErrorSchema,
+    },
 )
-def get_authors():
-    """Faz a busca por todos os autores cadastrados.
+@conditional_get
+def get_authors(query: PaginationSchema):
+    """Faz a busca paginada pelos autores cadastrados.
 
-    Retorna uma representação da listagem de autores.
+    Retorna uma representação da listagem de autores. Para buscar a página
+    seguinte, envie o `next_cursor` retornado no parâmetro `cursor`.
     """
-    return get_all_authors()
+    return get_all_authors(query)
 
 
 @author_bp.get(
@@ -31,6 +38,7 @@ def get_authors():
     tags=[author_tag],
     responses={"200": AuthorDetailsViewSchema, "404": ErrorSchema},
 )
+@conditional_get
 def get_author(path: AuthorSearchSchema):
     """Busca um autor específico à partir do id.
 
@@ -78,7 +86,7 @@ def put_author(form: AuthorUpdateSchema):
     "/author/<int:id>",
     tags=[author_tag],
     responses={
-        "200": AuthorDeletionSchema,
+        "202": AuthorDeletionSchema,
         "404": ErrorSchema,
         "400": ErrorSchema,
     },
@@ -86,6 +94,20 @@ def put_author(form: AuthorUpdateSchema):
 def delete_author(path: AuthorSearchSchema):
     """Remove um author à partir do id informado.
 
-    Retorna uma mensagem de confirmação da remoção.
+    O autor deixa de ser exibido imediatamente e os seus artigos são
+    removidos em segundo plano. Retorna o andamento da remoção.
     """
     return delete_author_by_id(path)
+
+
+@author_bp.get(
+    "/author/deletion/<int:id>",
+    tags=[author_tag],
+    responses={"200": AuthorDeletionViewSchema, "404": ErrorSchema},
+)
+def get_deletion(path: AuthorDeletionSearchSchema):
+    """Busca o andamento da remoção de um autor à partir do id da remoção.
+
+    Retorna uma representação da remoção.
+    """
+    return get_author_deletion(path)
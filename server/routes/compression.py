@@ -0,0 +1,123 @@
+"""Compressão das respostas negociada pelo Accept-Encoding.
+
+As respostas de texto (JSON, NDJSON, HTML, CSS, JavaScript...) são
+comprimidas com zstd, brotli ou gzip, conforme o que o cliente aceita e o
+que está instalado (ver shared/utils/compression.py):
+
+- respostas menores que COMPRESSION_MIN_SIZE bytes seguem sem compressão;
+- respostas geradas sob demanda (como /articles/export) são comprimidas
+  bloco a bloco, sem serem carregadas na memória;
+- os corpos comprimidos de respostas com ETag forte (ver
+  routes/conditional.py) ficam em um cache indexado pelo ETag, então um
+  artigo popular é comprimido uma única vez, e não a cada requisição.
+
+A resposta comprimida passa a ter um ETag fraco com o mesmo valor, o que
+mantém as respostas 304 para os clientes que o enviam no If-None-Match.
+"""
+
+from flask import request
+
+from shared.utils import LRUCache, available_encodings, choose_encoding
+from shared.utils import compress, compress_chunks, env_int
+
+# tamanho mínimo do corpo para que a compressão compense
+MIN_SIZE = env_int("COMPRESSION_MIN_SIZE", 1024)
+
+LEVELS = {
+    "zstd": env_int("COMPRESSION_ZSTD_LEVEL", 3),
+    "br": env_int("COMPRESSION_BROTLI_QUALITY", 4),
+    "gzip": env_int("COMPRESSION_GZIP_LEVEL", 6),
+}
+
+# tipos de conteúdo comprimidos, além dos text/*
+COMPRESSIBLE_MIMETYPES = {
+    "application/json",
+    "application/x-ndjson",
+    "application/ndjson",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+}
+
+# corpos comprimidos, indexados pelo ETag e pela codificação
+compressed_cache = LRUCache(
+    maxsize=env_int("COMPRESSION_CACHE_SIZE", 512),
+    ttl=env_int("COMPRESSION_CACHE_TTL", 300),
+)
+
+
+def is_compressible(response) -> bool:
+    """Verifica se a resposta pode ser comprimida."""
+    if "Content-Encoding" in response.headers:
+        # já comprimida, como o documento OpenAPI pré-calculado
+        return False
+
+    if response.cache_control.no_transform:
+        return False
+
+    mimetype = response.mimetype or ""
+    return (
+        mimetype.startswith("text/") or mimetype in COMPRESSIBLE_MIMETYPES
+    )
+
+
+def compress_response(response):
+    """Comprime a resposta com a codificação negociada."""
+    if not is_compressible(response):
+        return response
+
+    # a representação depende do Accept-Encoding, mesmo sem compressão
+    response.vary.add("Accept-Encoding")
+
+    status = response.status_code
+    successful = 200 <= status < 300 and status not in (204, 206)
+    if not successful and status != 304:
+        return response
+
+    encoding = choose_encoding(
+        request.accept_encodings, available_encodings()
+    )
+    if encoding is None:
+        return response
+
+    etag, weak = response.get_etag()
+
+    if status == 304:
+        # o cliente guardou a versão comprimida, que tem o ETag fraco
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
+
+    if response.is_streamed:
+        # comprime os blocos à medida que são gerados
+        response.response = compress_chunks(
+            response.response, encoding, LEVELS[encoding]
+        )
+        response.direct_passthrough = False
+        response.headers.pop("Content-Length", None)
+    else:
+        body = response.get_data()
+        if len(body) < MIN_SIZE:
+            return response
+
+        # apenas um ETag forte garante que o corpo é sempre o mesmo
+        key = (etag, encoding) if etag and not weak else None
+        compressed = compressed_cache.get(key) if key else None
+
+        if compressed is None:
+            compressed = compress(body, encoding, LEVELS[encoding])
+            if key:
+                compressed_cache.set(key, compressed)
+
+        response.set_data(compressed)
+
+    response.headers["Content-Encoding"] = encoding
+    if etag:
+        response.set_etag(etag, weak=True)
+
+    return response
+
+
+def register_compression(app):
+    """Comprime as respostas da aplicação (ver `compress_response`)."""
+    app.after_request(compress_response)
@@ -0,0 +1,25 @@
+from functools import wraps
+
+from flask import make_response, request
+
+
+def conditional_get(view):
+    """Adiciona ETag e responde 304 a requisições condicionais.
+
+    O ETag forte é o hash do corpo da resposta, e o Last-Modified é o
+    informado pelo service. Quando o cliente envia um If-None-Match (ou um
+    If-Modified-Since) que ainda corresponde à resposta, o corpo é omitido e
+    o status passa a ser 304 Not Modified.
+    """
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        response = make_response(view(*args, **kwargs))
+
+        if response.status_code == 200:
+            response.add_etag()
+            response.make_conditional(request)
+
+        return response
+
+    return wrapper
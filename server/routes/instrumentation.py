@@ -0,0 +1,55 @@
+from flask import request
+
+from logger import logger
+from models.instrumentation import start_query_stats, stop_query_stats
+from shared.utils import env_bool, env_int
+
+
+def instrument_queries(app):
+    """Mede as consultas SQL de cada requisição da aplicação.
+
+    Fora de produção (ou com SQL_TIMING_HEADERS=true), a resposta recebe os
+    cabeçalhos `X-Query-Count` e `Server-Timing` com a quantidade de
+    consultas e o tempo total gasto no banco. Uma consulta executada mais de
+    SQL_REPEATED_QUERY_THRESHOLD vezes na mesma requisição, sintoma comum de
+    N+1 (carregamentos lazy dentro de um loop), gera um aviso no log.
+    """
+    app.config.setdefault(
+        "SQL_TIMING_HEADERS",
+        env_bool("SQL_TIMING_HEADERS", app.config["ENV"] != "production"),
+    )
+    app.config.setdefault(
+        "SQL_REPEATED_QUERY_THRESHOLD",
+        env_int("SQL_REPEATED_QUERY_THRESHOLD", 10),
+    )
+
+    @app.before_request
+    def start_instrumentation():
+        start_query_stats()
+
+    @app.after_request
+    def finish_instrumentation(response):
+        stats = stop_query_stats()
+
+        if stats is None:
+            return response
+
+        threshold = app.config["SQL_REPEATED_QUERY_THRESHOLD"]
+        for shape, count in stats.repeated(threshold):
+            logger.warning(
+                "Possível N+1 em %s %s: consulta executada %d vezes: %s",
+                request.method,
+                request.path,
+                count,
+                shape,
+            )
+
+        if app.config["SQL_TIMING_HEADERS"]:
+            response.headers["X-Query-Count"] = str(stats.count)
+            response.headers.add(
+                "Server-Timing",
+                'db;dur=%.2f;desc="%d consultas"'
+                % (stats.duration * 1000, stats.count),
+            )
+
+        return response
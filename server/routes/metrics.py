@@ -0,0 +1,43 @@
+import time
+
+from flask import Response, g, request
+
+from metrics import CONTENT_TYPE_LATEST, CacheMetrics, generate_metrics
+from metrics import observe_request
+from services.cache import article_details_cache
+
+
+def register_metrics(app):
+    """Coleta as métricas das requisições e expõe o endpoint /metrics.
+
+    As requisições são agrupadas pela regra da rota (ex.: /article/<id>),
+    e não pela url, para manter fixa a quantidade de séries.
+    """
+    cache_metrics = [CacheMetrics("article_details", article_details_cache)]
+
+    @app.before_request
+    def start_timer():
+        g.request_started = time.perf_counter()
+
+    @app.after_request
+    def record_request(response):
+        started = g.pop("request_started", None)
+
+        if started is not None:
+            observe_request(
+                request.method,
+                request.blueprint or "",
+                request.url_rule.rule if request.url_rule else "<unmatched>",
+                response.status_code,
+                time.perf_counter() - started,
+            )
+
+        for metrics in cache_metrics:
+            metrics.sync()
+
+        return response
+
+    def metrics_view():
+        return Response(generate_metrics(), mimetype=CONTENT_TYPE_LATEST)
+
+    app.add_url_rule("/metrics", "metrics", metrics_view, methods=["GET"])
@@ -0,0 +1,259 @@
+"""Documento OpenAPI pré-calculado, servido como um arquivo estático.
+
+O flask-openapi3 monta o documento a partir dos schemas pydantic a cada
+requisição de /openapi/openapi.json, que as telas de documentação buscam a
+cada carregamento. Aqui o documento é serializado uma única vez (no build,
+com `flask build-openapi`, ou na primeira requisição), gravado em
+OPENAPI_DIR com o hash do conteúdo no nome e com as versões gzip e brotli,
+e servido da memória.
+
+O documento gravado é reaproveitado enquanto o código que o define (app.py,
+routes/ e schemas/) e as versões do flask-openapi3 e do pydantic não
+mudam, então os workers nunca o reconstroem na inicialização.
+"""
+
+from dataclasses import dataclass
+import hashlib
+import json
+import os
+
+from flask import request
+import click
+import flask_openapi3
+import pydantic
+
+from logger import logger
+from shared.utils import available_encodings, choose_encoding, compress
+from shared.utils import env_str
+
+OPENAPI_DIR = env_str("OPENAPI_DIR", "build/openapi")
+
+# a url com o hash nunca muda de conteúdo
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# código do qual o documento é gerado
+SOURCES = ("app.py", "routes", "schemas")
+
+# extensão dos arquivos de cada codificação, na ordem de preferência
+ENCODINGS = {"br": ".br", "gzip": ".gz"}
+
+# o documento é comprimido uma única vez, então com o nível máximo
+MAX_LEVELS = {"br": 11, "gzip": 9}
+
+# telas que buscam o documento
+DOC_UI_ENDPOINTS = ("openapi.swagger", "openapi.redoc", "openapi.rapidoc")
+
+
+@dataclass
+class OpenAPIDocument:
+    """Documento serializado e as suas versões comprimidas."""
+
+    digest: str
+    body: bytes
+    compressed: dict
+
+
+def source_fingerprint() -> str:
+    """Calcula o hash do código e das bibliotecas que geram o documento."""
+    digest = hashlib.sha256()
+    digest.update(flask_openapi3.__version__.encode())
+    digest.update(pydantic.VERSION.encode())
+
+    paths = []
+    for source in SOURCES:
+        path = os.path.join(SERVER_DIR, source)
+        if os.path.isdir(path):
+            paths.extend(
+                os.path.join(path, name)
+                for name in os.listdir(path)
+                if name.endswith(".py")
+            )
+        else:
+            paths.append(path)
+
+    for path in sorted(paths):
+        digest.update(os.path.relpath(path, SERVER_DIR).encode())
+        with open(path, "rb") as source:
+            digest.update(source.read())
+
+    return digest.hexdigest()[:16]
+
+
+def build_document(app) -> OpenAPIDocument:
+    """Serializa o documento da aplicação e gera as versões comprimidas."""
+    body = json.dumps(
+        app.api_doc, ensure_ascii=False, sort_keys=True, separators=(",", ":")
+    ).encode()
+    compressed = {
+        encoding: compress(body, encoding, MAX_LEVELS[encoding])
+        for encoding in ENCODINGS
+        if encoding in available_encodings()
+    }
+
+    return OpenAPIDocument(
+        hashlib.sha256(body).hexdigest()[:16], body, compressed
+    )
+
+
+def document_path(directory, digest, encoding=None) -> str:
+    """Retorna o caminho do arquivo do documento (ou de uma versão)."""
+    suffix = ENCODINGS[encoding] if encoding else ""
+    return os.path.join(directory, f"openapi.{digest}.json{suffix}")
+
+
+def write_document(document, directory, fingerprint):
+    """Grava o documento, as versões comprimidas e o manifesto.
+
+    Cada arquivo é gravado em um temporário e renomeado, então outro
+    processo nunca lê um arquivo incompleto. O manifesto é o último.
+    """
+    os.makedirs(directory, exist_ok=True)
+
+    files = {document_path(directory, document.digest): document.body}
+    for encoding, body in document.compressed.items():
+        files[document_path(directory, document.digest, encoding)] = body
+
+    manifest = {
+        "fingerprint": fingerprint,
+        "digest": document.digest,
+        "encodings": sorted(document.compressed),
+    }
+    files[os.path.join(directory, "manifest.json")] = json.dumps(
+        manifest
+    ).encode()
+
+    for path, body in files.items():
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as output:
+            output.write(body)
+        os.replace(temporary, path)
+
+
+def read_document(directory, fingerprint):
+    """Lê o documento gravado, caso ele tenha sido gerado pelo mesmo código.
+
+    Returns:
+        OpenAPIDocument: O documento, ou None caso não exista um documento
+        gravado para o código atual.
+    """
+    try:
+        with open(os.path.join(directory, "manifest.json")) as manifest:
+            manifest = json.load(manifest)
+
+        if manifest["fingerprint"] != fingerprint:
+            return None
+
+        digest = manifest["digest"]
+        with open(document_path(directory, digest), "rb") as body:
+            body = body.read()
+
+        compressed = {}
+        for encoding in manifest["encodings"]:
+            with open(document_path(directory, digest, encoding), "rb") as f:
+                compressed[encoding] = f.read()
+    except (OSError, ValueError, KeyError):
+        return None
+
+    return OpenAPIDocument(digest, body, compressed)
+
+
+def load_document(app, directory=OPENAPI_DIR) -> OpenAPIDocument:
+    """Lê o documento gravado ou o gera (e grava) quando necessário."""
+    fingerprint = source_fingerprint()
+    document = read_document(directory, fingerprint)
+
+    if document is not None:
+        return document
+
+    document = build_document(app)
+
+    try:
+        write_document(document, directory, fingerprint)
+    except OSError as e:
+        # sem permissão de escrita, o documento continua em memória
+        logger.warning("Não foi possível gravar o documento OpenAPI: %s", e)
+
+    return document
+
+
+def register_openapi_document(app):
+    """Serve o documento OpenAPI pré-calculado.
+
+    O documento fica em /openapi/openapi.<hash>.json, com cache imutável, e
+    as telas de documentação passam a buscá-lo nessa url. Em
+    /openapi/openapi.json (o endereço do flask-openapi3), ele é servido com
+    `Cache-Control: no-cache` e ETag, então cada carregamento custa apenas
+    uma revalidação respondida com 304. As duas urls enviam a versão br ou
+    gzip quando o cliente as aceita.
+
+    O diretório dos arquivos pode ser definido por `OPENAPI_DIR` no
+    `app.config`.
+    """
+    directory = app.config.get("OPENAPI_DIR", OPENAPI_DIR)
+    document = None
+
+    def get_document() -> OpenAPIDocument:
+        nonlocal document
+
+        if document is None:
+            document = load_document(app, directory)
+            # as telas são renderizadas com a url que tem o hash
+            app.api_doc_url = f"/openapi.{document.digest}.json"
+
+        return document
+
+    def serve_document(digest=None):
+        document = get_document()
+
+        if digest is not None and digest != document.digest:
+            return {"message": "Documento não encontrado :/"}, 404
+
+        encoding = choose_encoding(
+            request.accept_encodings,
+            [e for e in ENCODINGS if e in document.compressed],
+        )
+        body = document.compressed.get(encoding, document.body)
+        response = app.response_class(body, mimetype="application/json")
+
+        # cada versão tem o seu ETag, já que os corpos são diferentes
+        if body is document.body:
+            response.set_etag(document.digest)
+        else:
+            response.set_etag(f"{document.digest}-{encoding}")
+            response.headers["Content-Encoding"] = encoding
+
+        response.vary.add("Accept-Encoding")
+        response.headers["Cache-Control"] = (
+            "no-cache" if digest is None else IMMUTABLE
+        )
+        return response.make_conditional(request)
+
+    def with_document(view):
+        def wrapper(*args, **kwargs):
+            get_document()
+            return view(*args, **kwargs)
+
+        return wrapper
+
+    app.view_functions["openapi.api_doc"] = serve_document
+    for endpoint in DOC_UI_ENDPOINTS:
+        app.view_functions[endpoint] = with_document(
+            app.view_functions[endpoint]
+        )
+
+    app.add_url_rule(
+        f"{app.doc_prefix}/openapi.<string:digest>.json",
+        "openapi_document",
+        serve_document,
+        methods=["GET"],
+    )
+
+    def build_openapi_command():
+        """Gera o documento OpenAPI e as versões comprimidas em OPENAPI_DIR."""
+        document = build_document(app)
+        write_document(document, directory, source_fingerprint())
+        click.echo(f"{document_path(directory, document.digest)} gerado")
+
+    app.cli.command("build-openapi")(build_openapi_command)
@@ -1,3 +1,5 @@
+from schemas.pagination import PaginationSchema
+
 from schemas.author import (
     AuthorSchema,
     AuthorSearchSchema,
@@ -6,23 +8,35 @@ from schemas.author import (
     AuthorViewSchema,
     AuthorDetailsViewSchema,
     AuthorDeletionSchema,
+    AuthorDeletionSearchSchema,
+    AuthorDeletionViewSchema,
     show_authors,
     show_author,
     show_author_details,
+    show_author_deletion,
 )
 
 from schemas.article import (
     ArticleSchema,
     ArticleIDsSchema,
     ArticleSearchSchema,
+    ArticleTextSearchSchema,
+    ArticleSearchResultSchema,
+    ArticleSearchListSchema,
     ArticleListSchema,
     ArticleViewSchema,
     ArticleDetailsViewSchema,
     ArticleDeletionSchema,
     ArticleUpdateSchema,
+    ArticleDetailsListSchema,
+    ArticleBatchDeletionSchema,
+    ArticleBulkItemSchema,
+    ArticleBulkResultSchema,
     show_articles,
     show_article,
     show_article_details,
+    show_article_row,
+    show_search_results,
 )
 
 
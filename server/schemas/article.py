@@ -1,7 +1,9 @@
-from typing import List
-from pydantic import BaseModel
+from typing import List, Optional
+from pydantic import BaseModel, conint, conlist, constr
+from html import escape
 
 from models import Article
+from models.search import MATCH_END, MATCH_START
 from schemas import AuthorViewSchema
 
 
@@ -29,9 +31,12 @@ class ArticlePreviewSchema(BaseModel):
 
 
 class ArticleIDsSchema(BaseModel):
-    """Define a estrutura para criação de um novo artigo."""
+    """Define a estrutura para busca e remoção de vários artigos pelo ID.
 
-    id: List[str] = ["ID do artigo"]
+    Os IDs repetidos são considerados uma única vez.
+    """
+
+    id: conlist(str, min_items=1, max_items=500) = ["ID do artigo"]
 
 
 class ArticleSearchSchema(BaseModel):
@@ -43,6 +48,32 @@ class ArticleSearchSchema(BaseModel):
     id: str = "ID do artigo"
 
 
+class ArticleTextSearchSchema(BaseModel):
+    """Define os parâmetros da busca textual de artigos.
+
+    A busca considera o título, o subtítulo e o conteúdo dos artigos.
+    """
+
+    q: constr(min_length=1, max_length=200) = "flask"
+    limit: conint(ge=1, le=100) = 20
+
+
+class ArticleSearchResultSchema(ArticlePreviewSchema):
+    """Define a estrutura de um artigo encontrado na busca textual.
+
+    O snippet é um trecho do conteúdo com os termos buscados envolvidos em
+    tags <mark>.
+    """
+
+    snippet: str = "Trecho do <mark>conteúdo</mark> do artigo"
+
+
+class ArticleSearchListSchema(BaseModel):
+    """Define a estrutura que representa o resultado da busca textual."""
+
+    articles: List[ArticleSearchResultSchema]
+
+
 class ArticleUpdateSchema(ArticleSchema):
     """Define a estrutura de um artigo retornada no post ou get."""
 
@@ -61,6 +92,7 @@ class ArticleListSchema(BaseModel):
     """Define a estrutura que representa a lista de artigos."""
 
     articles: List[ArticlePreviewSchema]
+    next_cursor: Optional[str] = None
 
 
 class ArticleDetailsViewSchema(ArticleViewSchema):
@@ -79,12 +111,54 @@ class ArticleDeletionSchema(BaseModel):
     id: str
 
 
-def show_articles(articles: List[Article]) -> dict:
+class ArticleDetailsListSchema(BaseModel):
+    """Define a estrutura da busca de vários artigos pelo ID.
+
+    Os artigos seguem a ordem dos IDs informados; os IDs sem artigo são
+    listados em not_found.
+    """
+
+    articles: List[ArticleDetailsViewSchema]
+    not_found: List[str] = []
+
+
+class ArticleBatchDeletionSchema(BaseModel):
+    """Define a estrutura da remoção de vários artigos pelo ID."""
+
+    message: str
+    deleted: List[str] = ["ID do artigo"]
+    not_found: List[str] = []
+
+
+class ArticleBulkItemSchema(BaseModel):
+    """Define o resultado da importação de um item do lote.
+
+    O status é "created", "conflict" (autor inexistente ou título já
+    cadastrado) ou "invalid" (item fora da estrutura de ArticleSchema).
+    """
+
+    index: int = 0
+    id: Optional[str] = "ID do artigo"
+    status: str = "created"
+    message: Optional[str] = None
+
+
+class ArticleBulkResultSchema(BaseModel):
+    """Define a estrutura do resultado de uma importação em lote."""
+
+    created: int = 1
+    failed: int = 0
+    results: List[ArticleBulkItemSchema]
+
+
+def show_articles(articles: List[Article], next_cursor: str = None) -> dict:
     """Retorna uma lista de artigos com a estrutura definida em
         ArticleViewSchema.
 
     Args:
-        articles (list): Lista de objetos Article.
+        articles (list): Lista de objetos Article ou de linhas com as colunas
+            id, title, subtitle, author_id e created_at.
+        next_cursor (str, optional): Cursor da próxima página da listagem.
 
     Returns:
         dict: Dicionário contendo uma lista de artigos com a estrutura
@@ -105,7 +179,7 @@ def show_articles(articles: List[Article]) -> dict:
             }
         )
 
-    return {"articles": result}
+    return {"articles": result, "next_cursor": next_cursor}
 
 
 def show_article_details(article: Article) -> dict:
@@ -137,6 +211,36 @@ def show_article_details(article: Article) -> dict:
     }
 
 
+def show_article_row(row, content: str) -> dict:
+    """Retorna um artigo com a estrutura de show_article_details.
+
+    Args:
+        row (Row): Linha com as colunas do artigo e as do autor prefixadas
+            com "author_" (como as retornadas pela edição do artigo).
+        content (str): Conteúdo do artigo.
+
+    Returns:
+        dict: Dicionário contendo um artigo com a estrutura definida em
+            ArticleDetailsViewSchema.
+
+    """
+    return {
+        "id": row.id,
+        "title": row.title,
+        "subtitle": row.subtitle,
+        "author_id": row.author_id,
+        "author": {
+            "id": row.author_id,
+            "first_name": row.author_first_name,
+            "last_name": row.author_last_name,
+            "avatar_url": row.author_avatar_url,
+            "twitter_username": row.author_twitter_username,
+        },
+        "content": content,
+        "created_at": row.created_at,
+    }
+
+
 def show_article(article: Article) -> dict:
     """Retorna um artigo com a estrutura definida em ArticleViewSchema.
 
@@ -156,3 +260,38 @@ def show_article(article: Article) -> dict:
         "content": article.content,
         "created_at": article.created_at,
     }
+
+
+def show_search_results(results) -> dict:
+    """Retorna o resultado da busca com a estrutura definida em
+        ArticleSearchListSchema.
+
+    O texto do snippet é escapado antes de os marcadores de termos
+    encontrados serem convertidos em tags <mark>.
+
+    Args:
+        results (list): Linhas retornadas pela busca textual.
+
+    Returns:
+        dict: Dicionário contendo a lista de artigos encontrados.
+    """
+    result = []
+
+    for row in results:
+        snippet = (
+            escape(row.snippet or "")
+            .replace(MATCH_START, "<mark>")
+            .replace(MATCH_END, "</mark>")
+        )
+        result.append(
+            {
+                "id": row.id,
+                "title": row.title,
+                "subtitle": row.subtitle,
+                "author_id": row.author_id,
+                "created_at": row.created_at,
+                "snippet": snippet,
+            }
+        )
+
+    return {"articles": result}
@@ -1,7 +1,8 @@
-from typing import List
+from datetime import datetime
+from typing import List, Optional, Tuple
 from pydantic import BaseModel
 
-from models import Author
+from models import Author, AuthorDeletion
 
 
 class AuthorSchema(BaseModel):
@@ -31,6 +32,7 @@ class AuthorListSchema(BaseModel):
     """Define a estrutura que representa a lista de autores."""
 
     authors: List[AuthorSchema]
+    next_cursor: Optional[str] = None
 
 
 class AuthorUpdateSchema(AuthorSchema):
@@ -53,12 +55,16 @@ class AuthorDetailsViewSchema(AuthorViewSchema):
     articles: List[str] = ["ID do artigo"]
 
 
-def show_authors(authors: List[Author]) -> dict:
+def show_authors(
+    authors: List[Tuple[Author, int]], next_cursor: str = None
+) -> dict:
     """Retorna uma lista de autors com a estrutura definida em
         AuthorViewSchema.
 
     Args:
-        authors (list): Lista de objetos Author.
+        authors (list): Lista de tuplas com o objeto Author e a quantidade
+            de artigos do autor.
+        next_cursor (str, optional): Cursor da próxima página da listagem.
 
     Returns:
         dict: Dicionário contendo uma lista de autors com a estrutura
@@ -66,7 +72,7 @@ def show_authors(authors: List[Author]) -> dict:
 
     """
     result = []
-    for autor in authors:
+    for autor, articles_count in authors:
         result.append(
             {
                 "id": autor.id,
@@ -74,13 +80,13 @@ def show_authors(authors: List[Author]) -> dict:
                 "last_name": autor.last_name,
                 "email": autor.email,
                 "twitter_username": autor.twitter_username,
-                "articles_count": len(autor.articles),
+                "articles_count": articles_count,
                 "avatar_url": autor.avatar_url,
                 "created_at": autor.created_at,
             }
         )
 
-    return {"authors": result}
+    return {"authors": result, "next_cursor": next_cursor}
 
 
 def show_author(autor: Author) -> dict:
@@ -130,6 +136,28 @@ def show_author_details(autor: Author) -> dict:
     }
 
 
+class AuthorDeletionSearchSchema(BaseModel):
+    """Define a estrutura para busca de uma remoção de autor.
+
+    A busca é feita pelo ID da remoção.
+    """
+
+    id: int = 1
+
+
+class AuthorDeletionViewSchema(BaseModel):
+    """Define a estrutura do andamento da remoção de um autor."""
+
+    id: int = 1
+    author_id: int = 1
+    status: str = "running"
+    articles_total: int = 1000
+    articles_deleted: int = 500
+    error: Optional[str] = None
+    created_at: datetime = None
+    finished_at: Optional[datetime] = None
+
+
 class AuthorDeletionSchema(BaseModel):
     """Define a estrutura para remoção de um autor no banco.
 
@@ -138,3 +166,27 @@ class AuthorDeletionSchema(BaseModel):
 
     message: str
     id: str
+    deletion: AuthorDeletionViewSchema
+
+
+def show_author_deletion(deletion: AuthorDeletion) -> dict:
+    """Retorna uma remoção com a estrutura definida em
+        AuthorDeletionViewSchema.
+
+    Args:
+        deletion (AuthorDeletion): Objeto AuthorDeletion.
+
+    Returns:
+        dict: Dicionário contendo o andamento da remoção.
+
+    """
+    return {
+        "id": deletion.id,
+        "author_id": deletion.author_id,
+        "status": deletion.status,
+        "articles_total": deletion.articles_total,
+        "articles_deleted": deletion.articles_deleted,
+        "error": deletion.error,
+        "created_at": deletion.created_at,
+        "finished_at": deletion.finished_at,
+    }
@@ -0,0 +1,12 @@
+from typing import Optional
+from pydantic import BaseModel, conint
+
+
+class PaginationSchema(BaseModel):
+    """Define os parâmetros de paginação das listagens.
+
+    O cursor é o valor de `next_cursor` retornado pela página anterior.
+    """
+
+    limit: conint(ge=1, le=200) = 50
+    cursor: Optional[str] = None
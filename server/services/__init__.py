@@ -3,6 +3,7 @@ from .author import (
     delete_author_by_id,
     edit_author,
     get_all_authors,
+    get_author_deletion,
     return_author_by_id,
 )
 
@@ -10,7 +11,12 @@ from .author import (
 from .article import (
     add_article,
     delete_article_by_id,
+    delete_articles_by_ids,
     edit_article,
+    export_articles,
     get_all_articles,
     get_article_by_id,
+    get_articles_by_ids,
+    import_articles,
+    search_articles,
 )
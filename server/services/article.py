@@ -1,30 +1,140 @@
+from datetime import datetime
+from pydantic import ValidationError
+from sqlalchemy import DateTime, delete, exists, insert, or_, select, text
+from sqlalchemy import update
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import contains_eager, joinedload
 from logger import logger
 
-from models import Article, Author, Session
+from models import Article, ArticleBody, Author, Session, engine, writer
+from models.search import (
+    index_article,
+    index_entries,
+    reindex_article,
+    search,
+)
+from models.sqlite import supports_returning
 from schemas import *
+from shared.utils import batched, env_int, last_modified_headers, strip_html
+from services.author_deletion import (
+    AuthorDeletionPendingError,
+    check_author_not_deleted,
+)
+from services.cache import article_details_cache, invalidate_article
+from services.pagination import InvalidCursorError, paginate
+
+
+articles_table = Article.__table__
+authors_table = Author.__table__
+
+# colunas do artigo editado, com as do autor para a representação
+EDITED_ARTICLE_COLUMNS = (
+    "id, title, subtitle, author_id, created_at, "
+    "(SELECT first_name FROM authors WHERE pk_author = author_id) "
+    "AS author_first_name, "
+    "(SELECT last_name FROM authors WHERE pk_author = author_id) "
+    "AS author_last_name, "
+    "(SELECT avatar_url FROM authors WHERE pk_author = author_id) "
+    "AS author_avatar_url, "
+    "(SELECT twitter_username FROM authors WHERE pk_author = author_id) "
+    "AS author_twitter_username"
+)
+
+# artigos de autores em remoção não são editados nem movidos para eles
+UPDATE_ARTICLE = text(
+    "UPDATE articles SET title = :title, subtitle = :subtitle, "
+    "author_id = :author_id, updated_at = :updated_at WHERE id = :id "
+    "AND NOT EXISTS (SELECT 1 FROM authors WHERE deleted_at IS NOT NULL "
+    "AND pk_author IN (:author_id, articles.author_id)) "
+    "RETURNING " + EDITED_ARTICLE_COLUMNS
+).columns(created_at=DateTime)
+
+SELECT_ARTICLE = text(
+    "SELECT " + EDITED_ARTICLE_COLUMNS + " FROM articles WHERE id = :id"
+).columns(created_at=DateTime)
+
+# datas de modificação de cada artigo e do autor que ele embute, conferidas
+# antes de servir uma representação do cache
+ARTICLE_VERSIONS = select(
+    articles_table.c.id,
+    articles_table.c.updated_at,
+    authors_table.c.updated_at.label("author_updated_at"),
+).where(
+    authors_table.c.pk_author == articles_table.c.author_id,
+    authors_table.c.deleted_at.is_(None),
+)
+
+# edições em uma única consulta, quando o banco aceita RETURNING
+use_returning = supports_returning(engine)
+
+# artigos inseridos por transação na importação em lote
+BULK_BATCH_SIZE = env_int("ARTICLE_BULK_BATCH_SIZE", 1000)
+
+# artigos carregados por vez na exportação
+EXPORT_BATCH_SIZE = env_int("ARTICLE_EXPORT_BATCH_SIZE", 500)
+
+# artigos de autores em remoção (ver services.author_deletion) não são
+# exibidos; a subconsulta usa o índice de authors.deleted_at
+visible_articles = articles_table.c.author_id.not_in(
+    select(Author.id).where(Author.deleted_at.is_not(None)).scalar_subquery()
+)
+
+# colunas exibidas na listagem; o conteúdo do artigo nunca é lido aqui
+preview_columns = (
+    articles_table.c.id,
+    articles_table.c.title,
+    articles_table.c.subtitle,
+    articles_table.c.author_id,
+    articles_table.c.created_at,
+)
+
+
+def query_article_details(session, article_id: str):
+    """Busca o artigo com o autor e o conteúdo em uma única consulta."""
+    return (
+        session.query(Article)
+        .join(Author)
+        .options(contains_eager(Article.author), joinedload(Article.body))
+        .filter(Article.id == article_id, Author.deleted_at.is_(None))
+        .one_or_none()
+    )
 
 
-def get_all_articles():
-    """Faz a busca por todos os artigos cadastrados.
+def get_all_articles(query: PaginationSchema):
+    """Faz a busca por uma página dos artigos cadastrados.
 
     Retorna uma representação da listagem de artigos.
     """
-    logger.debug(f"Coletando artigos ")
+    logger.debug("Coletando artigos")
 
     # criando conexão com a base
-    session = Session()
-    # fazendo a busca
-    articles = session.query(Article).all()
-
-    if not articles:
-        # se não há artigos cadastrados
-        return {"articles": []}, 200
-    else:
-        logger.debug(f"%d artigos encontrados" % len(articles))
-        # retorna a representação de artigos
-        print(articles)
-        return show_articles(articles), 200
+    with Session() as session:
+        # fazendo a busca apenas das colunas da listagem, que retorna linhas
+        # simples em vez de objetos Article no identity map da sessão
+        try:
+            articles, next_cursor = paginate(
+                session,
+                select(*preview_columns).where(visible_articles),
+                articles_table.c.created_at,
+                articles_table.c.id,
+                query.limit,
+                query.cursor,
+            )
+        except InvalidCursorError:
+            error_msg = "Cursor de paginação inválido :/"
+            logger.warning(f"Erro ao listar artigos, {error_msg}")
+            return {"message": error_msg}, 400
+
+        if not articles:
+            # se não há artigos cadastrados
+            return {"articles": [], "next_cursor": None}, 200
+        else:
+            logger.debug("%d artigos encontrados", len(articles))
+            logger.debug("Artigos: %s", articles)
+            # retorna a representação de artigos
+            # sem Last-Modified: a remoção de um artigo altera a página sem
+            # alterar o updated_at dos demais, então apenas o ETag a valida
+            return show_articles(articles, next_cursor), 200
 
 
 def get_article_by_id(path: ArticleSearchSchema):
@@ -34,33 +144,106 @@ def get_article_by_id(path: ArticleSearchSchema):
     """
     article_id = path.id
 
-    logger.debug(f"Coletando artigo com ID: {article_id} ")
+    logger.debug("Coletando artigo com ID: %s", article_id)
 
     # criando conexão com a base
-    session = Session()
+    with Session() as session:
+        # artigos populares são servidos do cache até serem editados
+        cached = get_cached_details(session, [article_id])
+        if article_id in cached:
+            details, headers = cached[article_id]
+            return details, 200, headers
 
-    # fazendo a busca
-    article = (
-        session.query(Article)
-        .join(Author)
-        .filter(Article.id == article_id)
-        .one_or_none()
-    )
+        token = article_details_cache.token()
 
-    if not article:
-        # se o artigo não foi encontrado
-        error_msg = "Artigo não encontrado na base :/"
-        log_error_msg = (
-            f"Erro ao buscar artigo com ID: #'{article_id}', {error_msg}"
+        # fazendo a busca
+        article = query_article_details(session, article_id)
+
+        if not article:
+            # se o artigo não foi encontrado
+            error_msg = "Artigo não encontrado na base :/"
+            log_error_msg = (
+                f"Erro ao buscar artigo com ID: #'{article_id}', {error_msg}"
+            )
+
+            logger.warning(log_error_msg)
+            return {"message": error_msg}, 404
+        else:
+            logger.debug(
+                "Artigo com ID: #%s encontrado com sucesso: %s",
+                article_id,
+                article,
+            )
+            # retorna a representação de artigos
+            details = show_article_details(article)
+            # o artigo embute os dados do autor, então a data de modificação
+            # é a mais recente entre as duas
+            headers = last_modified_headers(
+                article.updated_at, article.author.updated_at
+            )
+            article_details_cache.set(
+                article_id, (details, headers, article_version(article)), token
+            )
+            return details, 200, headers
+
+
+def article_version(article) -> tuple:
+    """Retorna as datas de modificação do artigo e do seu autor."""
+    return article.updated_at, article.author.updated_at
+
+
+def get_cached_details(session, article_ids) -> dict:
+    """Busca no cache as representações dos artigos que não mudaram.
+
+    O cache é de cada processo, e uma edição atendida por outro worker não
+    o invalida aqui. Por isso, cada acerto é conferido com uma consulta pela
+    chave primária que lê apenas as datas de modificação do artigo e do
+    autor; as entradas de artigos editados, removidos ou de autores em
+    remoção são descartadas.
+
+    Returns:
+        dict: A representação e os cabeçalhos de cada artigo válido no
+        cache, pelo id.
+    """
+    cached = {}
+    for article_id in article_ids:
+        entry = article_details_cache.get(article_id)
+        if entry is not None:
+            cached[article_id] = entry
+
+    if not cached:
+        return {}
+
+    versions = {
+        row.id: (row.updated_at, row.author_updated_at)
+        for row in session.execute(
+            ARTICLE_VERSIONS.where(articles_table.c.id.in_(list(cached)))
         )
+    }
 
-        logger.warning(log_error_msg)
-        return {"message": error_msg}, 404
-    else:
-        logger.debug(f"Artigo com ID: #{article_id} encontrado com sucesso")
-        # retorna a representação de artigos
-        print(article)
-        return show_article_details(article), 200
+    fresh = {}
+    for article_id, (details, headers, version) in cached.items():
+        if versions.get(article_id) == version:
+            fresh[article_id] = (details, headers)
+        else:
+            invalidate_article(article_id)
+
+    return fresh
+
+
+def search_articles(query: ArticleTextSearchSchema):
+    """Busca artigos pelo título, subtítulo e conteúdo.
+
+    Retorna os artigos encontrados, ordenados por relevância.
+    """
+    logger.debug("Buscando artigos com os termos: '%s'", query.q)
+
+    # criando conexão com a base
+    with Session() as session:
+        results = search(session, query.q, query.limit)
+
+        logger.debug("%d artigos encontrados", len(results))
+        return show_search_results(results), 200
 
 
 def add_article(form: ArticleSchema):
@@ -70,19 +253,33 @@ def add_article(form: ArticleSchema):
     """
     article = Article(**form.dict())
 
-    logger.debug(f"Adicionando artigo com título: '{article.title}'")
+    logger.debug("Adicionando artigo com título: '%s'", article.title)
 
-    try:
-        # criando conexão com a base
-        session = Session()
+    def insert(session):
+        check_author_not_deleted(session, form.author_id)
         # adicionando artigo
         session.add(article)
+        session.flush()
+        # indexando o artigo para a busca textual, na mesma transação
+        index_article(session, article)
+        return show_article_details(article)
+
+    try:
         # efetivando o comando de adição de novo artigo na tabela
-        session.commit()
+        details = writer.run(insert)
+
+        logger.debug("Adicionado artigo com título: '%s'", form.title)
 
-        logger.debug(f"Adicionado artigo com título: '{article.title}'")
+        return details, 200
 
-        return show_article_details(article), 200
+    except AuthorDeletionPendingError:
+        error_msg = "Autor em remoção :/"
+        log_error_msg = (
+            f"Erro ao adicionar artigo '{article.title}', {error_msg}"
+        )
+        logger.warning(log_error_msg)
+
+        return {"message": error_msg}, 409
 
     except IntegrityError as e:
         invalid_author = (
@@ -122,65 +319,124 @@ def add_article(form: ArticleSchema):
 def edit_article(form: ArticleUpdateSchema):
     """Edita um artigo já existente na base de dados.
 
+    Com RETURNING, a edição do artigo e a leitura da representação (com os
+    dados do autor) são feitas por um único UPDATE; o conteúdo e o índice
+    de busca são atualizados na mesma transação, sem consultas prévias.
+
     Retorna uma representação dos artigos.
     """
-    article = Article(**form.dict())
-
-    # criando conexão com a base
-    session = Session()
-
-    # fazendo a busca
     article_id = form.id
-    old_article = (
-        session.query(Article).filter(Article.id == article_id).first()
-    )
 
-    print(old_article)
+    logger.debug("Editando artigo de ID: '%s'", article_id)
+
+    values = {
+        "id": article_id,
+        "title": form.title,
+        "subtitle": form.subtitle,
+        "author_id": form.author_id,
+        # o conteúdo fica em outra tabela, então a edição apenas dele não
+        # atualizaria a data de modificação do artigo automaticamente
+        "updated_at": datetime.now(),
+    }
+
+    def edit(session):
+        if use_returning:
+            row = session.execute(UPDATE_ARTICLE, values).one_or_none()
+        else:
+            row = update_article_without_returning(session, values)
+
+        if row is None:
+            # o artigo não existe (ou está oculto, com o autor em remoção),
+            # ou o autor informado está em remoção
+            check_author_not_deleted(session, form.author_id)
+            return None
+
+        session.execute(
+            update(ArticleBody.__table__)
+            .where(ArticleBody.__table__.c.article_id == article_id)
+            .values(content=form.content)
+        )
 
-    logger.debug(f"Editando artigo de ID: '{old_article.id}'")
+        # atualizando a entrada do artigo no índice de busca
+        reindex_article(
+            session, article_id, form.title, form.subtitle, form.content
+        )
+        return row
 
     try:
-        # edita os valores do artigo
-        old_article.title = article.title
-        old_article.subtitle = article.subtitle
-        old_article.author_id = article.author_id
-        old_article.content = article.content
-
         # efetivando o comando de edição do artigo na tabela
-        session.commit()
-        logger.debug(f"Editado artigo de ID: '{article.title}'")
+        row = writer.run(edit)
+
+        if row is None:
+            # se o artigo não foi encontrado
+            error_msg = "Artigo não encontrado na base :/"
+            logger.warning(
+                "Erro ao editar artigo com ID: #'%s', %s",
+                article_id,
+                error_msg,
+            )
+            return {"message": error_msg}, 404
 
-        # fazendo a busca
-        article = (
-            session.query(Article)
-            .join(Author)
-            .filter(Article.id == article_id)
-            .one_or_none()
-        )
+        invalidate_article(article_id)
+        logger.debug("Editado artigo de ID: '%s'", article_id)
+
+        return show_article_row(row, form.content), 200
+
+    except AuthorDeletionPendingError:
+        error_msg = "Autor em remoção :/"
+        log_error_msg = f"Erro ao editar artigo '{form.title}', {error_msg}"
+        logger.warning(log_error_msg)
 
-        return show_article_details(article), 200
+        return {"message": error_msg}, 409
 
     except IntegrityError as e:
-        # como a duplicidade do título é a provável razão do IntegrityError
-        error_msg = "Artigo de mesmo título já salvo na base :/"
-        log_error_msg = (
-            f"Erro ao adicionar artigo '{article.title}', {error_msg}"
-        )
+        if "FOREIGN KEY constraint failed" in str(e.orig):
+            error_msg = "Autor não encontrado :/"
+        else:
+            # como a duplicidade do título é a provável razão do
+            # IntegrityError
+            error_msg = "Artigo de mesmo título já salvo na base :/"
+
+        log_error_msg = f"Erro ao editar artigo '{form.title}', {error_msg}"
         logger.warning(log_error_msg)
 
         return {"message": error_msg}, 409
 
     except Exception as e:
         # caso um erro fora do previsto
-        error_msg = "Não foi possível salvar novo artigo :/"
-        log_error_msg = (
-            f"Erro ao adicionar artigo '{article.title}', {error_msg}"
-        )
+        error_msg = "Não foi possível salvar a edição do artigo :/"
+        log_error_msg = f"Erro ao editar artigo '{form.title}', {error_msg}"
         logger.warning(log_error_msg)
 
         return {"message": error_msg}, 400
 
 
+def update_article_without_returning(session, values: dict):
+    """Edita o artigo em bancos sem RETURNING.
+
+    Returns:
+        Row: A linha do artigo editado, como a retornada por UPDATE_ARTICLE,
+        ou None caso o artigo não exista ou o autor (atual ou novo) esteja
+        em remoção.
+    """
+    author_deleted = exists().where(
+        authors_table.c.pk_author.in_(
+            [values["author_id"], articles_table.c.author_id]
+        ),
+        authors_table.c.deleted_at.isnot(None),
+    )
+    statement = (
+        update(articles_table)
+        .where(articles_table.c.id == values["id"], ~author_deleted)
+        .values({k: v for k, v in values.items() if k != "id"})
+    )
+
+    if not session.execute(statement).rowcount:
+        return None
+
+    return session.execute(SELECT_ARTICLE, {"id": values["id"]}).one()
+
+
 def delete_article_by_id(path: ArticleSearchSchema):
     """Remove um article à partir do id informado.
 
@@ -188,18 +444,18 @@ def delete_article_by_id(path: ArticleSearchSchema):
     """
     article_id = path.id
 
-    logger.debug(f"Removendo artigo com ID: #{article_id}")
+    logger.debug("Removendo artigo com ID: #%s", article_id)
 
-    # criando conexão com a base
-    session = Session()
+    def remove(session):
+        return session.query(Article).filter(Article.id == article_id).delete()
 
     # fazendo a remoção
-    count = session.query(Article).filter(Article.id == article_id).delete()
-    session.commit()
+    count = writer.run(remove)
+    invalidate_article(article_id)
 
     if count:
         # retorna a representação da mensagem de confirmação
-        logger.debug(f"Artigo com ID: #{article_id} excluído com sucesso")
+        logger.debug("Artigo com ID: #%s excluído com sucesso", article_id)
         return {"message": "Artigo removido", "id": article_id}
     else:
         # se o artigo não foi encontrado
@@ -210,3 +466,317 @@ def delete_article_by_id(path: ArticleSearchSchema):
         logger.warning(log_error_msg)
 
         return {"message": error_msg}, 404
+
+
+def get_articles_by_ids(body: ArticleIDsSchema):
+    """Busca vários artigos à partir dos ids.
+
+    Os artigos em cache são reaproveitados e os demais são buscados, com os
+    autores e os conteúdos, em uma única consulta.
+
+    Retorna uma representação dos artigos, na ordem dos ids informados.
+    """
+    article_ids = list(dict.fromkeys(body.id))
+
+    logger.debug("Coletando %d artigos por ID", len(article_ids))
+
+    # criando conexão com a base
+    with Session() as session:
+        found = {
+            article_id: details
+            for article_id, (details, _) in get_cached_details(
+                session, article_ids
+            ).items()
+        }
+
+        missing = [id for id in article_ids if id not in found]
+
+        if missing:
+            token = article_details_cache.token()
+
+            articles = (
+                session.query(Article)
+                .join(Author)
+                .options(
+                    contains_eager(Article.author), joinedload(Article.body)
+                )
+                .filter(Article.id.in_(missing), Author.deleted_at.is_(None))
+                .all()
+            )
+
+            for article in articles:
+                details = show_article_details(article)
+                headers = last_modified_headers(
+                    article.updated_at, article.author.updated_at
+                )
+                article_details_cache.set(
+                    article.id,
+                    (details, headers, article_version(article)),
+                    token,
+                )
+                found[article.id] = details
+
+    return {
+        "articles": [found[id] for id in article_ids if id in found],
+        "not_found": [id for id in article_ids if id not in found],
+    }, 200
+
+
+def delete_articles_by_ids(body: ArticleIDsSchema):
+    """Remove vários artigos à partir dos ids, em um único comando.
+
+    Retorna os ids removidos e os não encontrados.
+    """
+    article_ids = list(dict.fromkeys(body.id))
+
+    logger.debug("Removendo %d artigos por ID", len(article_ids))
+
+    def remove(session):
+        existing = set(
+            session.scalars(
+                select(articles_table.c.id).where(
+                    articles_table.c.id.in_(article_ids)
+                )
+            )
+        )
+
+        if existing:
+            # os conteúdos e as entradas do índice de busca são removidos
+            # em cascata pelo banco
+            session.execute(
+                delete(articles_table).where(
+                    articles_table.c.id.in_(existing)
+                )
+            )
+
+        return existing
+
+    existing = writer.run(remove)
+
+    for article_id in existing:
+        invalidate_article(article_id)
+
+    deleted = [id for id in article_ids if id in existing]
+    not_found = [id for id in article_ids if id not in existing]
+
+    if not deleted:
+        error_msg = "Artigos não encontrados na base :/"
+        logger.warning("Erro ao remover artigos %s, %s", not_found, error_msg)
+
+        return {
+            "message": error_msg,
+            "deleted": [],
+            "not_found": not_found,
+        }, 404
+
+    return {
+        "message": "Artigos removidos",
+        "deleted": deleted,
+        "not_found": not_found,
+    }, 200
+
+
+def export_articles():
+    """Gera a representação de todos os artigos, um por vez.
+
+    Os artigos são lidos em lotes de ARTICLE_EXPORT_BATCH_SIZE com o autor e
+    o conteúdo, e cada lote pode ser descartado após ser consumido, o que
+    mantém a memória constante independentemente do tamanho da tabela.
+
+    Yields:
+        dict: Um artigo com a estrutura de show_article_details.
+    """
+    logger.debug("Exportando artigos")
+
+    # a sessão é aberta apenas quando a resposta começa a ser enviada e é
+    # fechada ao fim (ou na interrupção) da geração
+    with Session() as session:
+        articles = (
+            session.query(Article)
+            .join(Author)
+            .options(contains_eager(Article.author), joinedload(Article.body))
+            .filter(Author.deleted_at.is_(None))
+            .order_by(Article.created_at, Article.id)
+            .yield_per(EXPORT_BATCH_SIZE)
+        )
+
+        for article in articles:
+            yield show_article_details(article)
+
+
+def import_articles(items):
+    """Importa artigos em lote.
+
+    Os itens são validados com ArticleSchema e inseridos em transações de
+    até ARTICLE_BULK_BATCH_SIZE artigos, com um único INSERT (executemany)
+    por tabela. Cada lote é uma escrita do `writer`, então a importação
+    aguarda a sua vez na fila de escritas (DB_WRITE_QUEUE) como as demais.
+    Itens inválidos ou em conflito não impedem a importação dos demais.
+
+    Args:
+        items (Iterable): Itens decodificados do corpo da requisição. Um
+            ValueError no lugar de um item indica uma linha NDJSON inválida.
+
+    Returns:
+        Uma representação com o resultado da importação de cada item.
+    """
+    results = []
+    # autores já verificados, reaproveitados entre os lotes
+    known_authors = set()
+
+    for batch in batched(enumerate(items), BULK_BATCH_SIZE):
+        results.extend(import_batch(batch, known_authors))
+
+    created = sum(1 for result in results if result["status"] == "created")
+    logger.debug("%d de %d artigos importados", created, len(results))
+
+    return {
+        "created": created,
+        "failed": len(results) - created,
+        "results": results,
+    }, 200
+
+
+def import_batch(batch, known_authors: set) -> list:
+    """Valida e insere um lote de artigos em uma única transação."""
+    results = {}
+    pending = []
+
+    for index, item in batch:
+        if isinstance(item, ValueError):
+            results[index] = bulk_result(index, None, "invalid", str(item))
+            continue
+
+        try:
+            form = ArticleSchema.parse_obj(item)
+        except ValidationError as error:
+            message = "; ".join(
+                "%s: %s" % (".".join(map(str, e["loc"])), e["msg"])
+                for e in error.errors()
+            )
+            results[index] = bulk_result(index, None, "invalid", message)
+            continue
+
+        pending.append((index, form, Article.generate_id(form.title)))
+
+    # as verificações são feitas em uma sessão de leitura, fora da escrita
+    with Session() as session:
+        # uma consulta para os autores ainda não verificados
+        authors = {form.author_id for _, form, _ in pending} - known_authors
+        if authors:
+            known_authors.update(
+                session.scalars(
+                    select(Author.id).where(
+                        Author.id.in_(authors), Author.deleted_at.is_(None)
+                    )
+                )
+            )
+
+        # e outra para os ids e títulos já cadastrados
+        taken_ids = set()
+        taken_titles = set()
+        if pending:
+            existing = session.execute(
+                select(articles_table.c.id, articles_table.c.title).where(
+                    or_(
+                        articles_table.c.id.in_([id for _, _, id in pending]),
+                        articles_table.c.title.in_(
+                            [form.title for _, form, _ in pending]
+                        ),
+                    )
+                )
+            )
+            for article_id, title in existing:
+                taken_ids.add(article_id)
+                taken_titles.add(title)
+
+    rows = []
+    for index, form, article_id in pending:
+        if form.author_id not in known_authors:
+            status, message = "conflict", "Autor não encontrado :/"
+        elif article_id in taken_ids or form.title in taken_titles:
+            status = "conflict"
+            message = "Artigo de mesmo título já salvo na base :/"
+        else:
+            # títulos repetidos dentro do próprio lote também conflitam
+            taken_ids.add(article_id)
+            taken_titles.add(form.title)
+            rows.append((index, article_id, form))
+            status, message = "created", None
+
+        results[index] = bulk_result(index, article_id, status, message)
+
+    if rows:
+        try:
+            writer.run(lambda session: insert_articles(session, rows))
+        except IntegrityError:
+            # um artigo ou uma remoção concorrente invalidou o lote; insere
+            # um a um para identificar os itens em conflito
+            for row in rows:
+                index, article_id, _ = row
+                try:
+                    writer.run(lambda session: insert_articles(session, [row]))
+                except IntegrityError as e:
+                    results[index] = bulk_result(
+                        index, article_id, "conflict", bulk_conflict(e)
+                    )
+
+    return [results[index] for index, _ in batch]
+
+
+def bulk_conflict(error: IntegrityError) -> str:
+    """Retorna a mensagem do conflito de um item da importação."""
+    # o autor foi removido depois da verificação do lote
+    if "FOREIGN KEY constraint failed" in str(error.orig):
+        return "Autor não encontrado :/"
+
+    return "Artigo de mesmo título já salvo na base :/"
+
+
+def insert_articles(session, rows):
+    """Insere os artigos, os conteúdos e as entradas do índice de busca."""
+    now = datetime.now()
+
+    session.execute(
+        insert(articles_table),
+        [
+            {
+                "id": article_id,
+                "title": form.title,
+                "subtitle": form.subtitle,
+                "author_id": form.author_id,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for _, article_id, form in rows
+        ],
+    )
+    session.execute(
+        insert(ArticleBody.__table__),
+        [
+            {"article_id": article_id, "content": form.content}
+            for _, article_id, form in rows
+        ],
+    )
+    index_entries(
+        session,
+        [
+            {
+                "id": article_id,
+                "title": form.title,
+                "subtitle": form.subtitle,
+                "content": strip_html(form.content),
+            }
+            for _, article_id, form in rows
+        ],
+    )
+
+
+def bulk_result(index, article_id, status, message=None) -> dict:
+    """Monta o resultado da importação de um item."""
+    return {
+        "index": index,
+        "id": article_id,
+        "status": status,
+        "message": message,
+    }
@@ -1,30 +1,88 @@
+from datetime import datetime
+from sqlalchemy import DateTime, func, select, text, update
 from sqlalchemy.exc import IntegrityError
 from logger import logger
 
-from models import Author, Session
+from models import Article, Author, AuthorDeletion, Session, engine, writer
+from models.sqlite import supports_returning
 from schemas import *
+from services.author_deletion import start_author_deletion
+from services.cache import invalidate_author_articles
+from services.pagination import InvalidCursorError, paginate
 
 
-def get_all_authors():
-    """Faz a busca por todos os autores cadastrados.
+authors_table = Author.__table__
+
+# colunas do autor editado, com os nomes usados em show_author
+EDITED_AUTHOR_COLUMNS = (
+    "pk_author AS id, first_name, last_name, email, avatar_url, "
+    "twitter_username, created_at"
+)
+
+UPDATE_AUTHOR = text(
+    "UPDATE authors SET first_name = :first_name, last_name = :last_name, "
+    "avatar_url = :avatar_url, twitter_username = :twitter_username, "
+    "updated_at = :updated_at "
+    "WHERE pk_author = :id AND deleted_at IS NULL "
+    "RETURNING " + EDITED_AUTHOR_COLUMNS
+).columns(created_at=DateTime)
+
+SELECT_AUTHOR = text(
+    "SELECT " + EDITED_AUTHOR_COLUMNS + " FROM authors WHERE pk_author = :id"
+).columns(created_at=DateTime)
+
+# edições em uma única consulta, quando o banco aceita RETURNING
+use_returning = supports_returning(engine)
+
+# quantidade de artigos do autor, calculada na mesma consulta da listagem
+# através do índice de articles.author_id (sem carregar os artigos)
+articles_count = (
+    select(func.count())
+    .where(Article.author_id == Author.id)
+    .correlate(Author)
+    .scalar_subquery()
+    .label("articles_count")
+)
+
+
+def get_all_authors(query: PaginationSchema):
+    """Faz a busca por uma página dos autores cadastrados.
 
     Retorna uma representação da listagem de autores.
     """
-    logger.debug(f"Coletando autores")
+    logger.debug("Coletando autores")
 
     # criando conexão com a base
-    session = Session()
-    # fazendo a busca
-    authors = session.query(Author).all()
+    with Session() as session:
+        # fazendo a busca
+        try:
+            authors, next_cursor = paginate(
+                session,
+                # autores em remoção não são exibidos
+                select(Author, articles_count).where(
+                    Author.deleted_at.is_(None)
+                ),
+                Author.created_at,
+                Author.id,
+                query.limit,
+                query.cursor,
+                key=lambda row: (row.Author.created_at, row.Author.id),
+            )
+        except InvalidCursorError:
+            error_msg = "Cursor de paginação inválido :/"
+            logger.warning(f"Erro ao listar autores, {error_msg}")
+            return {"message": error_msg}, 400
 
-    if not authors:
-        # se não há autores cadastrados
-        return {"authors": []}, 200
-    else:
-        logger.debug(f"%d autores encontrados" % len(authors))
-        # retorna a representação de autores
-        print(authors)
-        return show_authors(authors), 200
+        if not authors:
+            # se não há autores cadastrados
+            return {"authors": [], "next_cursor": None}, 200
+        else:
+            logger.debug("%d autores encontrados", len(authors))
+            logger.debug("Autores: %s", authors)
+            # retorna a representação de autores
+            # sem Last-Modified: a contagem de artigos muda sem alterar o
+            # updated_at do autor, então apenas o ETag valida a listagem
+            return show_authors(authors, next_cursor), 200
 
 
 def return_author_by_id(path: AuthorSearchSchema):
@@ -34,28 +92,36 @@ def return_author_by_id(path: AuthorSearchSchema):
     """
     author_id = path.id
 
-    logger.debug(f"Coletando autor com ID: {author_id} ")
+    logger.debug("Coletando autor com ID: %s", author_id)
 
     # criando conexão com a base
-    session = Session()
-
-    # faz a busca pelo autor
-    author = session.query(Author).filter(Author.id == author_id).one_or_none()
-
-    if not author:
-        # se o autor não foi encontrado
-        error_msg = "Autor não encontrado na base :/"
-        log_error_msg = (
-            f"Erro ao buscar autor com ID: #'{author_id}', {error_msg}"
+    with Session() as session:
+        # faz a busca pelo autor
+        author = (
+            session.query(Author)
+            .filter(Author.id == author_id, Author.deleted_at.is_(None))
+            .one_or_none()
         )
 
-        logger.warning(log_error_msg)
-        return {"message": error_msg}, 404
-    else:
-        logger.debug(f"Autor com ID: #{author_id} encontrado com sucesso")
-        # retorna a representação de autores
-        print(author)
-        return show_author_details(author), 200
+        if not author:
+            # se o autor não foi encontrado
+            error_msg = "Autor não encontrado na base :/"
+            log_error_msg = (
+                f"Erro ao buscar autor com ID: #'{author_id}', {error_msg}"
+            )
+
+            logger.warning(log_error_msg)
+            return {"message": error_msg}, 404
+        else:
+            logger.debug(
+                "Autor com ID: #%s encontrado com sucesso: %s",
+                author_id,
+                author,
+            )
+            # retorna a representação de autores
+            # sem Last-Modified: a representação lista os artigos do autor, e
+            # a remoção de um deles não altera o updated_at dos demais
+            return show_author_details(author), 200
 
 
 def add_author(form: AuthorSchema):
@@ -65,19 +131,21 @@ def add_author(form: AuthorSchema):
     """
     author = Author(**form.dict())
 
-    logger.debug(f"Adicionando autor com título: '{author.first_name}'")
+    logger.debug("Adicionando autor com título: '%s'", author.first_name)
 
-    try:
-        # criando conexão com a base
-        session = Session()
+    def insert(session):
         # adicionando autor
         session.add(author)
+        session.flush()
+        return show_author(author)
+
+    try:
         # efetivando o comando de adição de novo autor na tabela
-        session.commit()
+        details = writer.run(insert)
 
-        logger.debug(f"Adicionado autor com título: '{author.first_name}'")
+        logger.debug("Adicionado autor com título: '%s'", form.first_name)
 
-        return show_author(author), 200
+        return details, 200
 
     except IntegrityError as e:
         # como a duplicidade do email é a provável razão do IntegrityError
@@ -104,82 +172,96 @@ def add_author(form: AuthorSchema):
 def edit_author(form: AuthorUpdateSchema):
     """Edita um autor já existente na base de dados.
 
+    Com RETURNING, a edição e a leitura do autor editado são feitas por um
+    único UPDATE, sem carregar o autor antes.
+
     Retorna uma representação dos autores.
     """
-    author = Author(**form.dict())
+    author_id = int(form.id)
+    values = {
+        "id": author_id,
+        "first_name": form.first_name,
+        "last_name": form.last_name,
+        "avatar_url": form.avatar_url,
+        "twitter_username": form.twitter_username,
+        "updated_at": datetime.now(),
+    }
 
-    # evitando que o id seja alterado para string
-    author.id = int(form.id)
+    logger.debug("Editando autor de ID: '%s'", author_id)
 
-    # criando conexão com a base
-    session = Session()
+    def edit(session):
+        if use_returning:
+            return session.execute(UPDATE_AUTHOR, values).one_or_none()
 
-    author_id = form.id
-    # fazendo a busca
-    old_author = (
-        session.query(Author).filter(Author.id == author_id).one_or_none()
-    )
+        return update_author_without_returning(session, values)
 
-    if not old_author:
-        # se o autor não foi encontrado
-        error_msg = "Autor não encontrado na base :/"
-        log_error_msg = (
-            f"Erro ao buscar autor com ID: #'{author_id}', {error_msg}"
-        )
+    try:
+        # efetivando o comando de edição do autor na tabela
+        row = writer.run(edit)
 
+        if row is None:
+            # se o autor não foi encontrado
+            error_msg = "Autor não encontrado na base :/"
+            log_error_msg = (
+                f"Erro ao buscar autor com ID: #'{author_id}', {error_msg}"
+            )
+
+            logger.warning(log_error_msg)
+            return {"message": error_msg}, 404
+
+        # os artigos em cache embutem os dados do autor
+        invalidate_author_articles(author_id)
+        logger.debug("Editado autor de ID: '%s'", author_id)
+
+        return show_author(row), 200
+
+    except Exception as e:
+        # caso um erro fora do previsto
+        error_msg = "Não foi possível salvar autor :/"
+        log_error_msg = f"Erro ao editar autor '{author_id}', {error_msg}"
         logger.warning(log_error_msg)
-        return {"message": error_msg}, 404
-    else:
-        logger.debug(f"Editando autor de ID: '{old_author.id}'")
 
-        try:
-            # edita os valores do autor
-            old_author.first_name = author.first_name
-            old_author.last_name = author.last_name
-            old_author.avatar_url = author.avatar_url
-            old_author.twitter_username = author.twitter_username
+        return {"message": error_msg}, 400
 
-            # efetivando o comando de edição do autor na tabela
-            session.commit()
-            logger.debug(f"Editado autor de ID: '{old_author.id}'")
 
-            return show_author(old_author), 200
+def update_author_without_returning(session, values: dict):
+    """Edita o autor em bancos sem RETURNING.
 
-        except Exception as e:
-            # caso um erro fora do previsto
-            error_msg = "Não foi possível salvar autor :/"
-            log_error_msg = (
-                f"Erro ao editar autor '{old_author.id}', {error_msg}"
-            )
-            logger.warning(log_error_msg)
+    Returns:
+        Row: A linha do autor editado, como a retornada por UPDATE_AUTHOR, ou
+        None caso o autor não exista.
+    """
+    statement = (
+        update(authors_table)
+        .where(
+            authors_table.c.pk_author == values["id"],
+            authors_table.c.deleted_at.is_(None),
+        )
+        .values({k: v for k, v in values.items() if k != "id"})
+    )
 
-            return {"message": error_msg}, 400
+    if not session.execute(statement).rowcount:
+        return None
+
+    return session.execute(SELECT_AUTHOR, {"id": values["id"]}).one()
 
 
 def delete_author_by_id(path: AuthorSearchSchema):
     """Remove um author à partir do id informado.
 
-    Retorna uma mensagem de confirmação da remoção.
+    O autor deixa de ser exibido imediatamente, e os seus artigos são
+    removidos em segundo plano (ver services.author_deletion).
+
+    Retorna o andamento da remoção, que pode ser acompanhado em
+    /author/deletion/<id>.
     """
     author_id = path.id
 
-    logger.debug(f"Excluindo autor com ID: #{author_id}")
-
-    # criando conexão com a base
-    session = Session()
+    logger.debug("Excluindo autor com ID: #%s", author_id)
 
-    # fazendo a remoção
-    count = session.query(Author).filter(Author.id == author_id).delete()
-    session.commit()
+    deletion = start_author_deletion(author_id)
 
-    if count:
-        # retorna a representação da mensagem de confirmação
-        logger.debug(f"Autor com ID: #{author_id} excluído com sucesso")
-        return {
-            "message": "Autor e seus artigos excluídos com sucesso",
-            "id": author_id,
-        }
-    else:
+    if deletion is None:
         # se o autor não foi encontrado
         error_msg = "Autor não encontrado na base :/"
         log_error_msg = (
@@ -188,3 +270,37 @@ def delete_author_by_id(path: AuthorSearchSchema):
         logger.warning(log_error_msg)
 
         return {"message": error_msg}, 404
+
+    # retorna a representação da mensagem de confirmação
+    logger.debug(
+        "Remoção #%s do autor com ID: #%s iniciada",
+        deletion["id"],
+        author_id,
+    )
+    return (
+        {
+            "message": "Remoção do autor e dos seus artigos iniciada",
+            "id": author_id,
+            "deletion": deletion,
+        },
+        202,
+        {"Location": f"/author/deletion/{deletion['id']}"},
+    )
+
+
+def get_author_deletion(path: AuthorDeletionSearchSchema):
+    """Busca o andamento da remoção de um autor.
+
+    Retorna uma representação da remoção.
+    """
+    with Session() as session:
+        deletion = session.get(AuthorDeletion, path.id)
+
+        if not deletion:
+            error_msg = "Remoção não encontrada na base :/"
+            logger.warning(
+                "Erro ao buscar remoção com ID: #'%s', %s", path.id, error_msg
+            )
+            return {"message": error_msg}, 404
+
+        return show_author_deletion(deletion), 200
@@ -0,0 +1,327 @@
+"""Remoção de autores em segundo plano.
+
+Remover em cascata um autor com dezenas de milhares de artigos em uma única
+transação mantém o lock de escrita do sqlite por tempo suficiente para
+bloquear todos os outros escritores. Por isso, o autor é apenas marcado como
+removido (o que o esconde, junto com os seus artigos, de todas as leituras)
+e os artigos são removidos em lotes de AUTHOR_DELETION_CHUNK_SIZE, cada um
+em uma transação curta, com uma pausa de AUTHOR_DELETION_PAUSE_MS entre
+eles. Por fim, o próprio autor é removido.
+
+O andamento fica na tabela 'author_deletions'. Uma remoção interrompida
+(queda do worker, por exemplo) é retomada na inicialização da aplicação
+depois de AUTHOR_DELETION_LEASE segundos sem atualizações.
+"""
+
+from datetime import datetime, timedelta
+from threading import Thread
+import time
+
+from sqlalchemy import and_, delete, func, or_, select, update
+from logger import logger
+
+from metrics import AUTHOR_DELETION_ARTICLES
+from models import Article, Author, AuthorDeletion, Session, writer
+from schemas import show_author_deletion
+from services.cache import invalidate_author_articles
+from shared.utils import env_bool, env_int
+
+
+articles_table = Article.__table__
+authors_table = Author.__table__
+deletions_table = AuthorDeletion.__table__
+
+# artigos removidos por transação
+CHUNK_SIZE = env_int("AUTHOR_DELETION_CHUNK_SIZE", 500)
+
+# pausa entre os lotes, que dá vez aos demais escritores
+PAUSE = env_int("AUTHOR_DELETION_PAUSE_MS", 10) / 1000
+
+# tempo sem atualizações após o qual uma remoção é considerada interrompida
+LEASE = timedelta(seconds=env_int("AUTHOR_DELETION_LEASE", 60))
+
+# com false, a remoção é feita na própria requisição (um banco sqlite em
+# memória, por exemplo, não é compartilhado entre as threads)
+RUN_IN_BACKGROUND = env_bool("AUTHOR_DELETION_BACKGROUND", True)
+
+# threads de remoção em andamento neste processo, pelo id da remoção
+running_deletions = {}
+
+
+class AuthorDeletionPendingError(Exception):
+    """O autor está em remoção e não aceita novos artigos."""
+
+
+def check_author_not_deleted(session, author_id: int):
+    """Impede que um artigo seja associado a um autor em remoção.
+
+    Deve ser chamada na transação que insere ou move o artigo. A marcação
+    do autor também é uma escrita, então as duas transações nunca se
+    intercalam, e nenhum artigo escapa dos lotes da remoção.
+
+    Raises:
+        AuthorDeletionPendingError: caso o autor esteja marcado como
+            removido.
+    """
+    deleted_at = session.scalar(
+        select(authors_table.c.deleted_at).where(
+            authors_table.c.pk_author == author_id
+        )
+    )
+
+    if deleted_at is not None:
+        raise AuthorDeletionPendingError(author_id)
+
+
+def start_author_deletion(author_id: int):
+    """Marca o autor como removido e inicia a remoção dos seus artigos.
+
+    Uma nova chamada para um autor em remoção retorna a remoção existente;
+    caso ela tenha falhado, a remoção é reiniciada.
+
+    Returns:
+        dict: A remoção, com a estrutura de show_author_deletion, ou None
+        caso o autor não exista.
+    """
+
+    def mark(session):
+        marked = session.execute(
+            update(authors_table)
+            .where(
+                authors_table.c.pk_author == author_id,
+                authors_table.c.deleted_at.is_(None),
+            )
+            .values(deleted_at=datetime.now())
+        ).rowcount
+
+        if marked:
+            total = session.scalar(
+                select(func.count()).where(
+                    articles_table.c.author_id == author_id
+                )
+            )
+            deletion = AuthorDeletion(author_id, total)
+            session.add(deletion)
+            session.flush()
+            return show_author_deletion(deletion), True
+
+        deletion = session.scalars(
+            select(AuthorDeletion)
+            .where(
+                AuthorDeletion.author_id == author_id,
+                AuthorDeletion.status != AuthorDeletion.DONE,
+            )
+            .order_by(AuthorDeletion.id.desc())
+            .limit(1)
+        ).first()
+
+        if deletion is None:
+            # o autor não existe (ou já foi removido)
+            return None, False
+
+        if deletion.status != AuthorDeletion.FAILED:
+            return show_author_deletion(deletion), False
+
+        deletion.status = AuthorDeletion.PENDING
+        deletion.error = None
+        session.flush()
+        return show_author_deletion(deletion), True
+
+    details, started = writer.run(mark)
+
+    if not started:
+        return details
+
+    # os artigos em cache embutem os dados do autor, que não existe mais
+    # para as leituras; as consultas seguintes já ignoram os seus artigos
+    invalidate_author_articles(author_id)
+
+    spawn_author_deletion(details["id"])
+    return details
+
+
+def spawn_author_deletion(deletion_id: int):
+    """Executa a remoção em uma thread (ou na thread atual, se desativado)."""
+    if not RUN_IN_BACKGROUND:
+        run_author_deletion(deletion_id)
+        return
+
+    thread = Thread(
+        target=run_author_deletion,
+        args=(deletion_id,),
+        name=f"author-deletion-{deletion_id}",
+        daemon=True,
+    )
+    running_deletions[deletion_id] = thread
+    thread.start()
+
+
+def claim_author_deletion(session, deletion_id: int):
+    """Assume a execução de uma remoção pendente ou interrompida.
+
+    A atualização é atômica, então apenas um worker executa cada remoção.
+
+    Returns:
+        int: O ID do autor da remoção assumida, ou None caso ela já esteja
+        em andamento ou concluída.
+    """
+    now = datetime.now()
+    claimed = session.execute(
+        update(deletions_table)
+        .where(
+            deletions_table.c.id == deletion_id,
+            or_(
+                deletions_table.c.status == AuthorDeletion.PENDING,
+                and_(
+                    deletions_table.c.status == AuthorDeletion.RUNNING,
+                    deletions_table.c.updated_at < now - LEASE,
+                ),
+            ),
+        )
+        .values(status=AuthorDeletion.RUNNING, updated_at=now)
+    ).rowcount
+
+    if not claimed:
+        return None
+
+    return session.scalar(
+        select(deletions_table.c.author_id).where(
+            deletions_table.c.id == deletion_id
+        )
+    )
+
+
+def delete_articles_chunk(session, deletion_id: int, author_id: int) -> int:
+    """Remove um lote de artigos do autor e registra o progresso.
+
+    As entradas do índice de busca e os conteúdos são removidos em cascata
+    pelo banco.
+
+    Returns:
+        int: Quantidade de artigos removidos (0 quando não restam artigos).
+    """
+    chunk = session.scalars(
+        select(articles_table.c.id)
+        .where(articles_table.c.author_id == author_id)
+        .limit(CHUNK_SIZE)
+    ).all()
+
+    if not chunk:
+        return 0
+
+    session.execute(
+        delete(articles_table).where(articles_table.c.id.in_(chunk))
+    )
+    # o updated_at também indica que a remoção continua em andamento
+    session.execute(
+        update(deletions_table)
+        .where(deletions_table.c.id == deletion_id)
+        .values(
+            articles_deleted=deletions_table.c.articles_deleted + len(chunk),
+            updated_at=datetime.now(),
+        )
+    )
+    return len(chunk)
+
+
+def finish_author_deletion(session, deletion_id: int, author_id: int):
+    """Remove o autor e conclui a remoção."""
+    # artigos adicionados durante a remoção saem em cascata
+    session.execute(
+        delete(authors_table).where(authors_table.c.pk_author == author_id)
+    )
+    session.execute(
+        update(deletions_table)
+        .where(deletions_table.c.id == deletion_id)
+        .values(status=AuthorDeletion.DONE, finished_at=datetime.now())
+    )
+
+
+def fail_author_deletion(session, deletion_id: int, error: str):
+    """Registra a falha da remoção, que pode ser reiniciada depois."""
+    session.execute(
+        update(deletions_table)
+        .where(deletions_table.c.id == deletion_id)
+        .values(status=AuthorDeletion.FAILED, error=error[:200])
+    )
+
+
+def run_author_deletion(deletion_id: int):
+    """Remove os artigos do autor em lotes e, por fim, o próprio autor.
+
+    Cada lote é uma escrita separada (ver models/writer.py), então as
+    escritas das requisições são atendidas entre um lote e outro.
+    """
+    try:
+        author_id = writer.run(
+            lambda session: claim_author_deletion(session, deletion_id)
+        )
+
+        if author_id is None:
+            return
+
+        logger.debug(
+            "Removendo artigos do autor com ID: #%s (remoção #%s)",
+            author_id,
+            deletion_id,
+        )
+
+        while True:
+            removed = writer.run(
+                lambda session: delete_articles_chunk(
+                    session, deletion_id, author_id
+                )
+            )
+
+            if not removed:
+                break
+
+            AUTHOR_DELETION_ARTICLES.inc(removed)
+            time.sleep(PAUSE)
+
+        writer.run(
+            lambda session: finish_author_deletion(
+                session, deletion_id, author_id
+            )
+        )
+
+        logger.debug(
+            "Autor com ID: #%s e seus artigos excluídos com sucesso",
+            author_id,
+        )
+
+    except Exception as e:
+        logger.exception("Erro na remoção de autor #%s", deletion_id)
+        writer.run(
+            lambda session: fail_author_deletion(session, deletion_id, str(e))
+        )
+
+    finally:
+        running_deletions.pop(deletion_id, None)
+
+
+def resume_author_deletions() -> int:
+    """Retoma as remoções pendentes ou interrompidas.
+
+    Returns:
+        int: Quantidade de remoções retomadas.
+    """
+    with Session() as session:
+        deletion_ids = session.scalars(
+            select(deletions_table.c.id).where(
+                or_(
+                    deletions_table.c.status == AuthorDeletion.PENDING,
+                    and_(
+                        deletions_table.c.status == AuthorDeletion.RUNNING,
+                        deletions_table.c.updated_at
+                        < datetime.now() - LEASE,
+                    ),
+                )
+            )
+        ).all()
+
+    for deletion_id in deletion_ids:
+        logger.info("Retomando remoção de autor #%s", deletion_id)
+        spawn_author_deletion(deletion_id)
+
+    return len(deletion_ids)
@@ -0,0 +1,25 @@
+"""Caches dos services."""
+
+from shared.utils import LRUCache, env_int
+
+# representações de artigos (show_article_details), os seus cabeçalhos e as
+# datas de modificação do artigo e do autor, indexadas pelo id do artigo; as
+# entradas são conferidas com a base a cada acerto (ver
+# services.article.get_cached_details), já que as invalidações abaixo só
+# alcançam o processo que fez a escrita
+article_details_cache = LRUCache(
+    maxsize=env_int("ARTICLE_CACHE_SIZE", 1024),
+    ttl=env_int("ARTICLE_CACHE_TTL", 300),
+)
+
+
+def invalidate_article(article_id: str):
+    """Remove do cache a representação do artigo."""
+    article_details_cache.delete(article_id)
+
+
+def invalidate_author_articles(author_id: int):
+    """Remove do cache os artigos que embutem os dados do autor."""
+    article_details_cache.delete_matching(
+        lambda entry: entry[0]["author_id"] == author_id
+    )
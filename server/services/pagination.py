@@ -0,0 +1,85 @@
+"""Helpers para a paginação por keyset (cursor) das listagens."""
+
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+import binascii
+import json
+
+from sqlalchemy import tuple_
+
+
+class InvalidCursorError(ValueError):
+    """Indica que o cursor informado pelo cliente não pôde ser lido."""
+
+
+def encode_cursor(created_at: datetime, id) -> str:
+    """Gera um cursor opaco a partir da chave (created_at, id) de uma linha."""
+    key = json.dumps([created_at.isoformat(), id], separators=(",", ":"))
+    return urlsafe_b64encode(key.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """Recupera a chave (created_at, id) contida em um cursor.
+
+    Raises:
+        InvalidCursorError: caso o cursor esteja malformado.
+    """
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        created_at, id = json.loads(urlsafe_b64decode(cursor + padding))
+        return datetime.fromisoformat(created_at), id
+    except (binascii.Error, ValueError, TypeError):
+        raise InvalidCursorError(cursor)
+
+
+def row_key(row) -> tuple:
+    """Retorna a chave (created_at, id) de uma linha da listagem."""
+    return row.created_at, row.id
+
+
+def paginate(
+    session,
+    statement,
+    created_at_column,
+    id_column,
+    limit: int,
+    cursor=None,
+    key=row_key,
+):
+    """Aplica a paginação por keyset à consulta.
+
+    As linhas são ordenadas por (created_at, id), chave coberta por um
+    índice composto, e a página seguinte começa logo após a última linha
+    retornada. Com isso o custo de cada página não depende da posição na
+    listagem.
+
+    Args:
+        session (Session): Sessão usada para executar a consulta.
+        statement (Select): Consulta a ser paginada.
+        created_at_column (Column): Coluna com a data de criação.
+        id_column (Column): Coluna com a chave primária.
+        limit (int): Quantidade máxima de linhas da página.
+        cursor (str, optional): Cursor retornado pela página anterior.
+        key (callable, optional): Função que extrai a chave (created_at, id)
+            de uma linha, usada quando a consulta retorna mais de uma
+            entidade ou coluna por linha.
+
+    Returns:
+        tuple: Linhas da página e o cursor da próxima página (ou None, caso
+            esta seja a última).
+    """
+    if cursor:
+        created_at, id = decode_cursor(cursor)
+        statement = statement.where(
+            tuple_(created_at_column, id_column) > tuple_(created_at, id)
+        )
+
+    # busca uma linha a mais para saber se existe uma próxima página
+    statement = statement.order_by(created_at_column, id_column)
+    rows = session.execute(statement.limit(limit + 1)).all()
+
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    return rows, encode_cursor(*key(rows[-1]))
@@ -3,4 +3,23 @@ from .strings import (
     limit_length,
     remove_special_chars,
     replace_spaces,
+    strip_html,
 )
+
+from .env import (
+    env_bool,
+    env_int,
+    env_str,
+)
+
+from .cache import LRUCache
+
+from .iterables import batched
+
+from .ndjson import NDJSON_MIMETYPES, iter_ndjson
+
+from .compression import available_encodings, compress, get_compressor
+
+from .streaming import buffered, compress_chunks
+
+from .http import choose_encoding, last_modified_headers
@@ -0,0 +1,191 @@
+"""Execução de uma aplicação WSGI em um servidor ASGI, sem threads.
+
+Cada requisição roda em um greenlet (com o `greenlet_spawn` do SQLAlchemy).
+A aplicação continua síncrona, mas toda espera feita por `await_only` (a
+leitura do corpo, o envio da resposta e as consultas de uma engine asyncio)
+suspende apenas o greenlet da requisição e libera o event loop para as
+demais.
+"""
+
+import sys
+
+from sqlalchemy.util import await_only, greenlet_spawn
+
+
+class ASGIInput:
+    """Corpo da requisição, recebido do servidor ASGI sob demanda.
+
+    Usado como `wsgi.input`, o que permite ler corpos grandes (como uma
+    importação NDJSON) sem carregá-los inteiros na memória.
+    """
+
+    def __init__(self, receive):
+        self.receive = receive
+        self.buffer = bytearray()
+        self.more_body = True
+
+    def _receive(self):
+        message = await_only(self.receive())
+
+        if message["type"] == "http.disconnect":
+            self.more_body = False
+            return
+
+        self.buffer += message.get("body", b"")
+        self.more_body = message.get("more_body", False)
+
+    def _take(self, size: int) -> bytes:
+        data = bytes(self.buffer[:size])
+        del self.buffer[:size]
+        return data
+
+    def read(self, size: int = -1) -> bytes:
+        while self.more_body and (size < 0 or len(self.buffer) < size):
+            self._receive()
+
+        return self._take(len(self.buffer) if size < 0 else size)
+
+    def readline(self, size: int = -1) -> bytes:
+        while self.more_body and b"\n" not in self.buffer:
+            if 0 <= size <= len(self.buffer):
+                break
+            self._receive()
+
+        end = self.buffer.find(b"\n") + 1 or len(self.buffer)
+        return self._take(end if size < 0 else min(end, size))
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> bytes:
+        line = self.readline()
+
+        if not line:
+            raise StopIteration
+
+        return line
+
+
+def build_environ(scope: dict, body) -> dict:
+    """Monta o environ WSGI (PEP 3333) de uma requisição HTTP ASGI."""
+    server = scope.get("server") or ("localhost", 80)
+    client = scope.get("client")
+
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", "").encode().decode("latin1"),
+        "PATH_INFO": scope["path"].encode().decode("latin1"),
+        "QUERY_STRING": scope["query_string"].decode("latin1"),
+        "SERVER_NAME": server[0],
+        "SERVER_PORT": str(server[1] or 80),
+        "SERVER_PROTOCOL": "HTTP/%s" % scope.get("http_version", "1.1"),
+        "REMOTE_ADDR": client[0] if client else "",
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": body,
+        # o corpo termina quando o servidor não tem mais dados, mesmo sem
+        # Content-Length (transferência chunked)
+        "wsgi.input_terminated": True,
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+
+    for name, value in scope["headers"]:
+        name = name.decode("latin1").upper().replace("-", "_")
+        value = value.decode("latin1")
+
+        if name not in ("CONTENT_TYPE", "CONTENT_LENGTH"):
+            name = "HTTP_" + name
+
+        # cabeçalhos repetidos são unidos, como em um servidor WSGI
+        if name in environ:
+            value = environ[name] + "," + value
+
+        environ[name] = value
+
+    return environ
+
+
+class WSGIAdapter:
+    """Aplicação ASGI que atende cada requisição com a aplicação WSGI.
+
+    Args:
+        wsgi_app (Callable): Aplicação WSGI.
+        on_startup (Callable, optional): Corrotina executada antes da
+            primeira requisição (evento `lifespan.startup`).
+        on_shutdown (Callable, optional): Corrotina executada quando o
+            servidor encerra (evento `lifespan.shutdown`).
+    """
+
+    def __init__(self, wsgi_app, on_startup=None, on_shutdown=None):
+        self.wsgi_app = wsgi_app
+        self.on_startup = on_startup
+        self.on_shutdown = on_shutdown
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self.lifespan(receive, send)
+        elif scope["type"] == "http":
+            await greenlet_spawn(self.handle, scope, receive, send)
+        else:
+            raise ValueError(f"Protocolo não suportado: '{scope['type']}'")
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+
+            if message["type"] == "lifespan.startup":
+                if self.on_startup is not None:
+                    await self.on_startup()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                if self.on_shutdown is not None:
+                    await self.on_shutdown()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    def handle(self, scope, receive, send):
+        """Executa a aplicação WSGI no greenlet da requisição."""
+        environ = build_environ(scope, ASGIInput(receive))
+        start = {"type": "http.response.start"}
+        started = False
+
+        def start_response(status, headers, exc_info=None):
+            start["status"] = int(status.split(" ", 1)[0])
+            start["headers"] = [
+                (name.lower().encode("latin1"), value.encode("latin1"))
+                for name, value in headers
+            ]
+
+        chunks = self.wsgi_app(environ, start_response)
+
+        try:
+            # o início da resposta é enviado com o primeiro bloco, já que a
+            # aplicação pode chamar start_response na primeira iteração
+            for chunk in chunks:
+                if not chunk:
+                    continue
+
+                if not started:
+                    await_only(send(start))
+                    started = True
+
+                await_only(
+                    send(
+                        {
+                            "type": "http.response.body",
+                            "body": chunk,
+                            "more_body": True,
+                        }
+                    )
+                )
+
+            if not started:
+                await_only(send(start))
+
+            await_only(send({"type": "http.response.body", "body": b""}))
+        finally:
+            if hasattr(chunks, "close"):
+                chunks.close()
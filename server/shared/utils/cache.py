@@ -0,0 +1,131 @@
+"""Cache em memória com limite de tamanho (LRU) e tempo de expiração."""
+
+from collections import OrderedDict
+from threading import Lock
+import time
+
+
+class LRUCache:
+    """Cache LRU com expiração por tempo, seguro entre threads.
+
+    O cache é por processo: cada worker do gunicorn mantém o seu, então o
+    TTL limita por quanto tempo um worker pode servir um valor que foi
+    invalidado em outro.
+
+    Args:
+        maxsize (int): Quantidade máxima de entradas. Zero desativa o cache.
+        ttl (float): Segundos de validade de cada entrada. Zero desativa a
+            expiração por tempo.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._invalidations = 0
+
+    def token(self) -> int:
+        """Retorna um marcador do estado das invalidações do cache.
+
+        Um valor lido da base antes de uma invalidação concorrente pode estar
+        desatualizado. Passar para `set` o token obtido antes da leitura faz
+        com que esse valor seja descartado em vez de guardado.
+        """
+        return self._invalidations
+
+    def get(self, key, default=None):
+        """Retorna o valor da chave, marcando-o como o mais recente."""
+        with self._lock:
+            entry = self._data.get(key)
+
+            if entry is None:
+                self.misses += 1
+                return default
+
+            value, expires_at = entry
+
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, token: int = None):
+        """Guarda o valor, removendo as entradas menos usadas se preciso.
+
+        Args:
+            key: Chave do valor.
+            value: Valor a ser guardado.
+            token (int, optional): Marcador obtido com `token` antes da
+                leitura do valor. Se houve alguma invalidação desde então, o
+                valor não é guardado.
+        """
+        if self.maxsize <= 0:
+            return
+
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+
+        with self._lock:
+            if token is not None and token != self._invalidations:
+                return
+
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        """Remove a chave do cache, caso exista."""
+        with self._lock:
+            self._invalidations += 1
+            self._data.pop(key, None)
+
+    def delete_matching(self, predicate):
+        """Remove todas as entradas cujo valor satisfaz o predicado.
+
+        Returns:
+            int: Quantidade de entradas removidas.
+        """
+        with self._lock:
+            self._invalidations += 1
+            keys = [
+                key
+                for key, (value, _) in self._data.items()
+                if predicate(value)
+            ]
+
+            for key in keys:
+                del self._data[key]
+
+            return len(keys)
+
+    def clear(self):
+        """Remove todas as entradas do cache."""
+        with self._lock:
+            self._invalidations += 1
+            self._data.clear()
+
+    def stats(self) -> dict:
+        """Retorna os contadores de uso do cache."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
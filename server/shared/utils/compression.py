@@ -0,0 +1,78 @@
+"""Compressão de respostas com gzip, brotli e zstd.
+
+O gzip vem da biblioteca padrão; o brotli e o zstd são usados quando os
+pacotes `brotli` e `zstandard` estão instalados.
+"""
+
+import zlib
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depende do ambiente
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - depende do ambiente
+    zstandard = None
+
+# níveis padrão, adequados à compressão a cada resposta: os níveis máximos
+# do brotli e do zstd custam dezenas de vezes mais para ganhos pequenos
+DEFAULT_LEVELS = {"zstd": 3, "br": 4, "gzip": 6}
+
+
+class BrotliCompressor:
+    """Expõe o compressor do brotli com a interface do `zlib`."""
+
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.finish()
+
+
+def available_encodings() -> tuple:
+    """Retorna as codificações disponíveis, em ordem de preferência.
+
+    O zstd e o brotli comprimem mais que o gzip; o zstd vem primeiro por
+    ser o mais rápido dos dois nos níveis usados aqui.
+    """
+    encodings = []
+
+    if zstandard is not None:
+        encodings.append("zstd")
+    if brotli is not None:
+        encodings.append("br")
+
+    encodings.append("gzip")
+    return tuple(encodings)
+
+
+def get_compressor(encoding: str, level: int = None):
+    """Cria um compressor incremental (métodos `compress` e `flush`).
+
+    Raises:
+        ValueError: caso a codificação não esteja disponível.
+    """
+    if encoding not in available_encodings():
+        raise ValueError(f"Codificação indisponível: '{encoding}'")
+
+    if level is None:
+        level = DEFAULT_LEVELS[encoding]
+
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=level).compressobj()
+
+    if encoding == "br":
+        return BrotliCompressor(level)
+
+    return zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+
+def compress(body: bytes, encoding: str, level: int = None) -> bytes:
+    """Comprime o corpo inteiro de uma resposta."""
+    compressor = get_compressor(encoding, level)
+    return compressor.compress(body) + compressor.flush()
@@ -0,0 +1,31 @@
+"""Helpers para leitura de variáveis de ambiente."""
+
+import os
+
+
+def env_str(name, default=None):
+    """Retorna o valor da variável de ambiente ou o padrão informado."""
+    return os.getenv(name, default)
+
+
+def env_int(name, default):
+    """Retorna a variável de ambiente convertida para inteiro."""
+    value = os.getenv(name)
+
+    if value is None or value.strip() == "":
+        return default
+
+    return int(value)
+
+
+def env_bool(name, default):
+    """Retorna a variável de ambiente interpretada como booleano.
+
+    São considerados verdadeiros os valores "1", "true", "yes" e "on".
+    """
+    value = os.getenv(name)
+
+    if value is None or value.strip() == "":
+        return default
+
+    return value.strip().lower() in ("1", "true", "yes", "on")
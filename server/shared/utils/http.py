@@ -0,0 +1,41 @@
+"""Helpers para cabeçalhos HTTP."""
+
+from werkzeug.http import http_date
+
+
+def last_modified_headers(*timestamps) -> dict:
+    """Monta o cabeçalho Last-Modified a partir da data mais recente.
+
+    As datas da base são locais e sem fuso horário, e são convertidas para
+    UTC antes da formatação. Datas nulas são ignoradas.
+    """
+    timestamps = [ts for ts in timestamps if ts is not None]
+
+    if not timestamps:
+        return {}
+
+    return {"Last-Modified": http_date(max(timestamps).astimezone())}
+
+
+def choose_encoding(accept_encodings, available) -> str:
+    """Escolhe a codificação da resposta a partir do Accept-Encoding.
+
+    Args:
+        accept_encodings (Accept): O `request.accept_encodings`.
+        available (Iterable): Codificações oferecidas, em ordem de
+            preferência do servidor, usada para desempatar qualidades
+            iguais.
+
+    Returns:
+        str: A codificação aceita com a maior qualidade, ou None caso o
+        cliente não aceite nenhuma (a resposta segue sem compressão).
+    """
+    best, best_quality = None, 0
+
+    for encoding in available:
+        quality = accept_encodings.quality(encoding)
+
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+
+    return best
@@ -0,0 +1,18 @@
+"""Helpers para iteração em lotes."""
+
+from itertools import islice
+
+
+def batched(iterable, size: int):
+    """Agrupa os itens do iterável em listas de até `size` itens.
+
+    Os itens são consumidos sob demanda, o que permite processar fluxos
+    maiores que a memória disponível.
+    """
+    iterator = iter(iterable)
+
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
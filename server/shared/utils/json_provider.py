@@ -0,0 +1,155 @@
+"""Serialização JSON das respostas da API.
+
+Os providers reproduzem a saída do `jsonify` do Flask (chaves ordenadas,
+sem espaços, datas no formato HTTP e caracteres não ASCII escapados), de
+forma que trocar de provider não altera nenhuma resposta.
+"""
+
+from datetime import date, datetime, timezone
+from json.encoder import encode_basestring_ascii
+import codecs
+import dataclasses
+import decimal
+import uuid
+
+from werkzeug.http import http_date
+
+from .env import env_str
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende do ambiente
+    orjson = None
+
+
+class JSONProvider:
+    """Serializa as respostas com o módulo `json` da biblioteca padrão."""
+
+    def __init__(self, app):
+        self.app = app
+
+    def dumps(self, obj) -> str:
+        """Serializa o objeto da mesma forma que o `jsonify` do Flask."""
+        return self.app.json_encoder(
+            ensure_ascii=self.app.config["JSON_AS_ASCII"],
+            sort_keys=self.app.config["JSON_SORT_KEYS"],
+            separators=(",", ":"),
+        ).encode(obj)
+
+    def encode(self, obj) -> bytes:
+        """Serializa o objeto para o corpo da resposta, em UTF-8."""
+        return self.dumps(obj).encode()
+
+    def response(self, obj):
+        """Cria a resposta HTTP com o objeto serializado."""
+        if self.app.config["JSONIFY_PRETTYPRINT_REGULAR"] or self.app.debug:
+            # a saída formatada é usada apenas em desenvolvimento
+            from flask import jsonify
+
+            return jsonify(obj)
+
+        return self.app.response_class(
+            self.encode(obj) + b"\n",
+            mimetype=self.app.config["JSONIFY_MIMETYPE"],
+        )
+
+
+_WEEKDAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+_MONTHS = (
+    "Jan", "Feb", "Mar", "Apr", "May", "Jun",
+    "Jul", "Aug", "Sep", "Oct", "Nov", "Dec",
+)
+
+
+def _escape_non_ascii(error):
+    """Escapa um trecho não ASCII como o `ensure_ascii` do `json`.
+
+    Usada como tratamento de erro do codec ASCII, o que evita percorrer o
+    texto em Python para encontrar os caracteres a escapar.
+    """
+    chunk = error.object[error.start:error.end]
+    return encode_basestring_ascii(chunk)[1:-1], error.end
+
+
+codecs.register_error("json_escape", _escape_non_ascii)
+
+
+def _http_date(value: datetime) -> str:
+    """Formata a data como o `http_date` do werkzeug, sem passar por ele.
+
+    Datas sem fuso são tratadas como UTC, assim como no werkzeug.
+    """
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+
+    return "%s, %02d %s %04d %02d:%02d:%02d GMT" % (
+        _WEEKDAYS[value.weekday()],
+        value.day,
+        _MONTHS[value.month - 1],
+        value.year,
+        value.hour,
+        value.minute,
+        value.second,
+    )
+
+
+def _default(obj):
+    """Converte os tipos que o `JSONEncoder` do Flask também converte."""
+    if isinstance(obj, datetime):
+        return _http_date(obj)
+    if isinstance(obj, date):
+        return http_date(obj)
+    if isinstance(obj, (decimal.Decimal, uuid.UUID)):
+        return str(obj)
+    if dataclasses.is_dataclass(obj):
+        return dataclasses.asdict(obj)
+    if hasattr(obj, "__html__"):
+        return str(obj.__html__())
+    raise TypeError(
+        f"Object of type {type(obj).__name__} is not JSON serializable"
+    )
+
+
+class OrjsonProvider(JSONProvider):
+    """Serializa as respostas com o orjson.
+
+    As datas são repassadas ao `_default` para manter o formato HTTP usado
+    pelo Flask. Objetos que o orjson não suporta (como inteiros maiores que
+    64 bits) são serializados pela biblioteca padrão.
+    """
+
+    def dumps(self, obj) -> str:
+        """Serializa o objeto da mesma forma que o `jsonify` do Flask."""
+        return self.encode(obj).decode()
+
+    def encode(self, obj) -> bytes:
+        """Serializa o objeto para o corpo da resposta, em UTF-8."""
+        option = (
+            orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+        )
+
+        if self.app.config["JSON_SORT_KEYS"]:
+            option |= orjson.OPT_SORT_KEYS
+
+        try:
+            data = orjson.dumps(obj, default=_default, option=option)
+        except TypeError:
+            # orjson.JSONEncodeError é subclasse de TypeError
+            return super().dumps(obj).encode()
+
+        if self.app.config["JSON_AS_ASCII"] and not data.isascii():
+            data = data.decode().encode("ascii", "json_escape")
+
+        return data
+
+
+def get_json_provider(app) -> JSONProvider:
+    """Retorna o provider definido pela variável de ambiente JSON_PROVIDER.
+
+    Com "auto" (padrão) é usado o orjson, caso esteja instalado. Com "json"
+    é usada sempre a biblioteca padrão.
+    """
+    if env_str("JSON_PROVIDER", "auto") == "auto" and orjson is not None:
+        return OrjsonProvider(app)
+
+    return JSONProvider(app)
@@ -0,0 +1,23 @@
+"""Leitura de documentos NDJSON (um JSON por linha)."""
+
+import json
+
+# tipos de conteúdo aceitos para NDJSON
+NDJSON_MIMETYPES = ("application/x-ndjson", "application/jsonl")
+
+
+def iter_ndjson(lines):
+    """Decodifica um JSON por linha, ignorando as linhas em branco.
+
+    Uma linha inválida não interrompe a leitura: no lugar do valor é
+    retornada a exceção (ValueError) gerada ao decodificá-la, para que o
+    chamador possa reportar o erro daquela linha e seguir com as demais.
+    """
+    for line in lines:
+        if not line.strip():
+            continue
+
+        try:
+            yield json.loads(line)
+        except ValueError as error:
+            yield error
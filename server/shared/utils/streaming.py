@@ -0,0 +1,47 @@
+"""Helpers para respostas geradas sob demanda."""
+
+from .compression import get_compressor
+
+# tamanho mínimo dos blocos enviados ao cliente
+CHUNK_SIZE = 64 * 1024
+
+
+def buffered(chunks, size: int = CHUNK_SIZE):
+    """Agrupa pequenos blocos de bytes em blocos de ao menos `size` bytes.
+
+    Evita que cada linha de uma resposta longa seja enviada (e comprimida)
+    separadamente.
+    """
+    buffer = []
+    buffered_size = 0
+
+    for chunk in chunks:
+        buffer.append(chunk)
+        buffered_size += len(chunk)
+
+        if buffered_size >= size:
+            yield b"".join(buffer)
+            buffer = []
+            buffered_size = 0
+
+    if buffer:
+        yield b"".join(buffer)
+
+
+def compress_chunks(chunks, encoding: str = "gzip", level: int = None):
+    """Comprime os blocos em um único fluxo, sob demanda.
+
+    Args:
+        chunks (Iterable): Blocos de bytes da resposta.
+        encoding (str): "gzip", "br" ou "zstd" (ver compression.py).
+        level (int, optional): Nível de compressão; o padrão da codificação
+            quando omitido.
+    """
+    compressor = get_compressor(encoding, level)
+
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+
+    yield compressor.flush()
@@ -1,6 +1,7 @@
 """Helpers para manipulação de strings."""
 
 import re
+from html.parser import HTMLParser
 from unidecode import unidecode
 from datetime import datetime
 
@@ -24,3 +25,22 @@ def add_date_prefix(id_string):
 def limit_length(id_string, length):
     """Limita o comprimento da string."""
     return id_string[:length]
+
+
+class _TextExtractor(HTMLParser):
+    """Coleta apenas o texto de um documento HTML."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+
+    def handle_data(self, data):
+        self.parts.append(data)
+
+
+def strip_html(html):
+    """Remove as tags HTML, mantendo apenas o texto do conteúdo."""
+    parser = _TextExtractor()
+    parser.feed(html or "")
+    parser.close()
+    return re.sub(r"\s+", " ", " ".join(parser.parts)).strip()
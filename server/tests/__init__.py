@@ -2,3 +2,7 @@ import os
 
 # Muda o local do banco de dados para memória
 os.environ["DB_URL"] = "sqlite:///:memory:"
+
+# o banco em memória não é compartilhado entre threads, então a remoção de
+# autores é feita na própria requisição
+os.environ["AUTHOR_DELETION_BACKGROUND"] = "false"
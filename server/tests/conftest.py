@@ -1,10 +1,19 @@
 import pytest
 
-from app import app
+from app import create_app
+from models import init_db
+
+# os testes que montam a própria aplicação Flask também usam o banco
+init_db()
+
+
+@pytest.fixture(scope="session")
+def app():
+    return create_app()
 
 
 @pytest.fixture(scope="module")
-def test_client():
+def test_client(app):
     flask_app = app
 
     testing_client = flask_app.test_client()
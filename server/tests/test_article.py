@@ -1,8 +1,17 @@
+from datetime import datetime, timezone
+
 from flask import Flask
 from flask_testing import TestCase
+from sqlalchemy import event, text
+from unittest.mock import Mock, patch
+from werkzeug.http import http_date
 
 from routes import author_bp, article_bp
-from models import Author, Article, Session
+from models import Author, Article, ArticleBody, Session, engine
+from services import article as article_service
+from services import cache
+from services.cache import article_details_cache
+from shared.utils import LRUCache
 
 
 class TestArticle(TestCase):
@@ -35,6 +44,9 @@ class TestArticle(TestCase):
         self.app.config["TESTING"] = True
         self.session = Session()
 
+        # os testes alteram a base diretamente, sem passar pelos services
+        article_details_cache.clear()
+
         self.create_author()
 
         # Adiciona um artigo à sessão
@@ -78,6 +90,165 @@ class TestArticle(TestCase):
         self.assertIn("articles", response.json)
         self.assertEqual(response.json["articles"][0]["title"], "Teste")
 
+    def test_get_articles_paginated(self):
+        # cria artigos extras para preencher mais de uma página
+        articles = [
+            Article(
+                title=f"Artigo paginado {i}",
+                content="Conteúdo de teste",
+                subtitle="Subtítulo de teste",
+                author_id=self.author.id,
+            )
+            for i in range(4)
+        ]
+        self.session.add_all(articles)
+        self.session.commit()
+        expected_ids = {self.article.id} | {a.id for a in articles}
+
+        # percorre a listagem seguindo o cursor de cada página
+        ids = []
+        cursor = None
+        while True:
+            params = {"limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+
+            response = self.client.get("/articles", query_string=params)
+            self.assertEqual(response.status_code, 200)
+            self.assertLessEqual(len(response.json["articles"]), 2)
+
+            ids += [article["id"] for article in response.json["articles"]]
+            cursor = response.json["next_cursor"]
+            if not cursor:
+                break
+
+        # nenhum artigo é repetido ou pulado entre as páginas
+        self.assertEqual(len(ids), len(set(ids)))
+        self.assertTrue(expected_ids.issubset(ids))
+
+        for article in articles:
+            self.session.delete(article)
+        self.session.commit()
+
+    def test_get_articles_invalid_cursor(self):
+        response = self.client.get("/articles?cursor=invalido")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json, {"message": "Cursor de paginação inválido :/"}
+        )
+
+    def test_get_authors_counts_articles_in_one_query(self):
+        statements = []
+
+        def count_statement(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", count_statement)
+        try:
+            response = self.client.get("/authors")
+        finally:
+            event.remove(engine, "before_cursor_execute", count_statement)
+
+        self.assertEqual(response.status_code, 200)
+        # a listagem não carrega os artigos de cada autor
+        self.assertEqual(len(statements), 1)
+
+        author = next(
+            author
+            for author in response.json["authors"]
+            if author["id"] == self.author.id
+        )
+        self.assertEqual(author["articles_count"], 1)
+
+    def search(self, terms):
+        response = self.client.get(
+            "/articles/search", query_string={"q": terms}
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.json["articles"]
+
+    def test_search_articles(self):
+        # adiciona o artigo pela API, para que ele seja indexado
+        article_data = {
+            "title": "Busca textual",
+            "content": "<p>Índices <b>invertidos</b> &lt;script&gt;</p>",
+            "subtitle": "Subtítulo da busca",
+            "author_id": self.author.id,
+        }
+        response = self.client.post("/article", data=article_data)
+        article_id = response.json["id"]
+
+        # os acentos e o HTML do conteúdo são ignorados na busca
+        results = self.search("indices invertidos")
+        self.assertEqual([r["id"] for r in results], [article_id])
+        self.assertIn("<mark>invertidos</mark>", results[0]["snippet"])
+        self.assertIn("&lt;script&gt;", results[0]["snippet"])
+
+        # o último termo também é buscado como prefixo
+        self.assertEqual(len(self.search("invert")), 1)
+
+        # a edição atualiza o índice
+        edited_data = dict(article_data, id=article_id)
+        edited_data["content"] = "<p>Árvores balanceadas</p>"
+        self.client.put("/article", data=edited_data)
+        self.assertEqual(self.search("invertidos"), [])
+        self.assertEqual(len(self.search("arvores")), 1)
+
+        # a remoção retira o artigo do índice
+        self.client.delete(f"/article/{article_id}")
+        self.assertEqual(self.search("arvores"), [])
+
+    def test_search_after_rowid_renumbering(self):
+        response = self.client.post(
+            "/article",
+            data=dict(self.article_data, title="Artigo renumerado"),
+        )
+        article_id = response.json["id"]
+
+        # um VACUUM pode renumerar os rowids de 'articles'
+        self.session.execute(
+            text("UPDATE articles SET rowid = rowid + 1000 WHERE id = :id"),
+            {"id": article_id},
+        )
+        self.session.commit()
+
+        results = self.search("renumerado")
+        self.assertEqual([r["id"] for r in results], [article_id])
+
+        self.client.delete(f"/article/{article_id}")
+        self.assertEqual(self.search("renumerado"), [])
+
+    def test_search_ignores_query_syntax(self):
+        self.assertEqual(self.search('"AND OR ('), [])
+
+    def test_search_after_author_deletion(self):
+        author = Author(
+            first_name="Autor",
+            last_name="Removido",
+            email="autor.removido@teste.com.br",
+            twitter_username="twitter_username",
+            avatar_url="avatar_url",
+        )
+        self.session.add(author)
+        self.session.commit()
+
+        response = self.client.post(
+            "/article",
+            data={
+                "title": "Artigo do autor removido",
+                "content": "<p>Paralelismo</p>",
+                "subtitle": "Subtítulo",
+                "author_id": author.id,
+            },
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(self.search("paralelismo")), 1)
+
+        # a remoção em cascata também retira os artigos do índice
+        self.client.delete(f"/author/{author.id}")
+        self.assertEqual(self.search("paralelismo"), [])
+
     def test_get_article(self):
         # cria artigo para ser utilizado nos testes
         article_data = {
@@ -200,6 +371,249 @@ class TestArticle(TestCase):
         self.session.delete(article)
         self.session.commit()
 
+    def test_put_article_single_update(self):
+        new_data = dict(
+            self.article_data,
+            id=self.article.id,
+            title="Título reindexado",
+            content="<p>Conteúdo reindexado</p>",
+        )
+        # o artigo criado diretamente na base ainda não está no índice
+        self.client.put("/article", data=new_data)
+
+        statements = []
+
+        def count_statement(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", count_statement)
+        try:
+            response = self.client.put("/article", data=new_data)
+        finally:
+            event.remove(engine, "before_cursor_execute", count_statement)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json["title"], "Título reindexado")
+        self.assertEqual(response.json["author"]["id"], self.author.id)
+        self.assertEqual(
+            response.json["author"]["first_name"], self.author.first_name
+        )
+        # artigo (com RETURNING), conteúdo e índice de busca
+        self.assertEqual(len(statements), 3)
+        self.assertIn("RETURNING", statements[0])
+
+        response = self.client.get("/articles/search?q=reindexado")
+        self.assertEqual(
+            [a["id"] for a in response.json["articles"]], [self.article.id]
+        )
+
+    def test_put_article_without_returning(self):
+        new_data = dict(
+            self.article_data, id=self.article.id, title="Sem RETURNING"
+        )
+
+        with patch.object(article_service, "use_returning", False):
+            response = self.client.put("/article", data=new_data)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json["title"], "Sem RETURNING")
+        self.assertEqual(
+            response.json["content"], self.article_data["content"]
+        )
+        self.assertEqual(response.json["author"]["id"], self.author.id)
+
+        with patch.object(article_service, "use_returning", False):
+            response = self.client.put(
+                "/article", data=dict(new_data, id="inexistente")
+            )
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_put_article_not_found(self):
+        new_data = dict(self.article_data, id="inexistente")
+
+        response = self.client.put("/article", data=new_data)
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(
+            response.json["message"], "Artigo não encontrado na base :/"
+        )
+
+    def test_put_article_conflicts(self):
+        other = Article(
+            title="Outro título",
+            subtitle="Outro subtítulo",
+            author_id=self.author.id,
+            content="Outro conteúdo",
+        )
+        self.session.add(other)
+        self.session.commit()
+
+        try:
+            response = self.client.put(
+                "/article",
+                data=dict(self.article_data, id=other.id, title="Teste"),
+            )
+            self.assertEqual(response.status_code, 409)
+
+            response = self.client.put(
+                "/article",
+                data=dict(
+                    self.article_data,
+                    id=other.id,
+                    title="Outro título",
+                    author_id=0,
+                ),
+            )
+            self.assertEqual(response.status_code, 409)
+            self.assertEqual(
+                response.json["message"], "Autor não encontrado :/"
+            )
+
+            # o artigo não foi alterado
+            response = self.client.get(f"/article/{other.id}")
+            self.assertEqual(response.json["title"], "Outro título")
+        finally:
+            self.session.delete(other)
+            self.session.commit()
+
+    def test_get_article_cache_invalidation(self):
+        url = f"/article/{self.article.id}"
+
+        # a segunda leitura é servida pelo cache
+        hits = article_details_cache.hits
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.assertEqual(article_details_cache.hits, hits + 1)
+
+        # a edição do artigo invalida a entrada do cache
+        new_data = dict(self.article_data, id=self.article.id)
+        new_data["title"] = "Título editado"
+        self.client.put("/article", data=new_data)
+        self.assertEqual(self.client.get(url).json["title"], "Título editado")
+
+        # a edição do autor invalida os artigos que embutem os seus dados
+        author_data = dict(self.author_data, id=self.author.id)
+        author_data["first_name"] = "Editado"
+        self.client.put("/author", data=author_data)
+        response = self.client.get(url)
+        self.assertEqual(response.json["author"]["first_name"], "Editado")
+
+        # a remoção do artigo invalida a entrada do cache
+        self.client.delete(url)
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_get_article_cache_across_workers(self):
+        url = f"/article/{self.article.id}"
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+        # as escritas atendidas por outro worker só invalidam o cache dele
+        other_worker = patch.object(cache, "article_details_cache", LRUCache())
+
+        new_data = dict(self.article_data, id=self.article.id)
+        new_data["title"] = "Editado em outro worker"
+        with other_worker:
+            self.client.put("/article", data=new_data)
+        response = self.client.get(url)
+        self.assertEqual(response.json["title"], "Editado em outro worker")
+
+        # o acerto seguinte continua válido
+        hits = article_details_cache.hits
+        self.assertEqual(self.client.get(url).json, response.json)
+        self.assertEqual(article_details_cache.hits, hits + 1)
+
+        author_data = dict(self.author_data, id=self.author.id)
+        author_data["first_name"] = "Editado"
+        with other_worker:
+            self.client.put("/author", data=author_data)
+        response = self.client.get(url)
+        self.assertEqual(response.json["author"]["first_name"], "Editado")
+
+        with other_worker:
+            self.client.delete(url)
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_get_article_conditional(self):
+        url = f"/article/{self.article.id}"
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        self.assertIsNotNone(etag)
+        self.assertIsNotNone(last_modified)
+
+        # o cliente que já possui a versão atual recebe apenas um 304
+        response = self.client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b"")
+
+        response = self.client.get(
+            url, headers={"If-Modified-Since": last_modified}
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_edit_article_changes_validators(self):
+        url = f"/article/{self.article.id}"
+        etag = self.client.get(url).headers["ETag"]
+        created_at = self.article.created_at
+        updated_at = self.article.updated_at
+
+        # a edição apenas do conteúdo também altera a data de modificação
+        new_data = dict(self.article_data, id=self.article.id)
+        new_data["content"] = "Conteúdo editado"
+        self.client.put("/article", data=new_data)
+
+        response = self.client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers["ETag"], etag)
+
+        self.session.refresh(self.article)
+        self.assertEqual(self.article.created_at, created_at)
+        self.assertGreater(self.article.updated_at, updated_at)
+
+    def test_listings_ignore_if_modified_since(self):
+        # a inclusão e a remoção de artigos não alteram o updated_at das
+        # linhas já listadas, então as listagens não enviam Last-Modified
+        since = {"If-Modified-Since": http_date(datetime.now(timezone.utc))}
+
+        for url in ("/articles", "/authors", f"/author/{self.author.id}"):
+            response = self.client.get(url)
+            self.assertIsNone(response.headers.get("Last-Modified"))
+
+        article_data = dict(self.article_data, title="Outro artigo")
+        response = self.client.post("/article", data=article_data)
+        article_id = response.json["id"]
+
+        response = self.client.get("/authors", headers=since)
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(f"/author/{self.author.id}", headers=since)
+        self.assertEqual(response.status_code, 200)
+
+        self.client.delete(f"/article/{article_id}")
+
+        response = self.client.get("/articles", headers=since)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn(
+            article_id, [a["id"] for a in response.json["articles"]]
+        )
+
+    def test_created_at_is_set_on_insert(self):
+        article = Article(
+            title="Artigo com data",
+            content="Conteúdo",
+            subtitle="Subtítulo",
+            author_id=self.author.id,
+        )
+        self.session.add(article)
+        self.session.commit()
+
+        # a data é a da inserção, e não a da importação do módulo
+        self.assertGreater(article.created_at, self.article.created_at)
+
+        self.session.delete(article)
+        self.session.commit()
+
     def test_delete_article(self):
         # faz requisição DELETE para remover o artigo criado no método setUp
         response = self.client.delete(f"/article/{self.article.id}")
@@ -219,3 +633,181 @@ class TestArticle(TestCase):
             self.session.query(Article).filter_by(id=self.article.id).first()
         )
         self.assertIsNone(deleted_article)
+
+        # verifica se o conteúdo do artigo também foi removido
+        deleted_body = (
+            self.session.query(ArticleBody)
+            .filter_by(article_id=self.article.id)
+            .first()
+        )
+        self.assertIsNone(deleted_body)
+
+    def bulk_item(self, title, **fields):
+        return dict(
+            {
+                "title": title,
+                "subtitle": "Subtítulo importado",
+                "author_id": self.author.id,
+                "content": "<p>Conteúdo importado</p>",
+            },
+            **fields,
+        )
+
+    def delete_articles(self, ids):
+        self.session.query(Article).filter(Article.id.in_(ids)).delete(
+            synchronize_session=False
+        )
+        self.session.commit()
+
+    def test_post_articles_bulk(self):
+        items = [
+            self.bulk_item("Importado um"),
+            self.bulk_item("Importado dois"),
+            # título já cadastrado e repetido no próprio lote
+            self.bulk_item(self.article.title),
+            self.bulk_item("Importado um"),
+            self.bulk_item("Sem autor", author_id=999999),
+            self.bulk_item("Autor inválido", author_id="abc"),
+        ]
+
+        response = self.client.post("/articles/bulk", json=items)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json["created"], 2)
+        self.assertEqual(response.json["failed"], 4)
+        results = response.json["results"]
+        self.assertEqual([r["index"] for r in results], list(range(6)))
+        self.assertEqual(
+            [r["status"] for r in results],
+            ["created", "created"] + ["conflict"] * 3 + ["invalid"],
+        )
+        self.assertEqual(results[4]["message"], "Autor não encontrado :/")
+
+        created = [r["id"] for r in results[:2]]
+        try:
+            # os artigos importados têm conteúdo e estão no índice de busca
+            response = self.client.get(f"/article/{created[0]}")
+            self.assertEqual(
+                response.json["content"], "<p>Conteúdo importado</p>"
+            )
+            self.assertEqual(len(self.search("importado")), 2)
+        finally:
+            self.delete_articles(created)
+
+    def test_post_articles_bulk_author_removed(self):
+        items = [
+            self.bulk_item("Lote concorrente"),
+            self.bulk_item("Autor removido", author_id=999999),
+        ]
+        # o autor inexistente passa pela verificação do lote, como um autor
+        # removido entre a verificação e a inserção
+        known_authors = {self.author.id, 999999}
+        writer = Mock(wraps=article_service.writer)
+
+        with patch.object(article_service, "writer", writer):
+            results = article_service.import_batch(
+                list(enumerate(items)), known_authors
+            )
+
+        self.assertEqual(
+            [r["status"] for r in results], ["created", "conflict"]
+        )
+        self.assertEqual(results[1]["message"], "Autor não encontrado :/")
+        # o lote e a nova tentativa de cada item passam pelo writer
+        self.assertEqual(writer.run.call_count, 3)
+        self.delete_articles([results[0]["id"]])
+
+    def test_post_articles_bulk_ndjson(self):
+        lines = [
+            '{"title": "NDJSON um", "subtitle": "s", "author_id": %d, '
+            '"content": "c"}' % self.author.id,
+            "",
+            "{invalido",
+        ]
+
+        response = self.client.post(
+            "/articles/bulk",
+            data="\n".join(lines),
+            content_type="application/x-ndjson",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        statuses = [r["status"] for r in response.json["results"]]
+        self.assertEqual(statuses, ["created", "invalid"])
+        self.delete_articles([response.json["results"][0]["id"]])
+
+    def test_post_articles_bulk_requires_list(self):
+        response = self.client.post("/articles/bulk", json={"title": "x"})
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_post_articles_lookup(self):
+        other = Article(
+            title="Relacionado",
+            subtitle="Subtítulo relacionado",
+            author_id=self.author.id,
+            content="Conteúdo relacionado",
+        )
+        self.session.add(other)
+        self.session.commit()
+        ids = [other.id, self.article.id]
+
+        statements = []
+
+        def count_statement(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", count_statement)
+        try:
+            response = self.client.post(
+                "/articles/lookup",
+                json={"id": [ids[0], "inexistente", ids[1]]},
+            )
+        finally:
+            event.remove(engine, "before_cursor_execute", count_statement)
+
+        try:
+            self.assertEqual(response.status_code, 200)
+            # os artigos seguem a ordem dos ids, com autor e conteúdo
+            articles = response.json["articles"]
+            self.assertEqual([a["id"] for a in articles], ids)
+            self.assertEqual(articles[0]["content"], "Conteúdo relacionado")
+            self.assertEqual(articles[1]["author"]["id"], self.author.id)
+            self.assertEqual(response.json["not_found"], ["inexistente"])
+            self.assertEqual(len(statements), 1)
+        finally:
+            self.session.delete(other)
+            self.session.commit()
+
+    def test_delete_articles(self):
+        other = Article(
+            title="Removido em lote",
+            subtitle="Subtítulo",
+            author_id=self.author.id,
+            content="Conteúdo",
+        )
+        self.session.add(other)
+        self.session.commit()
+        other_id = other.id
+
+        # o artigo em cache deixa de ser servido após a remoção
+        self.client.get(f"/article/{other_id}")
+
+        response = self.client.delete(
+            "/articles", json={"id": [other_id, "inexistente", other_id]}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json["deleted"], [other_id])
+        self.assertEqual(response.json["not_found"], ["inexistente"])
+        self.assertIsNone(
+            self.session.query(ArticleBody)
+            .filter_by(article_id=other_id)
+            .first()
+        )
+        response = self.client.get(f"/article/{other_id}")
+        self.assertEqual(response.status_code, 404)
+
+        response = self.client.delete("/articles", json={"id": [other_id]})
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json["not_found"], [other_id])
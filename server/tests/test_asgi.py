@@ -0,0 +1,178 @@
+import asyncio
+import contextvars
+
+import pytest
+from flask import Flask, Response, request
+from sqlalchemy import create_engine
+
+from models import Author, Base, Session, current_bind
+from schemas import AuthorSearchSchema
+from services import return_author_by_id
+from shared.utils.asgi import WSGIAdapter
+
+
+def call(app, method, path, body_chunks=(), headers=()):
+    """Envia uma requisição HTTP à aplicação ASGI e coleta a resposta."""
+    scope = {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "query_string": b"",
+        "headers": [(k.encode(), v.encode()) for k, v in headers],
+    }
+    pending = [
+        {"type": "http.request", "body": chunk, "more_body": True}
+        for chunk in body_chunks
+    ] + [{"type": "http.request", "body": b"", "more_body": False}]
+    sent = []
+
+    async def receive():
+        return pending.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    return sent
+
+
+@pytest.fixture
+def flask_app():
+    app = Flask(__name__)
+
+    @app.post("/echo")
+    def echo():
+        return {"form": request.form.to_dict()}
+
+    @app.get("/stream")
+    def stream():
+        return Response(iter([b"a", b"", b"b"]), mimetype="text/plain")
+
+    return app
+
+
+def test_adapter_reads_body_in_chunks(flask_app):
+    sent = call(
+        WSGIAdapter(flask_app),
+        "POST",
+        "/echo",
+        [b"title=Ol%C3%A1&", b"author_id=1"],
+        [("Content-Type", "application/x-www-form-urlencoded")],
+    )
+
+    assert sent[0]["status"] == 200
+    assert (b"content-type", b"application/json") in sent[0]["headers"]
+    body = b"".join(m.get("body", b"") for m in sent[1:])
+    assert body == b'{"form":{"author_id":"1","title":"Ol\\u00e1"}}\n'
+
+
+def test_adapter_streams_response(flask_app):
+    sent = call(WSGIAdapter(flask_app), "GET", "/stream")
+
+    assert [m["type"] for m in sent] == [
+        "http.response.start",
+        "http.response.body",
+        "http.response.body",
+        "http.response.body",
+    ]
+    assert [m["body"] for m in sent[1:]] == [b"a", b"b", b""]
+    assert sent[-1].get("more_body", False) is False
+
+
+def test_adapter_lifespan():
+    events = []
+
+    async def startup():
+        events.append("startup")
+
+    async def shutdown():
+        events.append("shutdown")
+
+    messages = [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message["type"])
+
+    adapter = WSGIAdapter(None, on_startup=startup, on_shutdown=shutdown)
+    asyncio.run(adapter({"type": "lifespan"}, receive, send))
+
+    assert events == ["startup", "shutdown"]
+    assert sent == ["lifespan.startup.complete", "lifespan.shutdown.complete"]
+
+
+@pytest.fixture
+def other_database(tmp_path):
+    engine = create_engine("sqlite:///%s" % (tmp_path / "other.sqlite3"))
+    Base.metadata.create_all(engine)
+
+    with Session(bind=engine) as session:
+        session.add(
+            Author(
+                first_name="Outro",
+                last_name="Banco",
+                email="outro@example.com",
+                twitter_username="outro",
+                avatar_url="https://example.com/outro.png",
+            )
+        )
+        session.commit()
+
+    yield engine
+
+    engine.dispose()
+
+
+def test_sessions_use_the_context_bind(other_database):
+    def lookup():
+        current_bind.set(other_database)
+        return return_author_by_id(AuthorSearchSchema(id=1))
+
+    # apenas o contexto em que a engine foi definida é afetado
+    details, status = contextvars.copy_context().run(lookup)
+
+    assert status == 200
+    assert details["first_name"] == "Outro"
+    assert current_bind.get() is None
+
+
+def test_services_on_async_engine(other_database):
+    pytest.importorskip("aiosqlite")
+    from sqlalchemy.util import greenlet_spawn
+
+    from models.aio import bind_async_engine, create_aio_engine
+
+    async_engine = create_aio_engine(str(other_database.url))
+
+    def lookup():
+        bind_async_engine(async_engine)
+        return return_author_by_id(AuthorSearchSchema(id=1))
+
+    async def main():
+        try:
+            return await greenlet_spawn(lookup)
+        finally:
+            await async_engine.dispose()
+
+    details, status = asyncio.run(main())
+
+    assert status == 200
+    assert details["first_name"] == "Outro"
+
+
+def test_async_pool_fits_sqlite_single_writer(monkeypatch, tmp_path):
+    from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+    from models.aio import get_async_engine_options
+
+    url = "sqlite:///%s" % (tmp_path / "aio.sqlite3")
+    options = get_async_engine_options(url)
+
+    assert options["poolclass"] is AsyncAdaptedQueuePool
+    assert (options["pool_size"], options["max_overflow"]) == (4, 0)
+
+    monkeypatch.setenv("DB_ASYNC_POOL_SIZE", "8")
+    assert get_async_engine_options(url)["pool_size"] == 8
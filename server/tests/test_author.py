@@ -1,9 +1,11 @@
 from flask import Flask
 from flask_testing import TestCase
+from unittest.mock import patch
 import os
 
 from routes import author_bp
 from models import Author, Session
+from services import author as author_service
 
 # from routes.schemas import AuthorSchema
 
@@ -59,6 +61,74 @@ class TestAuthor(TestCase):
         assert isinstance(response.json, dict)
         assert "authors" in response.json
 
+    def test_get_authors_paginated(self):
+        # cria autores extras para preencher mais de uma página
+        authors = [
+            Author(
+                first_name="Paginado",
+                last_name=str(i),
+                email=f"paginado{i}@teste.com.br",
+                twitter_username="paginado",
+                avatar_url="avatar_url",
+            )
+            for i in range(3)
+        ]
+        self.session.add_all(authors)
+        self.session.commit()
+        expected_ids = {self.author.id} | {a.id for a in authors}
+
+        response = self.client.get("/authors?limit=2")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json["authors"]), 2)
+
+        # percorre a listagem seguindo o cursor de cada página
+        ids = [author["id"] for author in response.json["authors"]]
+        cursor = response.json["next_cursor"]
+        while cursor:
+            response = self.client.get(
+                "/authors", query_string={"limit": 2, "cursor": cursor}
+            )
+            ids += [author["id"] for author in response.json["authors"]]
+            cursor = response.json["next_cursor"]
+
+        self.assertEqual(len(ids), len(set(ids)))
+        self.assertTrue(expected_ids.issubset(ids))
+
+        for author in authors:
+            self.session.delete(author)
+        self.session.commit()
+
+    def test_get_authors_conditional(self):
+        response = self.client.get("/authors")
+        etag = response.headers["ETag"]
+
+        response = self.client.get(
+            "/authors", headers={"If-None-Match": etag}
+        )
+        self.assertEqual(response.status_code, 304)
+
+        # a edição de um autor altera a listagem
+        author_data = dict(self.author_data, id=self.author.id)
+        author_data["first_name"] = "Editado"
+        self.client.put("/author", data=author_data)
+
+        response = self.client.get(
+            "/authors", headers={"If-None-Match": etag}
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_get_author_conditional(self):
+        url = f"/author/{self.author.id}"
+        etag = self.client.get(url).headers["ETag"]
+
+        response = self.client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+
+        # o 404 não recebe ETag
+        response = self.client.get("/author/4564645")
+        self.assertEqual(response.status_code, 404)
+        self.assertIsNone(response.headers.get("ETag"))
+
     def test_add_author(self):
         with self.client:
             # define dados do autor a ser adicionado
@@ -186,28 +256,61 @@ class TestAuthor(TestCase):
                 response.json["avatar_url"], author_data["avatar_url"]
             )
 
+    def test_edit_author_not_found(self):
+        author_data = {
+            "id": 0,
+            "first_name": "Novo",
+            "last_name": "Autor",
+            "email": "inexistente@teste.com.br",
+        }
+
+        for use_returning in (True, False):
+            with patch.object(author_service, "use_returning", use_returning):
+                response = self.client.put("/author", data=author_data)
+
+            self.assertEqual(response.status_code, 404)
+
+    def test_edit_author_without_returning(self):
+        author_data = {
+            "id": self.author.id,
+            "first_name": "Sem",
+            "last_name": "Returning",
+            "email": self.author.email,
+        }
+
+        with patch.object(author_service, "use_returning", False):
+            response = self.client.put("/author", data=author_data)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json["id"], self.author.id)
+        self.assertEqual(response.json["first_name"], "Sem")
+        self.assertEqual(response.json["last_name"], "Returning")
+
     def test_delete_author_by_id(self):
         with self.client:
             # faz requisição DELETE para um id válido
             response = self.client.delete("/author/{}".format(self.author.id))
 
-            # verifica se a resposta é 200
-            self.assertEqual(response.status_code, 200)
-
-            # verifica se a mensagem de confirmação foi retornada corretamente
-            expected_response = {
-                "message": "Autor e seus artigos excluídos com sucesso",
-                "id": self.author.id,
-            }
+            # verifica se a remoção foi iniciada (e, nos testes, concluída)
+            self.assertEqual(response.status_code, 202)
             self.assertEqual(
-                response.json["message"], expected_response["message"]
+                response.json["message"],
+                "Remoção do autor e dos seus artigos iniciada",
             )
             self.assertEqual(response.json["id"], self.author.id)
 
-            # TODO: verifica se o autor foi removido da base
+            deletion_url = response.headers["Location"]
+            response = self.client.get(deletion_url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json["author_id"], self.author.id)
+            self.assertEqual(response.json["status"], "done")
+
             # verifica se o autor foi removido da base
-            # authors = self.session.query(Author).all()
-            # self.assertEqual(len(authors), 0)
+            self.assertIsNone(
+                self.session.query(Author)
+                .filter_by(id=self.author.id)
+                .first()
+            )
 
             # faz requisição DELETE para um id inválido
             response = self.client.delete("/author/{}".format(4564645))
@@ -0,0 +1,254 @@
+from flask import Flask
+from flask_testing import TestCase
+from sqlalchemy import event
+from unittest.mock import patch
+
+from routes import author_bp, article_bp
+from models import Author, AuthorDeletion, Session, engine
+from services import article as article_service
+from services import author_deletion
+from services.cache import article_details_cache
+
+
+class TestAuthorDeletion(TestCase):
+    def create_app(self):
+        app = Flask(__name__)
+
+        app.register_blueprint(article_bp)
+        app.register_blueprint(author_bp)
+
+        return app
+
+    def setUp(self):
+        self.app.config["TESTING"] = True
+        self.session = Session()
+        article_details_cache.clear()
+
+        self.author = Author(
+            first_name="Autor",
+            last_name="Prolífico",
+            email="autor.prolifico@teste.com.br",
+            twitter_username="twitter_username",
+            avatar_url="avatar_url",
+        )
+        self.session.add(self.author)
+        self.session.commit()
+        self.author_id = self.author.id
+
+        self.article_ids = []
+        for i in range(5):
+            response = self.client.post(
+                "/article",
+                data={
+                    "title": f"Concorrência {i}",
+                    "content": "<p>Escritores bloqueados</p>",
+                    "subtitle": "Subtítulo",
+                    "author_id": self.author_id,
+                },
+            )
+            self.article_ids.append(response.json["id"])
+
+    def tearDown(self):
+        author = (
+            self.session.query(Author).filter_by(id=self.author_id).first()
+        )
+
+        if author:
+            self.session.delete(author)
+
+        self.session.query(AuthorDeletion).delete()
+        self.session.commit()
+        self.session.close()
+
+    def search(self, terms):
+        response = self.client.get(
+            "/articles/search", query_string={"q": terms}
+        )
+        return response.json["articles"]
+
+    def test_deletes_articles_in_chunks(self):
+        deletes = []
+
+        def count_delete(conn, cursor, statement, *args):
+            if statement.startswith("DELETE FROM articles "):
+                deletes.append(statement)
+
+        event.listen(engine, "before_cursor_execute", count_delete)
+        try:
+            with patch.object(author_deletion, "CHUNK_SIZE", 2):
+                response = self.client.delete(f"/author/{self.author_id}")
+        finally:
+            event.remove(engine, "before_cursor_execute", count_delete)
+
+        self.assertEqual(response.status_code, 202)
+        # cinco artigos em lotes de dois
+        self.assertEqual(len(deletes), 3)
+
+        response = self.client.get(response.headers["Location"])
+        self.assertEqual(response.json["status"], "done")
+        self.assertEqual(response.json["articles_total"], 5)
+        self.assertEqual(response.json["articles_deleted"], 5)
+        self.assertIsNotNone(response.json["finished_at"])
+
+        self.assertEqual(self.search("bloqueados"), [])
+        response = self.client.get(f"/article/{self.article_ids[0]}")
+        self.assertEqual(response.status_code, 404)
+        response = self.client.delete(f"/author/{self.author_id}")
+        self.assertEqual(response.status_code, 404)
+
+    def test_author_hidden_while_deleting(self):
+        # o artigo em cache também deixa de ser exibido
+        self.client.get(f"/article/{self.article_ids[0]}")
+
+        with patch.object(author_deletion, "spawn_author_deletion"):
+            response = self.client.delete(f"/author/{self.author_id}")
+            deletion = response.json["deletion"]
+            self.assertEqual(deletion["status"], "pending")
+
+            # uma nova remoção retorna a que está em andamento
+            response = self.client.delete(f"/author/{self.author_id}")
+            self.assertEqual(response.json["deletion"]["id"], deletion["id"])
+
+        response = self.client.get(f"/author/{self.author_id}")
+        self.assertEqual(response.status_code, 404)
+        authors = self.client.get("/authors").json["authors"]
+        self.assertNotIn(self.author_id, [a["id"] for a in authors])
+        response = self.client.put(
+            "/author",
+            data={
+                "id": self.author_id,
+                "first_name": "Editado",
+                "last_name": "Autor",
+                "email": "autor.prolifico@teste.com.br",
+            },
+        )
+        self.assertEqual(response.status_code, 404)
+
+        articles = self.client.get("/articles").json["articles"]
+        listed = {a["id"] for a in articles}
+        self.assertFalse(listed & set(self.article_ids))
+        response = self.client.get(f"/article/{self.article_ids[0]}")
+        self.assertEqual(response.status_code, 404)
+        response = self.client.post(
+            "/articles/lookup", json={"id": self.article_ids}
+        )
+        self.assertEqual(response.json["not_found"], self.article_ids)
+        self.assertEqual(self.search("bloqueados"), [])
+
+        # os artigos continuam na base até a remoção ser executada
+        self.assertEqual(author_deletion.resume_author_deletions(), 1)
+
+        response = self.client.get(f"/author/deletion/{deletion['id']}")
+        self.assertEqual(response.json["status"], "done")
+        self.assertEqual(response.json["articles_deleted"], 5)
+        self.assertEqual(author_deletion.resume_author_deletions(), 0)
+
+    def test_articles_rejected_while_deleting(self):
+        other = Author(
+            first_name="Outro",
+            last_name="Autor",
+            email="outro.autor@teste.com.br",
+            twitter_username="twitter_username",
+            avatar_url="avatar_url",
+        )
+        self.session.add(other)
+        self.session.commit()
+        article = {
+            "title": "Artigo do outro autor",
+            "content": "<p>Conteúdo</p>",
+            "subtitle": "Subtítulo",
+            "author_id": other.id,
+        }
+        article_id = self.client.post("/article", data=article).json["id"]
+
+        try:
+            with patch.object(author_deletion, "spawn_author_deletion"):
+                self.client.delete(f"/author/{self.author_id}")
+
+            # nenhum artigo é criado ou movido para o autor em remoção
+            response = self.client.post(
+                "/article",
+                data=dict(article, title="Novo", author_id=self.author_id),
+            )
+            self.assertEqual(response.status_code, 409)
+            self.assertEqual(response.json["message"], "Autor em remoção :/")
+
+            response = self.client.put(
+                "/article",
+                data=dict(article, id=article_id, author_id=self.author_id),
+            )
+            self.assertEqual(response.status_code, 409)
+            self.assertEqual(response.json["message"], "Autor em remoção :/")
+
+            self.assertEqual(author_deletion.resume_author_deletions(), 1)
+            response = self.client.get(f"/article/{article_id}")
+            self.assertEqual(response.json["author"]["id"], other.id)
+        finally:
+            self.session.delete(other)
+            self.session.commit()
+
+    def test_articles_not_moved_out_while_deleting(self):
+        other = Author(
+            first_name="Outro",
+            last_name="Autor",
+            email="outro.autor@teste.com.br",
+            twitter_username="twitter_username",
+            avatar_url="avatar_url",
+        )
+        self.session.add(other)
+        self.session.commit()
+        moved = {
+            "title": "Concorrência 0",
+            "content": "<p>Escritores bloqueados</p>",
+            "subtitle": "Subtítulo",
+            "author_id": other.id,
+        }
+
+        try:
+            with patch.object(author_deletion, "spawn_author_deletion"):
+                self.client.delete(f"/author/{self.author_id}")
+
+            # o artigo oculto não escapa da remoção ao trocar de autor
+            for use_returning in (True, False):
+                with patch.object(
+                    article_service, "use_returning", use_returning
+                ):
+                    response = self.client.put(
+                        "/article", data=dict(moved, id=self.article_ids[0])
+                    )
+                self.assertEqual(response.status_code, 404)
+
+            self.assertEqual(author_deletion.resume_author_deletions(), 1)
+            response = self.client.get(f"/article/{self.article_ids[0]}")
+            self.assertEqual(response.status_code, 404)
+        finally:
+            self.session.delete(other)
+            self.session.commit()
+
+    def test_failed_deletion_restarts(self):
+        with patch.object(
+            author_deletion.AUTHOR_DELETION_ARTICLES,
+            "inc",
+            side_effect=RuntimeError("falha"),
+        ):
+            response = self.client.delete(f"/author/{self.author_id}")
+
+        response = self.client.get(response.headers["Location"])
+        self.assertEqual(response.json["status"], "failed")
+        self.assertEqual(response.json["error"], "falha")
+
+        # o autor continua oculto, e uma nova remoção retoma a anterior
+        response = self.client.get(f"/author/{self.author_id}")
+        self.assertEqual(response.status_code, 404)
+
+        response = self.client.delete(f"/author/{self.author_id}")
+        self.assertEqual(response.status_code, 202)
+        deletion = response.json["deletion"]
+
+        response = self.client.get(f"/author/deletion/{deletion['id']}")
+        self.assertEqual(response.json["status"], "done")
+        self.assertEqual(response.json["articles_deleted"], 5)
+
+    def test_get_deletion_not_found(self):
+        response = self.client.get("/author/deletion/999")
+        self.assertEqual(response.status_code, 404)
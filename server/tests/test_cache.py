@@ -0,0 +1,73 @@
+import time
+
+from shared.utils import LRUCache
+
+
+def test_lru_eviction():
+    cache = LRUCache(maxsize=2, ttl=0)
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    # "a" passa a ser a entrada mais recente
+    assert cache.get("a") == 1
+
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_expiration():
+    cache = LRUCache(maxsize=10, ttl=0.01)
+    cache.set("a", 1)
+
+    time.sleep(0.02)
+
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_hit_ratio():
+    cache = LRUCache(maxsize=10, ttl=0)
+    cache.set("a", 1)
+
+    cache.get("a")
+    cache.get("a")
+    cache.get("b")
+
+    stats = cache.stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+    assert stats["hit_ratio"] == 2 / 3
+
+
+def test_stale_value_is_not_stored_after_invalidation():
+    cache = LRUCache(maxsize=10, ttl=0)
+
+    token = cache.token()
+    # uma edição concorrente invalida a chave durante a leitura
+    cache.delete("a")
+    cache.set("a", "valor antigo", token)
+
+    assert cache.get("a") is None
+
+
+def test_delete_matching():
+    cache = LRUCache(maxsize=10, ttl=0)
+    cache.set("a", {"author_id": 1})
+    cache.set("b", {"author_id": 2})
+
+    removed = cache.delete_matching(lambda value: value["author_id"] == 1)
+
+    assert removed == 1
+    assert cache.get("a") is None
+    assert cache.get("b") == {"author_id": 2}
+
+
+def test_disabled_cache():
+    cache = LRUCache(maxsize=0)
+    cache.set("a", 1)
+
+    assert cache.get("a") is None
@@ -0,0 +1,82 @@
+import gzip
+import json
+
+import pytest
+
+from models import Article, Author, Session
+from routes import compression
+
+GZIP = {"Accept-Encoding": "gzip"}
+
+
+@pytest.fixture
+def article():
+    with Session() as session:
+        author = Author(
+            first_name="Autor",
+            last_name="Comprimido",
+            email="autor.comprimido@teste.com.br",
+            twitter_username="comprimido",
+            avatar_url="avatar_url",
+        )
+        session.add(author)
+        session.flush()
+        article = Article(
+            title="Artigo comprimido",
+            subtitle="Subtítulo comprimido",
+            author_id=author.id,
+            content="<p>Conteúdo do artigo comprimido.</p>" * 200,
+        )
+        session.add(article)
+        session.commit()
+
+        yield article.id
+
+        session.delete(author)
+        session.commit()
+
+
+def test_article_is_compressed(test_client, article):
+    plain = test_client.get(f"/article/{article}")
+    response = test_client.get(f"/article/{article}", headers=GZIP)
+
+    assert "Content-Encoding" not in plain.headers
+    assert "Accept-Encoding" in plain.headers["Vary"]
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert len(response.data) < len(plain.data) / 5
+    assert gzip.decompress(response.data) == plain.data
+    # o ETag passa a ser fraco, com o mesmo valor
+    assert response.headers["ETag"] == "W/" + plain.headers["ETag"]
+
+
+def test_compressed_body_is_cached_by_etag(test_client, article, monkeypatch):
+    first = test_client.get(f"/article/{article}", headers=GZIP)
+
+    calls = []
+    monkeypatch.setattr(
+        compression, "compress", lambda *args: calls.append(args)
+    )
+    second = test_client.get(f"/article/{article}", headers=GZIP)
+
+    assert calls == []
+    assert second.data == first.data
+
+
+def test_compressed_article_is_revalidated(test_client, article):
+    response = test_client.get(f"/article/{article}", headers=GZIP)
+    revalidation = test_client.get(
+        f"/article/{article}",
+        headers={**GZIP, "If-None-Match": response.headers["ETag"]},
+    )
+
+    assert revalidation.status_code == 304
+    assert revalidation.headers["ETag"] == response.headers["ETag"]
+
+
+def test_small_responses_are_not_compressed(test_client, article):
+    response = test_client.get("/authors?limit=1", headers=GZIP)
+
+    assert response.status_code == 200
+    assert len(response.data) < compression.MIN_SIZE
+    assert "Content-Encoding" not in response.headers
+    assert json.loads(response.data)["authors"]
@@ -0,0 +1,149 @@
+import os
+import subprocess
+import sys
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import sessionmaker
+
+from models import Base, PoolStats, get_engine_options, watch_pool
+from models.migrations import (
+    is_schema_current,
+    mark_schema_version,
+    schema_version,
+)
+from models.search import create_search_index, search
+from models.sqlite import get_sqlite_pragmas
+
+
+def test_memory_database_keeps_default_pool():
+    options = get_engine_options("sqlite:///:memory:")
+
+    assert "poolclass" not in options
+    assert "pool_size" not in options
+
+
+def test_file_database_uses_configured_pool(monkeypatch):
+    monkeypatch.setenv("DB_POOL_SIZE", "3")
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "2")
+    monkeypatch.setenv("DB_POOL_RECYCLE", "600")
+    monkeypatch.setenv("DB_POOL_PRE_PING", "false")
+
+    options = get_engine_options("sqlite:///database/db.sqlite3")
+
+    assert options["pool_size"] == 3
+    assert options["max_overflow"] == 2
+    assert options["pool_recycle"] == 600
+    assert options["pool_pre_ping"] is False
+    assert options["connect_args"] == {"check_same_thread": False}
+
+
+def test_session_context_returns_connection_to_pool(tmp_path):
+    url = "sqlite:///%s" % (tmp_path / "pool.sqlite3")
+    engine = create_engine(url, **get_engine_options(url))
+    stats = watch_pool(engine, PoolStats())
+    LocalSession = sessionmaker(bind=engine)
+
+    for _ in range(3):
+        with LocalSession() as session:
+            session.execute("SELECT 1")
+
+    # a mesma conexão é reaproveitada entre as sessões
+    assert stats.connects == 1
+    assert stats.checkouts == 3
+    assert stats.checked_out == 0
+
+    engine.dispose()
+
+
+def test_production_sqlite_profile(monkeypatch):
+    monkeypatch.delenv("DB_SQLITE_PROFILE", raising=False)
+
+    pragmas = get_sqlite_pragmas()
+
+    assert pragmas["foreign_keys"] == "ON"
+    assert pragmas["journal_mode"] == "WAL"
+    assert pragmas["synchronous"] == "NORMAL"
+    assert pragmas["temp_store"] == "MEMORY"
+
+
+def test_sqlite_pragma_overrides(monkeypatch):
+    monkeypatch.setenv("DB_SQLITE_PROFILE", "default")
+    monkeypatch.setenv("DB_SQLITE_BUSY_TIMEOUT", "250")
+    monkeypatch.setenv("DB_SQLITE_JOURNAL_MODE", "wal")
+
+    pragmas = get_sqlite_pragmas()
+
+    assert pragmas == {
+        "foreign_keys": "ON",
+        "busy_timeout": "250",
+        "journal_mode": "WAL",
+    }
+
+
+def test_sqlite_pragma_rejects_invalid_values(monkeypatch):
+    monkeypatch.setenv("DB_SQLITE_SYNCHRONOUS", "NORMAL; DROP TABLE x")
+
+    with pytest.raises(ValueError):
+        get_sqlite_pragmas()
+
+
+def test_import_has_no_side_effects(tmp_path):
+    # um interpretador novo importa a aplicação sem criar logs nem banco
+    env = dict(
+        os.environ,
+        DB_URL="sqlite:///%s" % (tmp_path / "database" / "db.sqlite3"),
+        LOG_PATH=str(tmp_path / "log"),
+    )
+    subprocess.run(
+        [sys.executable, "-c", "import app, logger, models"],
+        cwd=os.path.dirname(os.path.dirname(__file__)),
+        env=env,
+        check=True,
+    )
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_schema_marker_skips_create_all(tmp_path):
+    engine = create_engine("sqlite:///%s" % (tmp_path / "marker.sqlite3"))
+    version = schema_version()
+
+    assert version == schema_version()
+    assert not is_schema_current(engine, version)
+
+    Base.metadata.create_all(engine)
+    mark_schema_version(engine, version)
+
+    assert is_schema_current(engine, version)
+    assert not is_schema_current(engine, version + 1)
+
+
+def test_search_index_replaces_rowid_index(tmp_path):
+    engine = create_engine("sqlite:///%s" % (tmp_path / "search.sqlite3"))
+    Base.metadata.create_all(engine)
+
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "INSERT INTO authors (pk_author, first_name, last_name, "
+                "email, twitter_username, avatar_url) "
+                "VALUES (1, 'A', 'B', 'a@b.com', 'ab', 'ab.png')"
+            )
+        )
+        connection.execute(
+            text(
+                "INSERT INTO articles (id, title, subtitle, author_id) "
+                "VALUES ('a1', 'Índice antigo', 'Subtítulo', 1)"
+            )
+        )
+        # índice das versões anteriores, com a chave no rowid do artigo
+        connection.execute(
+            text("CREATE VIRTUAL TABLE articles_fts USING fts5(title)")
+        )
+
+    create_search_index(engine)
+
+    assert inspect(engine).has_table("article_search_ids")
+    with sessionmaker(bind=engine)() as session:
+        assert [row.id for row in search(session, "indice", 10)] == ["a1"]
@@ -0,0 +1,63 @@
+import gzip
+import json
+
+import pytest
+
+from models import Article, Author, Session
+
+
+@pytest.fixture
+def articles():
+    with Session() as session:
+        author = Author(
+            first_name="Autor",
+            last_name="Exportado",
+            email="autor.exportado@teste.com.br",
+            twitter_username="exportado",
+            avatar_url="avatar_url",
+        )
+        session.add(author)
+        session.flush()
+        session.add_all(
+            Article(
+                title=f"Exportado {i}",
+                subtitle="Subtítulo exportado",
+                author_id=author.id,
+                content=f"<p>Conteúdo {i}</p>",
+            )
+            for i in range(3)
+        )
+        session.commit()
+
+        yield author.id
+
+        session.delete(author)
+        session.commit()
+
+
+def exported(data):
+    return [json.loads(line) for line in data.decode().splitlines()]
+
+
+def test_export_articles(test_client, articles):
+    response = test_client.get("/articles/export")
+
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    assert "Content-Encoding" not in response.headers
+
+    lines = [a for a in exported(response.data) if a["author_id"] == articles]
+    assert [a["content"] for a in lines] == [
+        f"<p>Conteúdo {i}</p>" for i in range(3)
+    ]
+    assert lines[0]["author"]["last_name"] == "Exportado"
+
+
+def test_export_articles_gzip(test_client, articles):
+    plain = test_client.get("/articles/export").data
+    response = test_client.get(
+        "/articles/export", headers={"Accept-Encoding": "gzip"}
+    )
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(response.data) == plain
@@ -0,0 +1,35 @@
+import multiprocessing
+import os
+import runpy
+from unittest.mock import Mock
+
+import logger
+import models
+
+CONFIG = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "gunicorn.conf.py"
+)
+
+
+def test_defaults(monkeypatch):
+    monkeypatch.delenv("GUNICORN_WORKERS", raising=False)
+    monkeypatch.setenv("GUNICORN_THREADS", "8")
+
+    config = runpy.run_path(CONFIG)
+
+    assert config["workers"] == multiprocessing.cpu_count()
+    assert config["threads"] == 8
+    assert config["preload_app"] is True
+    assert config["max_requests"] > 0 and config["max_requests_jitter"] > 0
+
+
+def test_post_fork_discards_inherited_connections(monkeypatch):
+    dispose = Mock()
+    restart_listeners = Mock()
+    monkeypatch.setattr(models.engine, "dispose", dispose)
+    monkeypatch.setattr(logger, "restart_listeners", restart_listeners)
+
+    runpy.run_path(CONFIG)["post_fork"](Mock(), Mock())
+
+    dispose.assert_called_once_with(close=False)
+    restart_listeners.assert_called_once_with()
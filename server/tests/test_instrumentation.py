@@ -0,0 +1,50 @@
+import logging
+
+from models.instrumentation import QueryStats, statement_shape
+
+
+def test_statement_shape_groups_parameter_lists():
+    first = statement_shape("SELECT *\n  FROM articles WHERE id IN (?, ?)")
+    second = statement_shape("SELECT * FROM articles WHERE id IN (?,?,?)")
+
+    assert first == second == "SELECT * FROM articles WHERE id IN (?)"
+
+
+def test_repeated_queries():
+    stats = QueryStats()
+    for _ in range(3):
+        stats.record("SELECT * FROM articles WHERE author_id = ?", 0.001)
+    stats.record("SELECT * FROM authors", 0.001)
+
+    assert stats.count == 4
+    assert stats.repeated(2) == [
+        ("SELECT * FROM articles WHERE author_id = ?", 3)
+    ]
+    assert stats.repeated(3) == []
+
+
+def test_query_headers(app, test_client, monkeypatch):
+    monkeypatch.setitem(app.config, "SQL_TIMING_HEADERS", True)
+
+    response = test_client.get("/authors")
+
+    assert int(response.headers["X-Query-Count"]) >= 1
+    assert response.headers["Server-Timing"].startswith("db;dur=")
+
+
+def test_query_headers_disabled(app, test_client, monkeypatch):
+    monkeypatch.setitem(app.config, "SQL_TIMING_HEADERS", False)
+
+    response = test_client.get("/authors")
+
+    assert "X-Query-Count" not in response.headers
+    assert "Server-Timing" not in response.headers
+
+
+def test_repeated_query_warning(app, test_client, monkeypatch, caplog):
+    monkeypatch.setitem(app.config, "SQL_REPEATED_QUERY_THRESHOLD", 0)
+
+    with caplog.at_level(logging.WARNING, logger="logger"):
+        test_client.get("/authors")
+
+    assert "Possível N+1 em GET /authors" in caplog.text
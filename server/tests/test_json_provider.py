@@ -0,0 +1,62 @@
+from datetime import datetime
+import uuid
+
+import pytest
+from flask import jsonify
+
+from shared.utils.json_provider import JSONProvider, OrjsonProvider
+
+payload = {
+    "articles": [
+        {
+            "id": "2023-05-01-artigo",
+            "title": "Programação em Python ✨",
+            "subtitle": 'Aspas "duplas", barras \\ e\\nquebras\n',
+            "author_id": 1,
+            "created_at": datetime(2023, 5, 1, 12, 30, 15, 123456),
+            "tags": ["ação", "😀"],
+            "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+        }
+    ],
+    "next_cursor": None,
+    "zeta": 1.5,
+}
+
+# inteiros maiores que 64 bits não são suportados pelo orjson
+big_payload = dict(payload, big=2**70)
+
+
+@pytest.mark.parametrize("data", [payload, big_payload])
+@pytest.mark.parametrize("provider_class", [JSONProvider, OrjsonProvider])
+def test_provider_matches_jsonify(app, provider_class, data):
+    provider = provider_class(app)
+
+    with app.app_context():
+        expected = jsonify(data).get_data()
+        response = provider.response(data)
+
+    assert response.get_data() == expected
+    assert response.mimetype == "application/json"
+
+
+def test_app_serializes_with_provider(app, test_client):
+    response = test_client.get("/articles")
+
+    assert response.status_code == 200
+    assert isinstance(app.json_provider, OrjsonProvider)
+    assert "articles" in response.json
+
+
+def test_http_date_matches_werkzeug():
+    from datetime import timedelta, timezone
+
+    from werkzeug.http import http_date
+
+    from shared.utils.json_provider import _http_date
+
+    brt = timezone(timedelta(hours=-3))
+    for value in (
+        datetime(2023, 1, 2, 3, 4, 5),
+        datetime(2024, 2, 29, 23, 59, 59, 999999, tzinfo=brt),
+    ):
+        assert _http_date(value) == http_date(value)
@@ -0,0 +1,79 @@
+from logging.handlers import QueueHandler, RotatingFileHandler
+import logging
+import os
+
+import logger as logger_module
+from logger import enqueue_handlers, get_logging_config
+
+
+def test_root_logger_only_enqueues():
+    # o pytest adiciona os próprios handlers de captura ao logger raiz
+    handlers = logging.getLogger().handlers
+
+    assert any(isinstance(h, QueueHandler) for h in handlers)
+    assert not any(isinstance(h, RotatingFileHandler) for h in handlers)
+
+
+def test_listener_writes_records(tmp_path):
+    target = logging.getLogger("tests.queue")
+    target.propagate = False
+    stream_path = tmp_path / "queue.log"
+    target.addHandler(logging.FileHandler(stream_path, delay=True))
+
+    listener = enqueue_handlers(target)
+    target.warning("registro %d", 42)
+    listener.stop()
+
+    assert isinstance(target.handlers[0], QueueHandler)
+    assert stream_path.read_text() == "registro 42\n"
+
+    for handler in listener.handlers:
+        handler.close()
+
+
+def test_restart_listeners_after_fork(monkeypatch, tmp_path):
+    target = logging.getLogger("tests.fork")
+    target.propagate = False
+    stream_path = tmp_path / "fork.log"
+    target.addHandler(logging.FileHandler(stream_path, delay=True))
+
+    monkeypatch.setattr(logger_module, "QUEUED_LOGGERS", ("tests.fork",))
+    monkeypatch.setattr(
+        logger_module, "listeners", [enqueue_handlers(target)]
+    )
+    inherited = logger_module.listeners[0]
+
+    pid = os.fork()
+    if pid == 0:
+        # o worker recria o listener, cuja thread não é herdada no fork
+        try:
+            logger_module.restart_listeners()
+            target.warning("registro do worker")
+            logger_module.stop_listeners()
+        finally:
+            os._exit(0)
+
+    os.waitpid(pid, 0)
+    inherited.stop()
+
+    assert stream_path.read_text() == "registro do worker\n"
+
+    for handler in inherited.handlers:
+        handler.close()
+
+
+def test_file_rotation_from_env(monkeypatch, tmp_path):
+    monkeypatch.setenv("LOG_ROTATION", "time")
+    config = get_logging_config(str(tmp_path))
+
+    handler = config["handlers"]["detailed_file"]
+    assert handler["class"] == "logging.handlers.TimedRotatingFileHandler"
+    assert handler["when"] == "midnight"
+
+    monkeypatch.delenv("LOG_ROTATION")
+    config = get_logging_config(str(tmp_path))
+
+    handler = config["handlers"]["detailed_file"]
+    assert handler["class"] == "logging.handlers.RotatingFileHandler"
+    assert handler["maxBytes"] == 10 * 1024 * 1024
+    assert logger_module.listeners
@@ -0,0 +1,129 @@
+from types import SimpleNamespace
+import importlib.util
+import os
+
+from prometheus_client import values
+from prometheus_client.parser import text_string_to_metric_families
+from sqlalchemy import create_engine, text
+
+from metrics import CacheMetrics, generate_metrics, watch_engine
+from shared.utils import LRUCache
+
+
+def sample(name, **labels):
+    from prometheus_client import REGISTRY
+
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_metrics_endpoint_counts_routes(test_client):
+    labels = {
+        "method": "GET",
+        "blueprint": "author",
+        "route": "/authors",
+        "status": "200",
+    }
+    before = sample("http_requests_total", **labels)
+
+    test_client.get("/authors")
+    response = test_client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
+    assert sample("http_requests_total", **labels) == before + 1
+    assert b"http_request_duration_seconds_bucket" in response.data
+    assert b'db_pool_events_total{event="checkout"}' in response.data
+
+
+def test_cache_metrics_sync_deltas():
+    cache = LRUCache(maxsize=10)
+    metrics = CacheMetrics("test", cache)
+    hits = sample("cache_requests_total", cache="test", result="hit")
+
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("b")
+    metrics.sync()
+    metrics.sync()
+
+    assert sample("cache_requests_total", cache="test", result="hit") == (
+        hits + 1
+    )
+
+
+def test_sqlite_write_lock_wait(tmp_path):
+    engine = create_engine("sqlite:///%s" % (tmp_path / "lock.sqlite3"))
+    watch_engine(engine)
+    observed = sample("sqlite_lock_wait_seconds_count")
+
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE t (id INTEGER)"))
+        connection.execute(text("INSERT INTO t VALUES (1)"))
+        connection.execute(text("INSERT INTO t VALUES (2)"))
+
+    # apenas a primeira escrita da transação espera pelo lock
+    assert sample("sqlite_lock_wait_seconds_count") == observed + 1
+
+    engine.dispose()
+
+
+def write_worker_samples(pid, requests, checked_out):
+    """Grava as métricas de um worker, como o prometheus_client faria nele."""
+    value_class = values.MultiProcessValue(lambda: pid)
+
+    counter = value_class(
+        "counter", "test_requests", "test_requests_total", (), (), ""
+    )
+    counter.inc(requests)
+    gauge = value_class(
+        "gauge",
+        "test_checked_out",
+        "test_checked_out",
+        (),
+        (),
+        "",
+        multiprocess_mode="livesum",
+    )
+    gauge.set(checked_out)
+
+
+def exposed_samples() -> dict:
+    return {
+        sample.name: sample.value
+        for family in text_string_to_metric_families(
+            generate_metrics().decode()
+        )
+        for sample in family.samples
+    }
+
+
+def load_gunicorn_config():
+    path = os.path.join(os.path.dirname(__file__), "..", "gunicorn.conf.py")
+    spec = importlib.util.spec_from_file_location("gunicorn_conf", path)
+    config = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(config)
+    return config
+
+
+def test_multiprocess_collector(monkeypatch, tmp_path):
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+
+    assert generate_metrics() == b""
+
+    # dois workers, cada um com os seus arquivos no diretório
+    write_worker_samples(101, requests=2, checked_out=2)
+    write_worker_samples(102, requests=3, checked_out=3)
+
+    samples = exposed_samples()
+    assert samples["test_requests_total"] == 5
+    assert samples["test_checked_out"] == 5
+
+    assert list(tmp_path.glob("gauge_livesum_101.db"))
+
+    # o gauge do worker encerrado deixa de ser somado; o contador não
+    load_gunicorn_config().child_exit(None, SimpleNamespace(pid=101))
+
+    samples = exposed_samples()
+    assert samples["test_requests_total"] == 5
+    assert samples["test_checked_out"] == 3
+    assert not list(tmp_path.glob("gauge_livesum_101.db"))
@@ -0,0 +1,65 @@
+import gzip
+import json
+import os
+
+import pytest
+
+from app import create_app
+from routes import openapi
+
+
+@pytest.fixture
+def client(tmp_path):
+    return create_app({"OPENAPI_DIR": str(tmp_path)}).test_client()
+
+
+def test_document_is_precomputed(client, tmp_path, monkeypatch):
+    response = client.get("/openapi/openapi.json")
+    digest = response.headers["ETag"].strip('"')
+
+    assert response.status_code == 200
+    assert response.headers["Cache-Control"] == "no-cache"
+    assert json.loads(response.data)["info"]["title"] == "Code Chronicles API"
+    assert os.path.exists(tmp_path / f"openapi.{digest}.json")
+
+    # os carregamentos seguintes não geram o documento novamente
+    monkeypatch.setattr(openapi, "build_document", None)
+    swagger = client.get("/openapi/swagger")
+    assert f"openapi.{digest}.json".encode() in swagger.data
+
+    hashed = client.get(f"/openapi/openapi.{digest}.json")
+    assert hashed.data == response.data
+    assert "immutable" in hashed.headers["Cache-Control"]
+    assert client.get("/openapi/openapi.0123.json").status_code == 404
+
+
+def test_document_is_compressed_and_revalidated(client):
+    response = client.get(
+        "/openapi/openapi.json", headers={"Accept-Encoding": "gzip"}
+    )
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert json.loads(gzip.decompress(response.data))["openapi"]
+
+    revalidation = client.get(
+        "/openapi/openapi.json",
+        headers={
+            "Accept-Encoding": "gzip",
+            "If-None-Match": response.headers["ETag"],
+        },
+    )
+    assert revalidation.status_code == 304
+    assert revalidation.data == b""
+
+
+def test_saved_document_is_reused(tmp_path, monkeypatch):
+    app = create_app({"OPENAPI_DIR": str(tmp_path)})
+    fingerprint = openapi.source_fingerprint()
+    document = openapi.load_document(app, str(tmp_path))
+
+    monkeypatch.setattr(openapi, "build_document", None)
+    assert openapi.load_document(app, str(tmp_path)) == document
+
+    # um documento gerado por outro código é ignorado
+    assert openapi.read_document(str(tmp_path), fingerprint + "x") is None
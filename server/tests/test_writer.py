@@ -0,0 +1,101 @@
+from threading import Event
+
+import pytest
+from sqlalchemy import Column, Integer, MetaData, String, Table, create_engine
+from sqlalchemy import event, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker
+
+from models.writer import DirectWriter, WriteQueue, get_write_lock_path
+
+metadata = MetaData()
+items = Table(
+    "items",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("name", String(20), unique=True),
+)
+
+
+@pytest.fixture
+def database(tmp_path):
+    url = f"sqlite:///{tmp_path}/writer.sqlite3"
+    engine = create_engine(url)
+    metadata.create_all(engine)
+
+    commits = []
+    event.listen(engine, "commit", lambda conn: commits.append(conn))
+
+    yield url, engine, sessionmaker(bind=engine), commits
+
+    engine.dispose()
+
+
+def add(name):
+    def write(session):
+        return session.execute(insert(items).values(name=name)).rowcount
+
+    return write
+
+
+def names(engine):
+    with engine.connect() as connection:
+        return sorted(connection.scalars(select(items.c.name)))
+
+
+def test_write_lock_path():
+    assert get_write_lock_path("sqlite:///:memory:") is None
+    assert get_write_lock_path("sqlite:///db/app.sqlite3") == (
+        "db/app.sqlite3.write-lock"
+    )
+
+
+def test_direct_writer(database):
+    _, engine, Session, commits = database
+
+    assert DirectWriter(Session).run(add("a")) == 1
+    assert names(engine) == ["a"]
+    assert len(commits) == 1
+
+
+def test_queue_groups_pending_writes(database):
+    url, engine, Session, commits = database
+    writer = WriteQueue(Session, get_write_lock_path(url))
+    started, release = Event(), Event()
+
+    def blocking(session):
+        started.set()
+        release.wait(5)
+        return "primeira"
+
+    # enquanto a primeira transação está aberta, as demais se acumulam
+    first = writer.submit(blocking)
+    started.wait(5)
+    futures = [writer.submit(add(f"item-{i}")) for i in range(5)]
+    release.set()
+
+    assert first.result(5) == "primeira"
+    assert [future.result(5) for future in futures] == [1] * 5
+    assert names(engine) == [f"item-{i}" for i in range(5)]
+    assert len(commits) == 2
+
+
+def test_queue_isolates_failed_writes(database):
+    url, engine, Session, _ = database
+    writer = WriteQueue(Session, get_write_lock_path(url))
+    started, release = Event(), Event()
+
+    def blocking(session):
+        started.set()
+        release.wait(5)
+
+    writer.submit(blocking)
+    started.wait(5)
+    futures = [writer.submit(add(name)) for name in ("a", "a", "b")]
+    release.set()
+
+    assert futures[0].result(5) == 1
+    with pytest.raises(IntegrityError):
+        futures[1].result(5)
+    assert futures[2].result(5) == 1
+    assert names(engine) == ["a", "b"]
@@ -0,0 +1,11 @@
+"""Ponto de entrada WSGI da API em produção.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+As configurações do gunicorn (workers, threads, reciclagem e hooks de fork)
+ficam em gunicorn.conf.py.
+"""
+
+from app import create_app
+
+app = create_app()
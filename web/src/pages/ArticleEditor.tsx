@@ -6,7 +6,7 @@ import { Button } from '../components/Buttons/Button';
 import { Input } from '../components/Form/Input';
 import { Textarea } from '../components/Form/TextArea';
 import Header from '../components/Header';
-import api from '../services/api';
+import api, { fetchAllPages } from '../services/api';
 import { ErrorWarning } from '../components/Form/ErrorWarning';
 import { useToast } from '../hooks/toast';
 import { GoBackButton } from '../components/Buttons/GoBackButton';
@@ -45,11 +45,7 @@ function ArticleEditor() {
    * Caso contrário, o useEffect apenas limpará o formulário.
    */
   useEffect(() => {
-    api.get(`/authors`).then(response => {
-      const { authors } = response.data;
-
-      setAuthors(authors);
-    });
+    fetchAllPages<IAuthorPreview>('/authors', 'authors').then(setAuthors);
 
     if (!id) {
       reset(INITIAL_VALUES);
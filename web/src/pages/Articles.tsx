@@ -2,7 +2,7 @@ import { useEffect, useState } from 'react';
 import ArticlePreview from '../components/ArticlePreview';
 import Footer from '../components/Footer';
 import Header from '../components/Header';
-import api from '../services/api';
+import { fetchAllPages } from '../services/api';
 import '../styles/main.css';
 import { Button } from '../components/Buttons/Button';
 import { useNavigate } from 'react-router-dom';
@@ -22,9 +22,7 @@ function Articles() {
   const [articles, setArticles] = useState<IArticlePreview[]>([]);
 
   useEffect(() => {
-    api.get('/articles').then(response => {
-      setArticles(response.data.articles);
-    });
+    fetchAllPages<IArticlePreview>('/articles', 'articles').then(setArticles);
   }, []);
 
   return (
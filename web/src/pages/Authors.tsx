@@ -1,6 +1,6 @@
 import { useEffect, useState } from 'react';
 import Header from '../components/Header';
-import api from '../services/api';
+import { fetchAllPages } from '../services/api';
 import '../styles/main.css';
 import { Button } from '../components/Buttons/Button';
 import { useNavigate } from 'react-router-dom';
@@ -23,9 +23,7 @@ function Authors() {
   const [authors, setAuthors] = useState<IAuthorPreview[]>([]);
 
   useEffect(() => {
-    api.get('/authors').then(response => {
-      setAuthors(response.data.authors);
-    });
+    fetchAllPages<IAuthorPreview>('/authors', 'authors').then(setAuthors);
   }, []);
 
   return (
@@ -4,4 +4,31 @@ const api = axios.create({
   baseURL: 'http://localhost:5002',
 });
 
-export default api;
\ No newline at end of file
+/**
+ * Busca todas as páginas de uma listagem paginada por cursor.
+ *
+ * A API retorna no máximo `limit` itens por requisição e um `next_cursor`
+ * enquanto houver uma próxima página.
+ */
+export async function fetchAllPages<T>(
+  path: string,
+  key: string,
+  limit = 200,
+): Promise<T[]> {
+  const items: T[] = [];
+  let cursor: string | null = null;
+
+  do {
+    const params: Record<string, string | number> = { limit };
+    if (cursor) params.cursor = cursor;
+
+    const response = await api.get(path, { params });
+
+    items.push(...response.data[key]);
+    cursor = response.data.next_cursor;
+  } while (cursor);
+
+  return items;
+}
+
+export default api;